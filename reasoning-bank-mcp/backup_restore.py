@@ -6,8 +6,10 @@ reasoning traces and memory items. Supports both full and incremental backups
 with integrity validation.
 
 Features:
-- Full backup of ChromaDB data to JSON/tar.gz
+- Full backup of ChromaDB data to NDJSON/tar.gz (or tar.zst), streamed in
+  constant memory
 - Incremental backups based on timestamp tracking
+- Per-workspace backups fanned out across a process pool
 - Backup validation with schema version and checksums
 - Restore from backup with optional workspace targeting
 - Metadata tracking (version, timestamp, counts)
@@ -15,15 +17,44 @@ Features:
 Requirements addressed: 12.2
 """
 
+import gc
 import os
 import json
+import base64
 import tarfile
 import hashlib
 import logging
+import tempfile
+import multiprocessing
+from contextlib import contextmanager, ExitStack
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable, Iterable, Iterator, BinaryIO
 from pathlib import Path
 
+import numpy as np
+
+# orjson is an optional fast path for (de)serializing large backups
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# BLAKE3 is an optional faster checksum; blake2b is the stdlib fallback
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# zstandard enables multi-threaded .tar.zst archives
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
 from storage_adapter import StorageBackendInterface, ChromaDBAdapter
 from exceptions import MemoryStorageError
 
@@ -32,7 +63,191 @@ logger = logging.getLogger(__name__)
 
 
 # Current backup schema version
-BACKUP_SCHEMA_VERSION = "1.0"
+# 1.0: memories.json array
+# 1.1: memories.ndjson, one memory per line, checksum over the raw lines
+# 1.2: embeddings stored as base64 float32 in "embedding_b64"; the parsed
+#      "memory_data" copy is dropped (it is kept as text in metadata)
+BACKUP_SCHEMA_VERSION = "1.2"
+
+# Archive member names
+METADATA_MEMBER = "metadata.json"
+MEMORIES_MEMBER = "memories.ndjson"
+LEGACY_MEMORIES_MEMBER = "memories.json"
+
+# Supported archive extensions
+GZIP_EXTENSION = ".tar.gz"
+ZSTD_EXTENSION = ".tar.zst"
+
+# zstd level 3 matches gzip's ratio on NDJSON at several times the speed
+ZSTD_LEVEL = 3
+
+# Buffer for tar member copies and the NDJSON spool (tarfile defaults to
+# 16 KiB, which means many small read/write syscalls on large members)
+ARCHIVE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Number of memories fetched from ChromaDB per get() call during backup
+BACKUP_PAGE_SIZE = 5000
+
+# validate_backup() parses only this many leading memories and hashes the
+# rest of memories.ndjson as raw chunks
+VALIDATION_SAMPLE_SIZE = 10
+VALIDATION_CHUNK_SIZE = 1024 * 1024
+
+# Number of memories written to ChromaDB per add() call during restore
+RESTORE_BATCH_SIZE = 1000
+
+# (backup iterator, restore writer) BackupManager method names per storage
+# backend; resolved once per manager so new backends only need an entry here
+_BACKUP_STRATEGIES: Dict[type, Tuple[str, str]] = {
+    ChromaDBAdapter: ("_iter_chromadb_memories", "_restore_chromadb_data"),
+}
+
+# Checksum algorithm for new backups (recorded in metadata.checksum_algorithm;
+# archives without that field were hashed with sha256)
+CHECKSUM_ALGORITHM = "blake3" if BLAKE3_AVAILABLE else "blake2b"
+
+
+def _json_default(obj: Any) -> Any:
+    """Convert numpy arrays/scalars (e.g. ChromaDB embeddings) for stdlib json"""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes using orjson when available
+
+    The stdlib fallback uses compact separators so both paths produce the
+    same bytes, keeping checksums stable across environments.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        sort_keys=sort_keys,
+        ensure_ascii=False,
+        default=_json_default
+    ).encode("utf-8")
+
+
+def _json_dumps_line(obj: Any) -> bytes:
+    """Serialize one NDJSON record, newline included"""
+    if ORJSON_AVAILABLE:
+        # Appending in orjson avoids copying every record to add b"\n"
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+    return _json_dumps(obj) + b"\n"
+
+
+def _json_loads(data: bytes) -> Any:
+    """Deserialize JSON bytes without an intermediate UTF-8 decode when possible"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _new_hasher(algorithm: str) -> Optional[Any]:
+    """Create a streaming hasher, or None if the algorithm isn't available here"""
+    if algorithm == "blake3":
+        return blake3.blake3() if BLAKE3_AVAILABLE else None
+    try:
+        return hashlib.new(algorithm)
+    except ValueError:
+        return None
+
+
+def _encode_embeddings(embeddings: Any, count: int) -> List[Optional[str]]:
+    """
+    Pack a page of embedding vectors as base64 little-endian float32
+    
+    The page is converted to one float32 matrix up front, so the per-row
+    work is only a bytes slice and a base64 call.
+    """
+    if embeddings is None:
+        return [None] * count
+    
+    matrix: np.ndarray = np.ascontiguousarray(embeddings, dtype="<f4")
+    b64encode = base64.b64encode
+    return [b64encode(row.tobytes()).decode("ascii") for row in matrix]
+
+
+def _decode_embedding(embedding_b64: Optional[str]) -> Optional[np.ndarray]:
+    """Unpack an embedding written by _encode_embeddings"""
+    if embedding_b64 is None:
+        return None
+    return np.frombuffer(base64.b64decode(embedding_b64), dtype="<f4")
+
+
+@contextmanager
+def _open_archive(path: str, mode: str) -> Iterator[tarfile.TarFile]:
+    """
+    Open a backup archive for reading ("r") or writing ("w")
+    
+    .tar.zst archives are opened as non-seekable tar streams, so members
+    must be read in archive order.
+    """
+    if not path.endswith(ZSTD_EXTENSION):
+        with tarfile.open(path, f"{mode}:gz", copybufsize=ARCHIVE_BUFFER_SIZE) as tar:
+            yield tar
+        return
+    
+    if not ZSTANDARD_AVAILABLE:
+        raise ValueError(
+            "zstandard not installed. Install with: pip install zstandard"
+        )
+    
+    with ExitStack() as stack:
+        if mode == "w":
+            raw = stack.enter_context(open(path, "wb"))
+            cctx = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+            stream = stack.enter_context(cctx.stream_writer(raw))
+        else:
+            raw = stack.enter_context(open(path, "rb"))
+            stream = stack.enter_context(zstandard.ZstdDecompressor().stream_reader(raw))
+        yield stack.enter_context(
+            tarfile.open(fileobj=stream, mode=f"{mode}|", copybufsize=ARCHIVE_BUFFER_SIZE)
+        )
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """
+    Suspend cyclic garbage collection for an allocation-heavy loop
+    
+    Serializing many small dicts/lists repeatedly triggers generational
+    collections that find nothing (the items are freed by refcounting).
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _count_trace_ids(trace_ids: set) -> int:
+    """Count distinct trace IDs, ignoring the None/"" of untraced memories"""
+    return len(trace_ids - {None, ""})
+
+
+def _compute_checksum(memories: List[Dict[str, Any]]) -> str:
+    """SHA256 checksum over the canonical (sorted-keys) form of memories"""
+    return hashlib.sha256(_json_dumps(memories, sort_keys=True)).hexdigest()
+
+
+def _compute_legacy_checksum(memories: List[Dict[str, Any]]) -> str:
+    """Checksum as computed by backups written with stdlib json defaults"""
+    data_json = json.dumps(memories, sort_keys=True, default=_json_default)
+    return hashlib.sha256(data_json.encode()).hexdigest()
 
 
 class BackupManager:
@@ -44,11 +259,11 @@ class BackupManager:
     backups with integrity validation.
     
     Key features:
-    - Full and incremental backups
+    - Full and incremental backups streamed as NDJSON
     - Workspace-specific or global backups
     - Integrity validation with checksums
     - Metadata tracking
-    - Compression support (tar.gz)
+    - Compression support (tar.gz, or tar.zst with zstandard installed)
     
     Example:
         >>> manager = BackupManager(storage_adapter)
@@ -76,6 +291,17 @@ class BackupManager:
         self.backup_directory = backup_directory
         self.last_backup_timestamp: Optional[datetime] = None
         
+        # Resolve backend-specific backup/restore methods once (MRO walk so
+        # adapter subclasses match like isinstance would)
+        self._backup_fn: Optional[Callable[..., Iterator[Dict[str, Any]]]] = None
+        self._restore_fn: Optional[Callable[..., Dict[str, Any]]] = None
+        for storage_type in type(storage_adapter).__mro__:
+            if storage_type in _BACKUP_STRATEGIES:
+                backup_name, restore_name = _BACKUP_STRATEGIES[storage_type]
+                self._backup_fn = getattr(self, backup_name)
+                self._restore_fn = getattr(self, restore_name)
+                break
+        
         # Create backup directory if it doesn't exist
         os.makedirs(backup_directory, exist_ok=True)
         
@@ -92,12 +318,14 @@ class BackupManager:
         
         Exports all traces and memory items to a compressed tar.gz archive
         containing JSON data and metadata. Supports both full and incremental
-        backups.
+        backups. A .tar.zst output path uses multi-threaded zstd instead.
         
         Args:
-            output_path: Path for the backup file (should end with .tar.gz)
+            output_path: Path for the backup file (.tar.gz or .tar.zst)
             workspace_id: Optional workspace filter (None = all workspaces)
-            incremental: If True, only backup data since last_backup_timestamp
+            incremental: If True, only backup data since last_backup_timestamp.
+                Filters on the timestamp_epoch metadata field, so memories
+                stored before that field existed are only in full backups.
         
         Returns:
             Dictionary with backup metadata:
@@ -109,11 +337,12 @@ class BackupManager:
             - memory_count: Number of memory items backed up
             - workspace_id: Workspace ID (or "all")
             - incremental: Whether this was an incremental backup
-            - checksum: SHA256 checksum of backup data
+            - checksum: Checksum of the memories.ndjson bytes
+            - checksum_algorithm: Hash used for checksum (blake3 or blake2b)
         
         Raises:
             MemoryStorageError: If backup creation fails
-            ValueError: If output_path doesn't end with .tar.gz
+            ValueError: If output_path doesn't end with .tar.gz or .tar.zst
         
         Example:
             >>> manager = BackupManager(storage)
@@ -125,8 +354,8 @@ class BackupManager:
         """
         try:
             # Validate output path
-            if not output_path.endswith('.tar.gz'):
-                raise ValueError("Output path must end with .tar.gz")
+            if not output_path.endswith((GZIP_EXTENSION, ZSTD_EXTENSION)):
+                raise ValueError("Output path must end with .tar.gz or .tar.zst")
             
             logger.info(
                 f"Starting backup: output_path={output_path}, "
@@ -134,39 +363,44 @@ class BackupManager:
                 f"incremental={incremental}"
             )
             
-            # Get all data from storage
-            if isinstance(self.storage, ChromaDBAdapter):
-                backup_data = self._backup_chromadb_data(workspace_id, incremental)
-            else:
+            # Stream data from storage
+            if self._backup_fn is None:
                 raise NotImplementedError(
                     f"Backup not yet implemented for {type(self.storage).__name__}"
                 )
+            memories = self._backup_fn(workspace_id, incremental)
             
-            # Create metadata
-            metadata = {
-                "schema_version": BACKUP_SCHEMA_VERSION,
-                "timestamp": datetime.now().isoformat(),
-                "workspace_id": workspace_id or "all",
-                "incremental": incremental,
-                "trace_count": backup_data["trace_count"],
-                "memory_count": backup_data["memory_count"],
-                "last_backup_timestamp": self.last_backup_timestamp.isoformat() if self.last_backup_timestamp else None
-            }
-            
-            # Calculate checksum of data
-            data_json = json.dumps(backup_data["memories"], sort_keys=True)
-            checksum = hashlib.sha256(data_json.encode()).hexdigest()
-            metadata["checksum"] = checksum
-            
-            # Create tar.gz archive
-            with tarfile.open(output_path, "w:gz") as tar:
-                # Add metadata
-                metadata_json = json.dumps(metadata, indent=2)
-                self._add_string_to_tar(tar, "metadata.json", metadata_json)
+            # Spool NDJSON next to the archive so tar knows the member size
+            # up front; counts and checksum are gathered in the same pass
+            spool_dir = os.path.dirname(os.path.abspath(output_path))
+            with tempfile.TemporaryFile(dir=spool_dir, buffering=ARCHIVE_BUFFER_SIZE) as spool:
+                with _gc_paused():
+                    backup_data = self._write_memories_ndjson(memories, spool)
+                memories_size = spool.tell()
+                spool.seek(0)
+                
+                # Create metadata
+                metadata = {
+                    "schema_version": BACKUP_SCHEMA_VERSION,
+                    "timestamp": datetime.now().isoformat(),
+                    "workspace_id": workspace_id or "all",
+                    "incremental": incremental,
+                    "trace_count": backup_data["trace_count"],
+                    "memory_count": backup_data["memory_count"],
+                    "last_backup_timestamp": self.last_backup_timestamp.isoformat() if self.last_backup_timestamp else None,
+                    "checksum": backup_data["checksum"],
+                    "checksum_algorithm": CHECKSUM_ALGORITHM
+                }
+                checksum = backup_data["checksum"]
                 
-                # Add memory data
-                memories_json = json.dumps(backup_data["memories"], indent=2)
-                self._add_string_to_tar(tar, "memories.json", memories_json)
+                # Create compressed archive
+                with _open_archive(output_path, "w") as tar:
+                    # Add metadata
+                    metadata_json = _json_dumps(metadata, indent=True)
+                    self._add_bytes_to_tar(tar, METADATA_MEMBER, metadata_json)
+                    
+                    # Add memory data
+                    self._add_file_to_tar(tar, MEMORIES_MEMBER, spool, memories_size)
             
             # Get file size
             file_size_bytes = os.path.getsize(output_path)
@@ -184,7 +418,8 @@ class BackupManager:
                 "memory_count": backup_data["memory_count"],
                 "workspace_id": workspace_id or "all",
                 "incremental": incremental,
-                "checksum": checksum
+                "checksum": checksum,
+                "checksum_algorithm": CHECKSUM_ALGORITHM
             }
             
             logger.info(
@@ -219,7 +454,7 @@ class BackupManager:
         restore to a different workspace than the original.
         
         Args:
-            backup_path: Path to backup file (.tar.gz)
+            backup_path: Path to backup file (.tar.gz or .tar.zst)
             target_workspace_id: Optional target workspace (None = use original)
             overwrite: If True, overwrite existing data (default: False)
         
@@ -254,19 +489,20 @@ class BackupManager:
                 f"overwrite={overwrite}"
             )
             
-            # Extract and validate backup
-            with tarfile.open(backup_path, "r:gz") as tar:
-                # Read metadata
-                metadata_file = tar.extractfile("metadata.json")
-                if not metadata_file:
-                    raise ValueError("Backup missing metadata.json")
-                metadata = json.loads(metadata_file.read().decode())
-                
-                # Read memory data
-                memories_file = tar.extractfile("memories.json")
-                if not memories_file:
-                    raise ValueError("Backup missing memories.json")
-                memories_data = json.loads(memories_file.read().decode())
+            # Extract backup, reading members in archive order
+            metadata = None
+            memories_data = None
+            with _open_archive(backup_path, "r") as tar:
+                for member in tar:
+                    if member.name == METADATA_MEMBER:
+                        metadata = _json_loads(tar.extractfile(member).read())
+                    elif member.name in (MEMORIES_MEMBER, LEGACY_MEMORIES_MEMBER):
+                        memories_data = self._read_memories(tar.extractfile(member), member.name)
+            
+            if metadata is None:
+                raise ValueError("Backup missing metadata.json")
+            if memories_data is None:
+                raise ValueError("Backup missing memories.ndjson")
             
             # Validate backup
             validation_result = self._validate_backup_data(metadata, memories_data)
@@ -279,16 +515,15 @@ class BackupManager:
                 final_workspace_id = None
             
             # Restore data
-            if isinstance(self.storage, ChromaDBAdapter):
-                restore_result = self._restore_chromadb_data(
-                    memories_data,
-                    final_workspace_id,
-                    overwrite
-                )
-            else:
+            if self._restore_fn is None:
                 raise NotImplementedError(
                     f"Restore not yet implemented for {type(self.storage).__name__}"
                 )
+            restore_result = self._restore_fn(
+                memories_data,
+                final_workspace_id,
+                overwrite
+            )
             
             result = {
                 "restored_traces": restore_result["trace_count"],
@@ -322,8 +557,8 @@ class BackupManager:
         
         Checks backup file for:
         - File existence and readability
-        - Valid tar.gz format
-        - Required files (metadata.json, memories.json)
+        - Valid tar.gz/tar.zst format
+        - Required files (metadata.json, memories.ndjson or legacy memories.json)
         - Schema version compatibility
         - Checksum verification
         
@@ -360,56 +595,83 @@ class BackupManager:
                 errors.append(f"Backup file not readable: {backup_path}")
                 return {"valid": False, "errors": errors, "warnings": warnings, "metadata": None}
             
-            # Try to open as tar.gz
+            # Read members in archive order (metadata.json is written first)
+            # so compressed streams never need to seek
             try:
-                with tarfile.open(backup_path, "r:gz") as tar:
-                    # Check for required files
-                    members = tar.getnames()
-                    
-                    if "metadata.json" not in members:
+                memories_data = None
+                memory_count = None
+                memories_member = None
+                calculated_checksum = None
+                
+                with _open_archive(backup_path, "r") as tar:
+                    for member in tar:
+                        if member.name == METADATA_MEMBER:
+                            metadata = _json_loads(tar.extractfile(member).read())
+                        
+                        elif member.name == MEMORIES_MEMBER:
+                            if metadata is None:
+                                errors.append("metadata.json must precede memories.ndjson in backup")
+                                break
+                            
+                            algorithm = metadata.get("checksum_algorithm", "sha256")
+                            hasher = _new_hasher(algorithm)
+                            if hasher is None and "checksum" in metadata:
+                                warnings.append(
+                                    f"Cannot verify checksum: {algorithm} not available"
+                                )
+                            
+                            memories_data, memory_count, calculated_checksum = self._scan_memories_ndjson(
+                                tar.extractfile(member),
+                                hasher
+                            )
+                            memories_member = member.name
+                        
+                        elif member.name == LEGACY_MEMORIES_MEMBER:
+                            memories_data = _json_loads(tar.extractfile(member).read())
+                            calculated_checksum = _compute_checksum(memories_data)
+                            memories_member = member.name
+                
+                # Check for required files
+                if not errors:
+                    if metadata is None:
                         errors.append("Missing metadata.json in backup")
                     
-                    if "memories.json" not in members:
-                        errors.append("Missing memories.json in backup")
-                    
-                    if errors:
-                        return {"valid": False, "errors": errors, "warnings": warnings, "metadata": None}
-                    
-                    # Read and validate metadata
-                    metadata_file = tar.extractfile("metadata.json")
-                    metadata = json.loads(metadata_file.read().decode())
+                    if memories_data is None:
+                        errors.append("Missing memories.ndjson in backup")
+                
+                if errors:
+                    return {"valid": False, "errors": errors, "warnings": warnings, "metadata": None}
+                
+                # Check schema version
+                backup_version = metadata.get("schema_version")
+                if backup_version != BACKUP_SCHEMA_VERSION:
+                    warnings.append(
+                        f"Schema version mismatch: backup={backup_version}, "
+                        f"current={BACKUP_SCHEMA_VERSION}"
+                    )
+                
+                # Validate data structure
+                validation_result = self._validate_backup_data(metadata, memories_data, memory_count)
+                if not validation_result["valid"]:
+                    errors.extend(validation_result["errors"])
+                
+                # Verify checksum if present
+                if "checksum" in metadata and calculated_checksum is not None:
+                    # Older backups were hashed over stdlib json output
+                    if calculated_checksum != metadata["checksum"] and memories_member == LEGACY_MEMORIES_MEMBER:
+                        legacy_checksum = _compute_legacy_checksum(memories_data)
+                        if legacy_checksum == metadata["checksum"]:
+                            calculated_checksum = legacy_checksum
                     
-                    # Check schema version
-                    backup_version = metadata.get("schema_version")
-                    if backup_version != BACKUP_SCHEMA_VERSION:
-                        warnings.append(
-                            f"Schema version mismatch: backup={backup_version}, "
-                            f"current={BACKUP_SCHEMA_VERSION}"
+                    if calculated_checksum != metadata["checksum"]:
+                        errors.append(
+                            f"Checksum mismatch: expected={metadata['checksum']}, "
+                            f"calculated={calculated_checksum}"
                         )
-                    
-                    # Read memories data
-                    memories_file = tar.extractfile("memories.json")
-                    memories_data = json.loads(memories_file.read().decode())
-                    
-                    # Validate data structure
-                    validation_result = self._validate_backup_data(metadata, memories_data)
-                    if not validation_result["valid"]:
-                        errors.extend(validation_result["errors"])
-                    
-                    # Verify checksum if present
-                    if "checksum" in metadata:
-                        data_json = json.dumps(memories_data, sort_keys=True)
-                        calculated_checksum = hashlib.sha256(data_json.encode()).hexdigest()
-                        
-                        if calculated_checksum != metadata["checksum"]:
-                            errors.append(
-                                f"Checksum mismatch: expected={metadata['checksum']}, "
-                                f"calculated={calculated_checksum}"
-                            )
             
             except tarfile.TarError as e:
-                errors.append(f"Invalid tar.gz format: {e}")
-            except json.JSONDecodeError as e:
+                errors.append(f"Invalid archive format: {e}")
+            except ValueError as e:
                 errors.append(f"Invalid JSON in backup: {e}")
         
         except Exception as e:
@@ -429,141 +691,399 @@ class BackupManager:
             "metadata": metadata
         }
     
-    def _backup_chromadb_data(
+    def backup_all_workspaces(
+        self,
+        output_directory: Optional[str] = None,
+        incremental: bool = False,
+        parallel: bool = True,
+        max_workers: Optional[int] = None,
+        extension: str = GZIP_EXTENSION
+    ) -> Dict[str, Any]:
+        """
+        Back up every workspace to its own archive
+        
+        Serialization, hashing and compression are CPU-bound and independent
+        per workspace, so with parallel=True each workspace is backed up in a
+        separate process with its own ChromaDB client. A manifest.json listing
+        the per-workspace results is written next to the archives.
+        
+        Memories stored without a workspace_id are not part of any workspace
+        archive; use backup_chromadb(workspace_id=None) to capture them.
+        
+        Args:
+            output_directory: Directory for the archives
+                (default: <backup_directory>/workspaces_<timestamp>)
+            incremental: If True, only backup data since last_backup_timestamp
+            parallel: Back up workspaces concurrently in a process pool
+            max_workers: Pool size (default: os.cpu_count())
+            extension: Archive extension, ".tar.gz" or ".tar.zst"
+        
+        Returns:
+            Manifest dictionary:
+            - output_directory: Directory containing the archives
+            - timestamp: ISO timestamp of the run
+            - incremental: Whether backups were incremental
+            - workspaces: backup_chromadb() result per workspace_id
+            - errors: Error message per workspace_id that failed
+        
+        Raises:
+            MemoryStorageError: If workspaces cannot be listed
+        """
+        if not isinstance(self.storage, ChromaDBAdapter):
+            raise NotImplementedError(
+                f"Backup not yet implemented for {type(self.storage).__name__}"
+            )
+        
+        started_at = datetime.now()
+        output_directory = output_directory or os.path.join(
+            self.backup_directory,
+            f"workspaces_{started_at.strftime('%Y%m%d_%H%M%S')}"
+        )
+        os.makedirs(output_directory, exist_ok=True)
+        
+        try:
+            results = self.storage.collection.get(include=["metadatas"])
+        except Exception as e:
+            raise MemoryStorageError(
+                "Failed to list workspaces for backup",
+                context={"error": str(e)}
+            )
+        
+        workspace_ids = sorted({
+            metadata["workspace_id"]
+            for metadata in results["metadatas"] or []
+            if metadata.get("workspace_id")
+        })
+        jobs = {
+            workspace_id: os.path.join(output_directory, f"{workspace_id}{extension}")
+            for workspace_id in workspace_ids
+        }
+        
+        logger.info(
+            f"Backing up {len(jobs)} workspaces to {output_directory} "
+            f"(parallel={parallel})"
+        )
+        
+        # Every workspace uses the same incremental cutoff
+        since = self.last_backup_timestamp
+        workspace_results = {}
+        errors = {}
+        
+        if parallel and len(jobs) > 1:
+            workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+            # spawn: forking after ChromaDB has started its threads is unsafe
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_backup_worker,
+                initargs=(
+                    self.storage.persist_directory,
+                    self.storage.collection_name,
+                    self.backup_directory
+                )
+            ) as pool:
+                futures = {
+                    pool.submit(_backup_workspace_task, path, workspace_id, incremental, since): workspace_id
+                    for workspace_id, path in jobs.items()
+                }
+                for future in as_completed(futures):
+                    workspace_id = futures[future]
+                    try:
+                        workspace_results[workspace_id] = future.result()
+                    except Exception as e:
+                        logger.error(f"Backup of workspace {workspace_id} failed: {e}")
+                        errors[workspace_id] = str(e)
+        else:
+            for workspace_id, path in jobs.items():
+                self.last_backup_timestamp = since
+                try:
+                    workspace_results[workspace_id] = self.backup_chromadb(
+                        path,
+                        workspace_id=workspace_id,
+                        incremental=incremental
+                    )
+                except Exception as e:
+                    errors[workspace_id] = str(e)
+        
+        self.last_backup_timestamp = datetime.now()
+        
+        manifest = {
+            "output_directory": output_directory,
+            "timestamp": started_at.isoformat(),
+            "incremental": incremental,
+            "workspaces": workspace_results,
+            "errors": errors
+        }
+        with open(os.path.join(output_directory, "manifest.json"), "wb") as f:
+            f.write(_json_dumps(manifest, indent=True))
+        
+        logger.info(
+            f"Workspace backups completed: {len(workspace_results)} succeeded, "
+            f"{len(errors)} failed"
+        )
+        
+        return manifest
+    
+    def _iter_chromadb_memories(
         self,
         workspace_id: Optional[str],
         incremental: bool
-    ) -> Dict[str, Any]:
-        """Extract data from ChromaDB for backup"""
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield memory items from ChromaDB for backup"""
         # Build filter
-        where_filter = {}
+        conditions = []
         if workspace_id:
-            where_filter["workspace_id"] = workspace_id
+            conditions.append({"workspace_id": workspace_id})
         
-        # For incremental backup, filter by timestamp
+        # For incremental backup, let ChromaDB filter by the numeric
+        # timestamp_epoch written alongside the ISO timestamp
         if incremental and self.last_backup_timestamp:
-            # Note: ChromaDB doesn't support timestamp filtering directly
-            # We'll need to filter after retrieval
-            pass
-        
-        # Get all data
-        results = self.storage.collection.get(
-            where=where_filter if where_filter else None,
-            include=["metadatas", "documents", "embeddings"]
-        )
-        
-        if not results["ids"]:
-            return {
-                "memories": [],
-                "trace_count": 0,
-                "memory_count": 0
-            }
+            conditions.append(
+                {"timestamp_epoch": {"$gt": self.last_backup_timestamp.timestamp()}}
+            )
         
-        # Build memory items
-        memories = []
-        trace_ids = set()
+        if len(conditions) > 1:
+            where_filter = {"$and": conditions}
+        else:
+            where_filter = conditions[0] if conditions else None
         
-        for i, memory_id in enumerate(results["ids"]):
-            metadata = results["metadatas"][i]
-            document = results["documents"][i]
-            embedding = results["embeddings"][i] if results["embeddings"] else None
+        # Page through the data so only BACKUP_PAGE_SIZE rows (with their
+        # embeddings) are held in memory at once
+        offset = 0
+        while True:
+            results = self.storage.collection.get(
+                where=where_filter,
+                limit=BACKUP_PAGE_SIZE,
+                offset=offset,
+                include=["metadatas", "documents", "embeddings"]
+            )
+            if not results["ids"]:
+                break
             
-            # For incremental backup, check timestamp
-            if incremental and self.last_backup_timestamp:
-                timestamp_str = metadata.get("timestamp")
-                if timestamp_str:
-                    try:
-                        timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                        if timestamp <= self.last_backup_timestamp:
-                            continue  # Skip old data
-                    except (ValueError, AttributeError):
-                        pass  # Include if timestamp parsing fails
-            
-            # Parse memory data
-            memory_data = json.loads(metadata.get("memory_data", "{}"))
-            
-            # Build complete memory item
-            memory_item = {
-                "id": memory_id,
-                "document": document,
-                "embedding": embedding,
-                "metadata": metadata,
-                "memory_data": memory_data
-            }
+            ids: List[str] = results["ids"]
+            documents: List[Optional[str]] = results["documents"]
+            metadatas: List[Dict[str, Any]] = results["metadatas"]
+            embeddings_b64 = _encode_embeddings(results["embeddings"], len(ids))
             
-            memories.append(memory_item)
+            # Build memory items; the full memory stays as JSON text in
+            # metadata["memory_data"], which is all restore needs. Keys are
+            # inserted in a fixed order so records serialize canonically
+            # without sort_keys
+            for memory_id, document, embedding_b64, metadata in zip(
+                ids, documents, embeddings_b64, metadatas
+            ):
+                yield {
+                    "id": memory_id,
+                    "document": document,
+                    "embedding_b64": embedding_b64,
+                    "metadata": metadata
+                }
+            
+            if len(ids) < BACKUP_PAGE_SIZE:
+                break
+            offset += len(ids)
+    
+    def _write_memories_ndjson(
+        self,
+        memories: Iterable[Dict[str, Any]],
+        file_obj: BinaryIO
+    ) -> Dict[str, Any]:
+        """Write memories as NDJSON, counting and hashing in the same pass"""
+        hasher = _new_hasher(CHECKSUM_ALGORITHM)
+        trace_ids: set = set()
+        memory_count: int = 0
+        
+        # Bind per-item calls once; this loop runs for every memory
+        write = file_obj.write
+        update = hasher.update
+        add_trace_id = trace_ids.add
+        
+        for memory_item in memories:
+            line = _json_dumps_line(memory_item)
+            write(line)
+            update(line)
+            memory_count += 1
             
-            # Track trace IDs
-            trace_id = metadata.get("trace_id")
-            if trace_id:
-                trace_ids.add(trace_id)
+            # Track trace IDs (missing ones are discarded once, below)
+            add_trace_id(memory_item["metadata"].get("trace_id"))
         
         return {
-            "memories": memories,
-            "trace_count": len(trace_ids),
-            "memory_count": len(memories)
+            "checksum": hasher.hexdigest(),
+            "trace_count": _count_trace_ids(trace_ids),
+            "memory_count": memory_count
         }
     
+    def _read_memories(
+        self,
+        memories_file: BinaryIO,
+        member_name: str
+    ) -> List[Dict[str, Any]]:
+        """Read memory items from an NDJSON (or legacy JSON array) member"""
+        if member_name == LEGACY_MEMORIES_MEMBER:
+            return _json_loads(memories_file.read())
+        
+        return [_json_loads(line) for line in memories_file if line.strip()]
+    
     def _restore_chromadb_data(
         self,
         memories_data: List[Dict[str, Any]],
         target_workspace_id: Optional[str],
         overwrite: bool
     ) -> Dict[str, Any]:
-        """Restore data to ChromaDB"""
+        """Restore data to ChromaDB in batches of RESTORE_BATCH_SIZE"""
         trace_ids = set()
         restored_count = 0
         
-        for memory_item in memories_data:
-            memory_id = memory_item["id"]
-            document = memory_item["document"]
-            embedding = memory_item.get("embedding")
-            metadata = memory_item["metadata"]
+        for start in range(0, len(memories_data), RESTORE_BATCH_SIZE):
+            batch = memories_data[start:start + RESTORE_BATCH_SIZE]
+            
+            # Schema 1.2+ stores embeddings as base64 float32; 1.0/1.1 as lists
+            for memory_item in batch:
+                if "embedding_b64" in memory_item:
+                    memory_item["embedding"] = _decode_embedding(memory_item.pop("embedding_b64"))
             
             # Update workspace_id if targeting different workspace
             if target_workspace_id:
-                metadata["workspace_id"] = target_workspace_id
+                for memory_item in batch:
+                    memory_item["metadata"]["workspace_id"] = target_workspace_id
             
-            # Check if memory already exists
+            # Check which memories already exist with one lookup per batch
             if not overwrite:
                 try:
-                    existing = self.storage.collection.get(ids=[memory_id])
-                    if existing["ids"]:
-                        logger.debug(f"Skipping existing memory: {memory_id}")
-                        continue
+                    existing = self.storage.collection.get(
+                        ids=[memory_item["id"] for memory_item in batch],
+                        include=[]
+                    )
+                    existing_ids = set(existing["ids"])
                 except Exception:
-                    pass  # Memory doesn't exist, proceed with restore
+                    existing_ids = set()  # Treat as not existing, proceed with restore
+                
+                if existing_ids:
+                    logger.debug(f"Skipping {len(existing_ids)} existing memories")
+                    batch = [m for m in batch if m["id"] not in existing_ids]
             
             # Add to ChromaDB
-            try:
-                self.storage.collection.add(
-                    ids=[memory_id],
-                    embeddings=[embedding] if embedding else None,
-                    documents=[document],
-                    metadatas=[metadata]
-                )
-                restored_count += 1
-                
-                # Track trace ID
-                trace_id = metadata.get("trace_id")
-                if trace_id:
-                    trace_ids.add(trace_id)
+            # overwrite=True upserts, replacing existing rows in the same call
+            restored = self._add_memory_batch(batch, upsert=overwrite)
+            restored_count += len(restored)
             
-            except Exception as e:
-                logger.warning(f"Failed to restore memory {memory_id}: {e}")
-                continue
+            # Track trace IDs with one bulk update per batch
+            trace_ids.update(m["metadata"].get("trace_id") for m in restored)
         
         return {
-            "trace_count": len(trace_ids),
+            "trace_count": _count_trace_ids(trace_ids),
             "memory_count": restored_count
         }
     
+    def _add_memory_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        upsert: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Add a batch of memory items to ChromaDB
+        
+        Items with and without stored embeddings are added separately since
+        ChromaDB computes embeddings for the whole call when none are given.
+        If a batched add fails, falls back to adding items one at a time so
+        a single bad item doesn't drop the rest of the batch.
+        
+        Args:
+            batch: Memory items to write
+            upsert: Use collection.upsert so existing ids are replaced
+                (collection.add leaves existing rows untouched)
+        
+        Returns:
+            The memory items that were restored
+        """
+        write = self.storage.collection.upsert if upsert else self.storage.collection.add
+        restored = []
+        with_embeddings = [m for m in batch if m.get("embedding") is not None]
+        without_embeddings = [m for m in batch if m.get("embedding") is None]
+        
+        for group, has_embeddings in ((with_embeddings, True), (without_embeddings, False)):
+            if not group:
+                continue
+            
+            try:
+                write(
+                    ids=[m["id"] for m in group],
+                    embeddings=[m["embedding"] for m in group] if has_embeddings else None,
+                    documents=[m["document"] for m in group],
+                    metadatas=[m["metadata"] for m in group]
+                )
+                restored.extend(group)
+                continue
+            except Exception as e:
+                logger.warning(f"Batch restore of {len(group)} memories failed, retrying individually: {e}")
+            
+            for memory_item in group:
+                try:
+                    write(
+                        ids=[memory_item["id"]],
+                        embeddings=[memory_item["embedding"]] if has_embeddings else None,
+                        documents=[memory_item["document"]],
+                        metadatas=[memory_item["metadata"]]
+                    )
+                    restored.append(memory_item)
+                except Exception as e:
+                    logger.warning(f"Failed to restore memory {memory_item['id']}: {e}")
+        
+        return restored
+    
+    def _scan_memories_ndjson(
+        self,
+        memories_file: BinaryIO,
+        hasher: Optional[Any]
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+        """
+        Hash and count an NDJSON member without parsing all of it
+        
+        Only the first VALIDATION_SAMPLE_SIZE lines are parsed (for the
+        structure checks); the rest is hashed in VALIDATION_CHUNK_SIZE
+        chunks and counted by newline, since every record ends with one.
+        
+        Returns:
+            Tuple of (parsed sample, memory count, hex digest or None)
+        """
+        sample = []
+        memory_count = 0
+        
+        while len(sample) < VALIDATION_SAMPLE_SIZE:
+            line = memories_file.readline()
+            if not line:
+                break
+            if hasher is not None:
+                hasher.update(line)
+            if line.strip():
+                sample.append(_json_loads(line))
+                memory_count += 1
+        
+        while True:
+            chunk = memories_file.read(VALIDATION_CHUNK_SIZE)
+            if not chunk:
+                break
+            if hasher is not None:
+                hasher.update(chunk)
+            memory_count += chunk.count(b"\n")
+        
+        checksum = hasher.hexdigest() if hasher is not None else None
+        return sample, memory_count, checksum
+    
     def _validate_backup_data(
         self,
         metadata: Dict[str, Any],
-        memories_data: List[Dict[str, Any]]
+        memories_data: List[Dict[str, Any]],
+        memory_count: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Validate backup data structure"""
+        """
+        Validate backup data structure
+        
+        Args:
+            metadata: Backup metadata
+            memories_data: Memory items (or a leading sample of them)
+            memory_count: Total memory count when memories_data is a sample
+        """
         errors = []
         
         # Check metadata fields
@@ -578,15 +1098,20 @@ class BackupManager:
             return {"valid": False, "errors": errors}
         
         # Validate memory count matches
+        if memory_count is None:
+            memory_count = len(memories_data)
+        
         if "memory_count" in metadata:
-            if len(memories_data) != metadata["memory_count"]:
+            if memory_count != metadata["memory_count"]:
                 errors.append(
                     f"Memory count mismatch: metadata={metadata['memory_count']}, "
-                    f"actual={len(memories_data)}"
+                    f"actual={memory_count}"
                 )
         
-        # Validate memory items structure
-        for i, memory_item in enumerate(memories_data[:10]):  # Check first 10
+        # Validate memory items structure. Every item is checked: a restore
+        # passes the full list and must reject a bad item before writing
+        # any batch; validate_backup() already passes only its sample.
+        for i, memory_item in enumerate(memories_data):
             if not isinstance(memory_item, dict):
                 errors.append(f"Memory item {i} is not a dictionary")
                 continue
@@ -602,12 +1127,11 @@ class BackupManager:
             "errors": errors
         }
     
-    def _add_string_to_tar(self, tar: tarfile.TarFile, filename: str, content: str):
-        """Helper to add string content to tar archive"""
+    def _add_bytes_to_tar(self, tar: tarfile.TarFile, filename: str, content_bytes: bytes):
+        """Helper to add encoded content to tar archive"""
         import io
         
         # Create in-memory file
-        content_bytes = content.encode('utf-8')
         file_obj = io.BytesIO(content_bytes)
         
         # Create tarinfo
@@ -617,6 +1141,60 @@ class BackupManager:
         
         # Add to archive
         tar.addfile(tarinfo, file_obj)
+    
+    def _add_file_to_tar(
+        self,
+        tar: tarfile.TarFile,
+        filename: str,
+        file_obj: BinaryIO,
+        size: int
+    ):
+        """Helper to stream an open file of known size into tar archive"""
+        tarinfo = tarfile.TarInfo(name=filename)
+        tarinfo.size = size
+        tarinfo.mtime = datetime.now().timestamp()
+        
+        tar.addfile(tarinfo, file_obj)
+
+
+# ============================================================================
+# Process Pool Workers
+# ============================================================================
+
+# BackupManager owned by a backup_all_workspaces() worker process
+_worker_manager: Optional[BackupManager] = None
+
+
+def _init_backup_worker(
+    persist_directory: str,
+    collection_name: str,
+    backup_directory: str
+) -> None:
+    """Open a per-process ChromaDB client for backup_all_workspaces()"""
+    global _worker_manager
+    from storage_adapter import create_storage_backend
+    
+    storage = create_storage_backend(
+        backend_type="chromadb",
+        persist_directory=persist_directory,
+        collection_name=collection_name
+    )
+    _worker_manager = BackupManager(storage, backup_directory=backup_directory)
+
+
+def _backup_workspace_task(
+    output_path: str,
+    workspace_id: str,
+    incremental: bool,
+    since: Optional[datetime]
+) -> Dict[str, Any]:
+    """Back up a single workspace inside a worker process"""
+    _worker_manager.last_backup_timestamp = since
+    return _worker_manager.backup_chromadb(
+        output_path,
+        workspace_id=workspace_id,
+        incremental=incremental
+    )
 
 
 # ============================================================================
@@ -653,7 +1231,7 @@ if __name__ == "__main__":
     
     print("BackupManager module loaded successfully")
     print("\nKey features:")
-    print("  ✅ Full backup to tar.gz")
+    print("  ✅ Full backup to tar.gz / tar.zst")
     print("  ✅ Incremental backup support")
     print("  ✅ Backup validation with checksums")
     print("  ✅ Restore with workspace targeting")
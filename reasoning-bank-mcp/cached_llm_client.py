@@ -3,29 +3,66 @@ Cached LLM client for reducing API costs through intelligent response caching.
 
 This module provides a caching layer that wraps the ResponsesAPIClient,
 storing and reusing LLM responses to reduce API calls and costs. It implements:
-- LRU cache with OrderedDict for efficient eviction
+- Sharded LRU cache (one OrderedDict and lock per shard) for low contention
 - TTL-based cache expiration
-- SHA256-based cache key generation
+- BLAKE3-based cache key generation (BLAKE2b fallback)
 - Cache hit/miss tracking for statistics
 - Only caches deterministic calls (temperature=0.0)
+
+BatchingLLMClient wraps it to coalesce concurrent requests from many tasks.
 """
 
+import asyncio
 import hashlib
+import inspect
 import json
 import time
+import heapq
+import struct
+import itertools
 import threading
 from collections import OrderedDict
-from typing import Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple, Union
 from dataclasses import dataclass
 
 from responses_alpha_client import ResponsesAPIClient, ResponsesAPIResult, ReasoningEffort
 
+# blake3 is an optional, SIMD-accelerated hash for cache keys; keys are
+# local-only, so hashlib.blake2b is an equally valid (slower) fallback
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# Cache keys are 128-bit digests, which is plenty for a bounded local cache
+CACHE_KEY_DIGEST_SIZE = 16
+
+# Number of recently computed cache keys remembered per messages list
+KEY_MEMO_SIZE = 64
+
+# Canonical JSON of list-valued message content (cache_control parts), keyed
+# by id() of the content list and verified by identity. Callers such as
+# IterativeReasoningAgent reuse the same system message objects, so their
+# serialization is done once; content lists must not be mutated after use.
+CONTENT_JSON_MEMO_SIZE = 64
+_content_json_memo: Dict[int, Tuple[Any, str]] = {}
 
-@dataclass
+# The response cache is split into independently locked shards so concurrent
+# callers (MaTTS, iterative agents) rarely contend on the same lock. Small
+# caches use fewer shards so each one still holds a useful LRU window.
+MAX_CACHE_SHARDS = 16
+MIN_SHARD_SIZE = 4
+
+
+@dataclass(slots=True, frozen=True)
 class CacheStatistics:
     """
     Statistics for cache performance tracking.
     
+    Instances are immutable snapshots taken by get_statistics().
+    
     Attributes:
         cache_hits: Number of times a cached response was returned
         cache_misses: Number of times an API call was made
@@ -50,6 +87,59 @@ class CacheStatistics:
         )
 
 
+class _EventCounter:
+    """
+    Lock-free event counter for cache statistics.
+    
+    next() on an itertools.count is a single C call and therefore atomic
+    under the GIL, so increments never take a lock. Reading the value also
+    has to call next(); the numbers consumed by reads are tracked in
+    _peeks and subtracted out.
+    """
+    
+    __slots__ = ("_events", "_peeks", "_peek_lock")
+    
+    def __init__(self):
+        self._events = itertools.count(1)
+        self._peeks = 0
+        self._peek_lock = threading.Lock()
+    
+    def increment(self) -> int:
+        """Record one event and return the running total."""
+        return next(self._events) - self._peeks
+    
+    def value(self) -> int:
+        """Get the number of events recorded so far."""
+        with self._peek_lock:
+            total = next(self._events) - self._peeks - 1
+            self._peeks += 1
+            return total
+    
+    def reset(self):
+        """Reset the counter to zero."""
+        with self._peek_lock:
+            self._events = itertools.count(1)
+            self._peeks = 0
+
+
+class _CacheShard:
+    """One independently locked LRU segment of the response cache."""
+    
+    __slots__ = ("lock", "entries", "expiry", "capacity")
+    
+    def __init__(self, capacity: int):
+        self.lock = threading.Lock()
+        # Key: cache_key (str), Value: (ResponsesAPIResult, monotonic timestamp)
+        # Not pre-sized: CPython cannot reserve dict capacity (clear() frees
+        # the table and deletions shrink it on the next resize), and a shard
+        # only ever holds ~max_cache_size / MAX_CACHE_SHARDS entries
+        self.entries: OrderedDict[str, tuple[ResponsesAPIResult, float]] = OrderedDict()
+        # Min-heap of (expires_at, cache_key); may hold stale items for keys
+        # that were since evicted or re-inserted
+        self.expiry: List[tuple[float, str]] = []
+        self.capacity = capacity
+
+
 class CachedLLMClient:
     """
     Caching layer for LLM API calls to reduce costs and latency.
@@ -60,6 +150,10 @@ class CachedLLMClient:
     - TTL-based expiration
     - LRU eviction when cache is full
     
+    Entries are spread over up to MAX_CACHE_SHARDS shards by cache key, each
+    with its own lock and an equal share of max_cache_size, so eviction is
+    LRU within a shard rather than across the whole cache.
+    
     Features:
     - 20-30% cost reduction through cache hits
     - ~2s latency reduction per cache hit
@@ -67,6 +161,21 @@ class CachedLLMClient:
     - Comprehensive statistics tracking
     """
     
+    # Pre-encoded field tags and packers for _generate_cache_key, so the hot
+    # path only encodes the dynamic request values
+    _FIELD_MODEL = b'\x01m'
+    _FIELD_TEMPERATURE = b'\x02t'
+    _FIELD_LIMITS = b'\x03l'
+    _FIELD_MESSAGES = b'\x04M'
+    _FIELD_KWARGS = b'\x05k'
+    _LENGTH_STRUCT = struct.Struct('<I')
+    _TEMPERATURE_STRUCT = struct.Struct('<d')
+    # Length-prefixed encodings of the standard message roles
+    _ROLE_BYTES = {
+        role: struct.pack('<I', len(role)) + role.encode('utf-8')
+        for role in ("system", "user", "assistant")
+    }
+    
     def __init__(
         self,
         client: ResponsesAPIClient,
@@ -84,26 +193,80 @@ class CachedLLMClient:
             enable_cache: Whether caching is enabled (useful for testing)
         """
         self.client = client
+        # Bound once so the per-call hot path skips two attribute loads
+        self._default_model = client.default_model
+        self._client_create = client.create
+        client_acreate = getattr(client, "acreate", None)
+        self._client_acreate = (
+            client_acreate if inspect.iscoroutinefunction(client_acreate) else None
+        )
+        client_acreate_n = getattr(client, "acreate_n", None)
+        self._client_acreate_n = (
+            client_acreate_n if inspect.iscoroutinefunction(client_acreate_n) else None
+        )
         self.max_cache_size = max_cache_size
         self.ttl_seconds = ttl_seconds
         self.enable_cache = enable_cache
         
-        # LRU cache using OrderedDict
-        # Key: cache_key (str), Value: (ResponsesAPIResult, timestamp)
-        self._cache: OrderedDict[str, tuple[ResponsesAPIResult, float]] = OrderedDict()
+        # Sharded LRU cache; the shard count is a power of two so a shard can
+        # be picked by masking the leading byte of the (hex) cache key
+        num_shards = 1
+        while (num_shards < MAX_CACHE_SHARDS
+               and max_cache_size // (num_shards * 2) >= MIN_SHARD_SIZE):
+            num_shards *= 2
+        base_capacity, extra = divmod(max_cache_size, num_shards)
+        self._shards = [
+            _CacheShard(base_capacity + (1 if i < extra else 0))
+            for i in range(num_shards)
+        ]
+        self._shard_mask = num_shards - 1
+        
+        # Recently computed cache keys, keyed by id(messages) plus the scalar
+        # request parameters. Value: (messages fingerprint, cache_key)
+        self._key_memo: OrderedDict[tuple, tuple[tuple, str]] = OrderedDict()
+        self._key_memo_lock = threading.Lock()
+        
+        # Statistics tracking (lock-free counters)
+        self._cache_hits = _EventCounter()
+        self._cache_misses = _EventCounter()
+        self._cache_bypassed = _EventCounter()
+    
+    @staticmethod
+    def _normalize_messages(messages: List[Dict[str, str]]) -> Tuple[Tuple[str, str], ...]:
+        """
+        Reduce messages to (role, content) pairs for hashing and comparison.
         
-        # Thread safety lock for cache operations
-        self._cache_lock = threading.Lock()
+        Only role and content are sent to the API (see ResponsesAPIClient),
+        so other message keys do not affect the response. Content given as
+        a list of parts (e.g. with cache_control breakpoints) is reduced to
+        canonical JSON.
         
-        # Statistics tracking
-        self._cache_hits = 0
-        self._cache_misses = 0
-        self._cache_bypassed = 0
+        Args:
+            messages: List of OpenAI-style messages
+            
+        Returns:
+            Tuple of (role, content) tuples
+        """
+        normalized = []
+        for message in messages:
+            content = message.get("content", "")
+            if not isinstance(content, str):
+                memo = _content_json_memo.get(id(content))
+                if memo is not None and memo[0] is content:
+                    content = memo[1]
+                else:
+                    encoded = json.dumps(content, sort_keys=True)
+                    if len(_content_json_memo) >= CONTENT_JSON_MEMO_SIZE:
+                        _content_json_memo.clear()
+                    _content_json_memo[id(content)] = (content, encoded)
+                    content = encoded
+            normalized.append((message.get("role", "user"), content))
+        return tuple(normalized)
     
     def _generate_cache_key(
         self,
         model: str,
-        messages: List[Dict[str, str]],
+        messages: Union[List[Dict[str, str]], Tuple[Tuple[str, str], ...]],
         temperature: float,
         max_tokens: Optional[int],
         max_output_tokens: Optional[int],
@@ -111,14 +274,15 @@ class CachedLLMClient:
         **kwargs
     ) -> str:
         """
-        Generate a unique cache key using SHA256 hash of request parameters.
+        Generate a unique cache key by hashing the request parameters.
         
         The cache key is deterministic - same parameters always produce the same key.
         This ensures that identical requests can retrieve cached responses.
         
         Args:
             model: Model name
-            messages: List of messages
+            messages: List of messages, or (role, content) pairs as returned
+                by _normalize_messages
             temperature: Sampling temperature
             max_tokens: Maximum tokens (legacy)
             max_output_tokens: Maximum output tokens
@@ -126,72 +290,175 @@ class CachedLLMClient:
             **kwargs: Additional parameters
             
         Returns:
-            SHA256 hash string as cache key
-        """
-        # Create a deterministic representation of the request
-        cache_data = {
-            "model": model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "max_output_tokens": max_output_tokens,
-            "reasoning_effort": reasoning_effort,
-            # Sort kwargs for deterministic ordering
-            "kwargs": sorted(kwargs.items())
-        }
+            Hex digest (32 chars) used as cache key
+        """
+        # Stream each field into the hasher instead of building one big JSON
+        # string; fields are tagged and every value is length-prefixed so
+        # field boundaries are unambiguous
+        if BLAKE3_AVAILABLE:
+            hasher = blake3.blake3()
+        else:
+            hasher = hashlib.blake2b(digest_size=CACHE_KEY_DIGEST_SIZE)
+        update = hasher.update
+        pack_length = self._LENGTH_STRUCT.pack
+        role_bytes = self._ROLE_BYTES
+        
+        def feed(text: str) -> None:
+            data = text.encode('utf-8')
+            update(pack_length(len(data)))
+            update(data)
+        
+        update(self._FIELD_MODEL)
+        feed(model)
+        update(self._FIELD_TEMPERATURE)
+        update(self._TEMPERATURE_STRUCT.pack(temperature))
+        update(self._FIELD_LIMITS)
+        feed(str(max_tokens))
+        feed(str(max_output_tokens))
+        feed(str(reasoning_effort))
+        
+        if not isinstance(messages, tuple):
+            messages = self._normalize_messages(messages)
+        update(self._FIELD_MESSAGES)
+        update(pack_length(len(messages)))
+        for role, content in messages:
+            encoded_role = role_bytes.get(role)
+            if encoded_role is None:
+                feed(role)
+            else:
+                update(encoded_role)
+            feed(content)
+        
+        # Sort kwargs for deterministic ordering
+        if kwargs:
+            update(self._FIELD_KWARGS)
+            for key in sorted(kwargs):
+                feed(key)
+                feed(json.dumps(kwargs[key], sort_keys=True))
+        
+        if BLAKE3_AVAILABLE:
+            return hasher.digest(CACHE_KEY_DIGEST_SIZE).hex()
+        return hasher.hexdigest()
+    
+    def _get_cache_key(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        max_output_tokens: Optional[int],
+        reasoning_effort: Optional[ReasoningEffort],
+        **kwargs
+    ) -> str:
+        """
+        Get the cache key for a request, reusing a memoized key when the same
+        messages list is passed again with unchanged contents.
+        
+        The memo is keyed on id(messages), so it is verified against a
+        fingerprint of the message fields before use; comparing the
+        fingerprint is far cheaper than rehashing long prompts.
+        
+        Returns:
+            Cache key as produced by _generate_cache_key
+        """
+        if kwargs:
+            # Extra kwargs may be unhashable, so skip the memo entirely
+            return self._generate_cache_key(
+                model, messages, temperature, max_tokens,
+                max_output_tokens, reasoning_effort, **kwargs
+            )
+        
+        memo_key = (id(messages), model, temperature, max_tokens,
+                    max_output_tokens, reasoning_effort)
+        # Normalized once; used both to verify the memo and to hash
+        fingerprint = self._normalize_messages(messages)
+        
+        # A single dict lookup is atomic under the GIL; only updates, which
+        # also evict, need the lock
+        memo = self._key_memo.get(memo_key)
+        if memo is not None and memo[0] == fingerprint:
+            return memo[1]
         
-        # Convert to JSON string (sorted keys for determinism)
-        cache_string = json.dumps(cache_data, sort_keys=True)
+        cache_key = self._generate_cache_key(
+            model, fingerprint, temperature, max_tokens,
+            max_output_tokens, reasoning_effort
+        )
         
-        # Generate SHA256 hash
-        hash_obj = hashlib.sha256(cache_string.encode('utf-8'))
-        cache_key = hash_obj.hexdigest()
+        with self._key_memo_lock:
+            self._key_memo[memo_key] = (fingerprint, cache_key)
+            if len(self._key_memo) > KEY_MEMO_SIZE:
+                self._key_memo.popitem(last=False)
         
         return cache_key
     
-    def _is_cache_valid(self, timestamp: float) -> bool:
+    def _get_shard(self, cache_key: str) -> _CacheShard:
+        """
+        Get the shard responsible for a cache key.
+        
+        Args:
+            cache_key: Hex cache key from _get_cache_key
+            
+        Returns:
+            The _CacheShard holding (or about to hold) the key
+        """
+        return self._shards[int(cache_key[:2], 16) & self._shard_mask]
+    
+    def _is_cache_valid(self, timestamp: float, current_time: Optional[float] = None) -> bool:
         """
         Check if a cached entry is still valid based on TTL.
         
         Args:
-            timestamp: Unix timestamp when the entry was cached
+            timestamp: time.monotonic() reading taken when the entry was cached
+            current_time: Current time.monotonic() reading, if already known
             
         Returns:
             True if entry is still valid, False if expired
         """
-        current_time = time.time()
+        if current_time is None:
+            current_time = time.monotonic()
         age_seconds = current_time - timestamp
         return age_seconds < self.ttl_seconds
     
-    def _evict_oldest(self):
+    def _evict_oldest(self, shard: _CacheShard):
         """
-        Evict the oldest (least recently used) entry from the cache.
+        Evict the oldest (least recently used) entry from a cache shard.
         
         OrderedDict maintains insertion order, so the first item is the oldest.
         When an item is accessed, it's moved to the end (most recent).
+        Must be called with shard.lock held.
         """
-        if self._cache:
+        if shard.entries:
             # Remove the first (oldest) item
-            self._cache.popitem(last=False)
+            shard.entries.popitem(last=False)
     
-    def _evict_expired(self):
+    def _evict_expired(self, shard: _CacheShard, current_time: Optional[float] = None):
         """
-        Remove all expired entries from the cache based on TTL.
+        Remove all expired entries from a cache shard based on TTL.
         
         This is called periodically to prevent the cache from filling
-        with expired entries.
+        with expired entries. Only heap items that are due are popped, so
+        the cost is O(expired * log N) rather than a scan of the shard.
+        Must be called with shard.lock held.
         """
-        current_time = time.time()
-        expired_keys = []
+        if current_time is None:
+            current_time = time.monotonic()
+        expiry = shard.expiry
+        entries = shard.entries
         
-        # Find all expired keys
-        for key, (result, timestamp) in self._cache.items():
-            if not self._is_cache_valid(timestamp):
-                expired_keys.append(key)
+        while expiry and expiry[0][0] <= current_time:
+            _, key = heapq.heappop(expiry)
+            entry = entries.get(key)
+            # Skip stale heap items whose key was evicted or refreshed
+            if entry is not None and current_time - entry[1] >= self.ttl_seconds:
+                del entries[key]
         
-        # Remove expired entries
-        for key in expired_keys:
-            del self._cache[key]
+        # Drop stale items once they dominate the heap
+        if len(expiry) > 2 * len(entries) + MIN_SHARD_SIZE:
+            shard.expiry = [
+                (timestamp + self.ttl_seconds, key)
+                for key, (_, timestamp) in entries.items()
+            ]
+            heapq.heapify(shard.expiry)
     
     def create(
         self,
@@ -215,7 +482,7 @@ class CachedLLMClient:
         6. Evicts old entries if cache is full
         
         Args:
-            model: Model to use (defaults to client's default_model)
+            model: Model to use (defaults to the client's default_model at construction)
             messages: List of OpenAI-style messages
             temperature: Sampling temperature (only 0.0 is cached)
             max_tokens: Maximum tokens to generate (legacy)
@@ -228,14 +495,13 @@ class CachedLLMClient:
         """
         # Use client's default model if not provided
         if model is None:
-            model = self.client.default_model
+            model = self._default_model
         
         # Only cache deterministic calls (temperature=0.0)
         if not self.enable_cache or temperature != 0.0:
-            with self._cache_lock:
-                self._cache_bypassed += 1
+            self._cache_bypassed.increment()
             # Bypass cache and call API directly
-            return self.client.create(
+            return self._client_create(
                 model=model,
                 messages=messages,
                 temperature=temperature,
@@ -246,7 +512,7 @@ class CachedLLMClient:
             )
         
         # Generate cache key
-        cache_key = self._generate_cache_key(
+        cache_key = self._get_cache_key(
             model=model,
             messages=messages or [],
             temperature=temperature,
@@ -256,26 +522,16 @@ class CachedLLMClient:
             **kwargs
         )
         
-        # Check if we have a valid cached response (thread-safe)
-        with self._cache_lock:
-            if cache_key in self._cache:
-                cached_result, timestamp = self._cache[cache_key]
-                
-                # Check if cache entry is still valid
-                if self._is_cache_valid(timestamp):
-                    # Cache hit! Move to end (most recently used)
-                    self._cache.move_to_end(cache_key)
-                    self._cache_hits += 1
-                    return cached_result
-                else:
-                    # Cache entry expired, remove it
-                    del self._cache[cache_key]
+        # Check if we have a valid cached response; a hit takes exactly one
+        # lock acquire and a miss two (lookup here, insert after the API call)
+        shard, cached_result = self._lookup(cache_key)
+        if cached_result is not None:
+            return cached_result
         
         # Cache miss - call the API (outside lock to allow concurrent API calls)
-        with self._cache_lock:
-            self._cache_misses += 1
+        cache_misses = self._cache_misses.increment()
         
-        result = self.client.create(
+        result = self._client_create(
             model=model,
             messages=messages,
             temperature=temperature,
@@ -285,20 +541,228 @@ class CachedLLMClient:
             **kwargs
         )
         
-        # Store result in cache with current timestamp (thread-safe)
-        with self._cache_lock:
-            current_time = time.time()
-            self._cache[cache_key] = (result, current_time)
+        self._store(shard, cache_key, result, cache_misses)
+        
+        return result
+    
+    async def acreate(
+        self,
+        model: Optional[str] = None,
+        messages: Optional[List[Dict[str, str]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_output_tokens: Optional[int] = None,
+        reasoning_effort: Optional[ReasoningEffort] = None,
+        **kwargs
+    ) -> ResponsesAPIResult:
+        """
+        Async variant of create() sharing the same cache.
+        
+        Awaits the wrapped client's acreate() when it has one; otherwise the
+        blocking create() runs in a worker thread so the event loop is never
+        blocked on network I/O.
+        
+        Args:
+            Same as create()
             
-            # Evict oldest entry if cache is full
-            if len(self._cache) > self.max_cache_size:
-                self._evict_oldest()
+        Returns:
+            ResponsesAPIResult with content and token tracking
+        """
+        if model is None:
+            model = self._default_model
+        
+        call_kwargs = dict(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            max_output_tokens=max_output_tokens,
+            reasoning_effort=reasoning_effort,
+            **kwargs
+        )
+        
+        if not self.enable_cache or temperature != 0.0:
+            self._cache_bypassed.increment()
+            return await self._call_client_async(call_kwargs)
+        
+        cache_key = self._get_cache_key(
+            model=model,
+            messages=messages or [],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            max_output_tokens=max_output_tokens,
+            reasoning_effort=reasoning_effort,
+            **kwargs
+        )
+        
+        shard, cached_result = self._lookup(cache_key)
+        if cached_result is not None:
+            return cached_result
+        
+        cache_misses = self._cache_misses.increment()
+        result = await self._call_client_async(call_kwargs)
+        self._store(shard, cache_key, result, cache_misses)
+        
+        return result
+    
+    async def acreate_n(
+        self,
+        n: int,
+        model: Optional[str] = None,
+        messages: Optional[List[Dict[str, str]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_output_tokens: Optional[int] = None,
+        reasoning_effort: Optional[ReasoningEffort] = None,
+        **kwargs
+    ) -> List[ResponsesAPIResult]:
+        """
+        Sample n completions of the same messages in one request.
+        
+        Samples are never cached. If the wrapped client has no acreate_n(),
+        a single completion is returned, just as from a provider that
+        ignores n; callers top up short lists themselves.
+        
+        Args:
+            n: Number of completions to sample
+            Remaining arguments as for create()
+            
+        Returns:
+            Up to n ResponsesAPIResult objects
+        """
+        if model is None:
+            model = self._default_model
+        
+        call_kwargs = dict(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            max_output_tokens=max_output_tokens,
+            reasoning_effort=reasoning_effort,
+            **kwargs
+        )
+        
+        self._cache_bypassed.increment()
+        if self._client_acreate_n is not None:
+            return await self._client_acreate_n(n, **call_kwargs)
+        return [await self._call_client_async(call_kwargs)]
+    
+    async def _call_client_async(self, call_kwargs: Dict[str, Any]) -> ResponsesAPIResult:
+        """Call the wrapped client without blocking the running event loop."""
+        if self._client_acreate is not None:
+            return await self._client_acreate(**call_kwargs)
+        return await asyncio.to_thread(self._client_create, **call_kwargs)
+    
+    def _lookup(self, cache_key: str) -> Tuple[_CacheShard, Optional[ResponsesAPIResult]]:
+        """
+        Look up a cache key in its shard.
+        
+        Returns:
+            Tuple of (shard, cached result or None on a miss)
+        """
+        shard = self._get_shard(cache_key)
+        now = time.monotonic()
+        with shard.lock:
+            entry = shard.entries.get(cache_key)
+            if entry is not None:
+                cached_result, timestamp = entry
+                
+                # Check if cache entry is still valid
+                if self._is_cache_valid(timestamp, now):
+                    # Cache hit! Move to end (most recently used)
+                    shard.entries.move_to_end(cache_key)
+                    self._cache_hits.increment()
+                    return shard, cached_result
+                else:
+                    # Cache entry expired, remove it
+                    del shard.entries[cache_key]
+        
+        return shard, None
+    
+    def _store(
+        self,
+        shard: _CacheShard,
+        cache_key: str,
+        result: ResponsesAPIResult,
+        cache_misses: int
+    ):
+        """Store an API result in its shard (thread-safe)."""
+        with shard.lock:
+            current_time = time.monotonic()
+            shard.entries[cache_key] = (result, current_time)
+            heapq.heappush(shard.expiry, (current_time + self.ttl_seconds, cache_key))
+            
+            # Evict oldest entry if the shard is full
+            if len(shard.entries) > shard.capacity:
+                self._evict_oldest(shard)
             
             # Periodically clean up expired entries (every 10 misses)
-            if self._cache_misses % 10 == 0:
-                self._evict_expired()
+            if cache_misses % 10 == 0:
+                self._evict_expired(shard, current_time)
+    
+    def create_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        max_workers: Optional[int] = None
+    ) -> List[ResponsesAPIResult]:
+        """
+        Run several create() requests at once, e.g. the k branches of MaTTS.
         
-        return result
+        Cache keys for all cacheable requests are computed up front in one
+        pass, identical requests within the batch share a single call, and
+        the remaining calls are dispatched concurrently. Each dispatched call
+        goes through create(), whose key memo makes re-deriving the key a
+        dictionary lookup.
+        
+        Args:
+            requests: Keyword arguments for create(), one dict per request
+            max_workers: Maximum concurrent calls (default: one per call)
+            
+        Returns:
+            Results in the same order as requests
+            
+        Raises:
+            The first exception raised by an underlying call
+        """
+        # Map each request to the index of the call that will serve it
+        leaders: Dict[str, int] = {}
+        served_by: List[int] = []
+        calls: List[Dict[str, Any]] = []
+        
+        for request in requests:
+            temperature = request.get("temperature", 0.7)
+            if self.enable_cache and temperature == 0.0:
+                kwargs = {
+                    k: v for k, v in request.items()
+                    if k not in ("model", "messages", "temperature", "max_tokens",
+                                 "max_output_tokens", "reasoning_effort")
+                }
+                cache_key = self._get_cache_key(
+                    model=request.get("model") or self._default_model,
+                    messages=request.get("messages") or [],
+                    temperature=temperature,
+                    max_tokens=request.get("max_tokens"),
+                    max_output_tokens=request.get("max_output_tokens"),
+                    reasoning_effort=request.get("reasoning_effort"),
+                    **kwargs
+                )
+                if cache_key in leaders:
+                    # Duplicate within the batch; served by the first copy
+                    served_by.append(leaders[cache_key])
+                    self._cache_hits.increment()
+                    continue
+                leaders[cache_key] = len(calls)
+            served_by.append(len(calls))
+            calls.append(request)
+        
+        if len(calls) <= 1:
+            results = [self.create(**request) for request in calls]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers or len(calls)) as executor:
+                results = list(executor.map(lambda request: self.create(**request), calls))
+        
+        return [results[i] for i in served_by]
     
     def get_statistics(self) -> CacheStatistics:
         """
@@ -307,31 +771,33 @@ class CachedLLMClient:
         Returns:
             CacheStatistics with hit rate and cost savings estimates
         """
-        with self._cache_lock:
-            total_requests = self._cache_hits + self._cache_misses + self._cache_bypassed
-            
-            # Calculate hit rate (only for cacheable requests)
-            cacheable_requests = self._cache_hits + self._cache_misses
-            if cacheable_requests > 0:
-                hit_rate = self._cache_hits / cacheable_requests
-            else:
-                hit_rate = 0.0
-            
-            # Estimate cost savings
-            # Assume cache hits save 100% of API cost for those requests
-            if total_requests > 0:
-                cost_savings = self._cache_hits / total_requests
-            else:
-                cost_savings = 0.0
-            
-            return CacheStatistics(
-                cache_hits=self._cache_hits,
-                cache_misses=self._cache_misses,
-                cache_bypassed=self._cache_bypassed,
-                total_requests=total_requests,
-                hit_rate=hit_rate,
-                cost_savings_estimate=cost_savings
-            )
+        cache_hits = self._cache_hits.value()
+        cache_misses = self._cache_misses.value()
+        cache_bypassed = self._cache_bypassed.value()
+        total_requests = cache_hits + cache_misses + cache_bypassed
+        
+        # Calculate hit rate (only for cacheable requests)
+        cacheable_requests = cache_hits + cache_misses
+        if cacheable_requests > 0:
+            hit_rate = cache_hits / cacheable_requests
+        else:
+            hit_rate = 0.0
+        
+        # Estimate cost savings
+        # Assume cache hits save 100% of API cost for those requests
+        if total_requests > 0:
+            cost_savings = cache_hits / total_requests
+        else:
+            cost_savings = 0.0
+        
+        return CacheStatistics(
+            cache_hits=cache_hits,
+            cache_misses=cache_misses,
+            cache_bypassed=cache_bypassed,
+            total_requests=total_requests,
+            hit_rate=hit_rate,
+            cost_savings_estimate=cost_savings
+        )
     
     def clear_cache(self):
         """
@@ -339,8 +805,10 @@ class CachedLLMClient:
         
         Useful for testing or when you want to force fresh API calls.
         """
-        with self._cache_lock:
-            self._cache.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.expiry.clear()
     
     def reset_statistics(self):
         """
@@ -348,10 +816,9 @@ class CachedLLMClient:
         
         Useful for benchmarking or testing.
         """
-        with self._cache_lock:
-            self._cache_hits = 0
-            self._cache_misses = 0
-            self._cache_bypassed = 0
+        self._cache_hits.reset()
+        self._cache_misses.reset()
+        self._cache_bypassed.reset()
     
     def get_cache_size(self) -> int:
         """
@@ -360,8 +827,11 @@ class CachedLLMClient:
         Returns:
             Number of cached responses
         """
-        with self._cache_lock:
-            return len(self._cache)
+        size = 0
+        for shard in self._shards:
+            with shard.lock:
+                size += len(shard.entries)
+        return size
     
     def validate_api_key(self) -> bool:
         """
@@ -371,3 +841,219 @@ class CachedLLMClient:
             True if API key is valid
         """
         return self.client.validate_api_key()
+
+
+class BatchingLLMClient:
+    """
+    Coalesces concurrent LLM requests from many in-flight tasks.
+    
+    Wraps a CachedLLMClient (or any client with create()/acreate()) and
+    routes every create()/acreate() call through a queue drained by a
+    background event loop. Requests arriving within max_batch_delay of each
+    other (up to max_batch) form one batch, which is grouped by identical
+    request parameters:
+    
+    - Deterministic duplicates (temperature=0.0) share a single call
+    - Sampled duplicates become one n=len(group) call via acreate_n()
+      when the wrapped client supports it
+    - Every other group is dispatched concurrently, bounded by one
+      max_concurrency semaphore shared by all callers
+    
+    The provider API has no multi-prompt batch endpoint, so distinct prompts
+    are batched by arriving at the provider together; its continuous
+    batching then serves many agents' steps at once instead of one at a time.
+    
+    Calls may come from any thread or event loop, so agents driven
+    concurrently (one agent per task, e.g. via asyncio.to_thread or a thread
+    pool) can share one BatchingLLMClient. Other attributes are delegated to
+    the wrapped client.
+    """
+    
+    def __init__(
+        self,
+        client: CachedLLMClient,
+        max_batch: int = 8,
+        max_batch_delay: float = 0.02,
+        max_concurrency: int = 8
+    ):
+        """
+        Initialize the batching client.
+        
+        Args:
+            client: The client to wrap (usually a CachedLLMClient)
+            max_batch: Maximum number of requests collected into one batch
+            max_batch_delay: Seconds to wait for more requests after the first
+            max_concurrency: Maximum concurrent calls to the wrapped client
+        """
+        self.client = client
+        self.default_model = getattr(client, "default_model", None)
+        self.max_batch = max(1, max_batch)
+        self.max_batch_delay = max_batch_delay
+        self.max_concurrency = max(1, max_concurrency)
+        
+        client_acreate = getattr(client, "acreate", None)
+        self._client_acreate = (
+            client_acreate if inspect.iscoroutinefunction(client_acreate) else None
+        )
+        client_acreate_n = getattr(client, "acreate_n", None)
+        self._client_acreate_n = (
+            client_acreate_n if inspect.iscoroutinefunction(client_acreate_n) else None
+        )
+        
+        # Background loop that owns the queue and semaphore; started on first use
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._start_lock = threading.Lock()
+        
+        self._requests = _EventCounter()
+        self._batches = _EventCounter()
+        self._upstream_calls = _EventCounter()
+    
+    def __getattr__(self, name: str) -> Any:
+        """Delegate anything not batched (statistics, create_n, ...) to the client."""
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+    
+    def create(self, **kwargs) -> ResponsesAPIResult:
+        """Queue a request and block until its batch is served (any thread)."""
+        return self._submit(kwargs).result()
+    
+    async def acreate(self, **kwargs) -> ResponsesAPIResult:
+        """Queue a request and await its result (any event loop)."""
+        return await asyncio.wrap_future(self._submit(kwargs))
+    
+    def close(self):
+        """Stop the background loop; pending requests are cancelled."""
+        with self._start_lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = self._queue = self._semaphore = None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop)
+            thread.join(timeout=5)
+            if not thread.is_alive():
+                loop.close()
+    
+    @staticmethod
+    async def _shutdown():
+        """Cancel the drain task and in-flight dispatches, then stop the loop."""
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        asyncio.get_running_loop().stop()
+    
+    def get_batching_statistics(self) -> Dict[str, Any]:
+        """
+        Get request coalescing statistics.
+        
+        Returns:
+            Dictionary with requests, batches, upstream calls and the mean
+            number of requests per batch
+        """
+        requests = self._requests.value()
+        batches = self._batches.value()
+        return {
+            "requests": requests,
+            "batches": batches,
+            "upstream_calls": self._upstream_calls.value(),
+            "mean_batch_size": requests / batches if batches else 0.0
+        }
+    
+    def _submit(self, kwargs: Dict[str, Any]):
+        """Hand a request to the background loop, returning a concurrent Future."""
+        self._requests.increment()
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._enqueue(kwargs), loop)
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background loop and its drain task if not running."""
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                
+                def run():
+                    asyncio.set_event_loop(loop)
+                    self._queue = asyncio.Queue()
+                    self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                    loop.create_task(self._drain())
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+                
+                thread = threading.Thread(
+                    target=run, name="llm-batcher", daemon=True
+                )
+                thread.start()
+                started.wait()
+                self._loop, self._thread = loop, thread
+            return self._loop
+    
+    async def _enqueue(self, kwargs: Dict[str, Any]) -> ResponsesAPIResult:
+        """Put a request on the queue and wait for its batch to resolve it."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((kwargs, future))
+        return await future
+    
+    async def _drain(self):
+        """Collect requests into batches and dispatch each batch."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_batch_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            self._batches.increment()
+            groups: Dict[str, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+            for kwargs, future in batch:
+                key = json.dumps(kwargs, sort_keys=True, default=str)
+                groups.setdefault(key, []).append((kwargs, future))
+            for group in groups.values():
+                loop.create_task(self._dispatch(group))
+    
+    async def _dispatch(self, group: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Serve a group of identical requests with as few upstream calls as possible."""
+        kwargs = group[0][0]
+        futures = [future for _, future in group]
+        try:
+            if kwargs.get("temperature", 0.7) == 0.0:
+                # Deterministic: one call serves every copy
+                result = await self._call(kwargs)
+                results = [result] * len(futures)
+            else:
+                results = []
+                if len(futures) > 1 and self._client_acreate_n is not None:
+                    async with self._semaphore:
+                        self._upstream_calls.increment()
+                        results = list(await self._client_acreate_n(len(futures), **kwargs))
+                # Providers may ignore n; sample the rest individually
+                results += await asyncio.gather(*[
+                    self._call(kwargs) for _ in range(len(futures) - len(results))
+                ])
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def _call(self, kwargs: Dict[str, Any]) -> ResponsesAPIResult:
+        """Make one upstream call under the shared concurrency bound."""
+        async with self._semaphore:
+            self._upstream_calls.increment()
+            if self._client_acreate is not None:
+                return await self._client_acreate(**kwargs)
+            return await asyncio.to_thread(self.client.create, **kwargs)
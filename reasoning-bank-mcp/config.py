@@ -9,6 +9,7 @@ This module provides centralized configuration with:
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 from schemas import (
     ReasoningBankConfig,
@@ -25,6 +26,7 @@ def load_config_from_env() -> ReasoningBankConfig:
     Environment variables:
         OPENROUTER_API_KEY: API key for OpenRouter
         REASONING_MODEL: Model identifier (default: google/gemini-2.5-pro)
+        EVALUATOR_MODEL: Model for solution evaluation (default: REASONING_MODEL)
         REASONING_EFFORT: Reasoning effort level (minimal, low, medium, high)
         MAX_ITERATIONS: Maximum refinement iterations
         SUCCESS_THRESHOLD: Quality threshold for success (0.0-1.0)
@@ -40,6 +42,7 @@ def load_config_from_env() -> ReasoningBankConfig:
         ENABLE_CACHE: Enable LLM response caching (true/false)
         CACHE_SIZE: Maximum cache entries
         CACHE_TTL_SECONDS: Cache entry TTL
+        ENABLE_SEMANTIC_CACHE: Reuse solutions of similar solved tasks (true/false, default false)
     
     Returns:
         Validated ReasoningBankConfig instance
@@ -48,74 +51,92 @@ def load_config_from_env() -> ReasoningBankConfig:
         ValidationError: If configuration validation fails
     """
     
-    # Parse reasoning effort from env
-    reasoning_effort_str = os.getenv("REASONING_EFFORT", "medium").lower()
-    try:
-        reasoning_effort = ReasoningEffort(reasoning_effort_str)
-    except ValueError:
-        reasoning_effort = ReasoningEffort.MEDIUM
+    # Read os.environ directly: copying it decodes every variable in the
+    # process environment, which costs more than the ~30 lookups below
+    env = os.environ
     
-    # Parse storage backend from env
-    storage_backend_str = os.getenv("STORAGE_BACKEND", "chromadb").lower()
-    try:
-        storage_backend = StorageBackend(storage_backend_str)
-    except ValueError:
-        storage_backend = StorageBackend.CHROMADB
+    def get_str(name: str, default: Optional[str] = None) -> Optional[str]:
+        return env.get(name, default)
+    
+    def get_int(name: str, default: int) -> int:
+        value = env.get(name)
+        return int(value) if value else default
+    
+    def get_float(name: str, default: float) -> float:
+        value = env.get(name)
+        return float(value) if value else default
+    
+    def get_bool(name: str, default: bool) -> bool:
+        value = env.get(name)
+        return value.lower() == "true" if value else default
+    
+    # Parse enums from env, falling back to the defaults on unknown values
+    reasoning_effort = ReasoningEffort.__members__.get(
+        env.get("REASONING_EFFORT", "medium").upper(), ReasoningEffort.MEDIUM
+    )
+    storage_backend = StorageBackend.__members__.get(
+        env.get("STORAGE_BACKEND", "chromadb").upper(), StorageBackend.CHROMADB
+    )
     
     # Build token budget config
     token_budget = TokenBudgetConfig(
-        max_output_tokens=int(os.getenv("MAX_OUTPUT_TOKENS", "9000")),
-        max_prompt_tokens=int(os.getenv("MAX_PROMPT_TOKENS", "12000")),
-        generation_tokens=int(os.getenv("GENERATION_TOKENS", "8000")),
-        evaluation_tokens=int(os.getenv("EVALUATION_TOKENS", "3000")),
-        judgment_tokens=int(os.getenv("JUDGMENT_TOKENS", "4000")),
-        memory_extraction_tokens=int(os.getenv("MEMORY_EXTRACTION_TOKENS", "6000")),
-        truncation_threshold=int(os.getenv("TRUNCATION_THRESHOLD", "12000")),
-        truncation_head_ratio=float(os.getenv("TRUNCATION_HEAD_RATIO", "0.6"))
+        max_output_tokens=get_int("MAX_OUTPUT_TOKENS", 9000),
+        max_prompt_tokens=get_int("MAX_PROMPT_TOKENS", 12000),
+        generation_tokens=get_int("GENERATION_TOKENS", 8000),
+        evaluation_tokens=get_int("EVALUATION_TOKENS", 3000),
+        judgment_tokens=get_int("JUDGMENT_TOKENS", 4000),
+        memory_extraction_tokens=get_int("MEMORY_EXTRACTION_TOKENS", 6000),
+        truncation_threshold=get_int("TRUNCATION_THRESHOLD", 12000),
+        truncation_head_ratio=get_float("TRUNCATION_HEAD_RATIO", 0.6)
     )
     
     # Build main config
     config = ReasoningBankConfig(
-        model=os.getenv("REASONING_MODEL", "google/gemini-2.5-pro"),
+        model=get_str("REASONING_MODEL", "google/gemini-2.5-pro"),
+        evaluator_model=get_str("EVALUATOR_MODEL"),
         reasoning_effort=reasoning_effort,
-        api_key=os.getenv("OPENROUTER_API_KEY"),
+        api_key=get_str("OPENROUTER_API_KEY"),
         token_budget=token_budget,
-        retrieval_k=int(os.getenv("RETRIEVAL_K", "3")),
-        max_memory_items=int(os.getenv("MAX_MEMORY_ITEMS", "3")),
-        max_iterations=int(os.getenv("MAX_ITERATIONS", "3")),
-        success_threshold=float(os.getenv("SUCCESS_THRESHOLD", "0.8")),
-        temperature_generate=float(os.getenv("TEMPERATURE_GENERATE", "0.7")),
-        temperature_judge=float(os.getenv("TEMPERATURE_JUDGE", "0.0")),
+        retrieval_k=get_int("RETRIEVAL_K", 3),
+        max_memory_items=get_int("MAX_MEMORY_ITEMS", 3),
+        max_iterations=get_int("MAX_ITERATIONS", 3),
+        success_threshold=get_float("SUCCESS_THRESHOLD", 0.8),
+        temperature_generate=get_float("TEMPERATURE_GENERATE", 0.7),
+        temperature_judge=get_float("TEMPERATURE_JUDGE", 0.0),
         # Storage backend selection
         storage_backend=storage_backend,
         # ChromaDB configuration
-        persist_directory=os.getenv("REASONING_BANK_DATA", "./chroma_data"),
-        traces_directory=os.getenv("REASONING_BANK_TRACES", "./traces"),
-        collection_name=os.getenv("COLLECTION_NAME", "reasoning_memories"),
+        persist_directory=get_str("REASONING_BANK_DATA", "./chroma_data"),
+        traces_directory=get_str("REASONING_BANK_TRACES", "./traces"),
+        collection_name=get_str("COLLECTION_NAME", "reasoning_memories"),
         # Supabase configuration
-        supabase_url=os.getenv("SUPABASE_URL"),
-        supabase_key=os.getenv("SUPABASE_KEY"),
-        supabase_traces_table=os.getenv("SUPABASE_TRACES_TABLE", "reasoning_traces"),
-        supabase_memories_table=os.getenv("SUPABASE_MEMORIES_TABLE", "memory_items"),
+        supabase_url=get_str("SUPABASE_URL"),
+        supabase_key=get_str("SUPABASE_KEY"),
+        supabase_traces_table=get_str("SUPABASE_TRACES_TABLE", "reasoning_traces"),
+        supabase_memories_table=get_str("SUPABASE_MEMORIES_TABLE", "memory_items"),
         # Retry configuration
-        retry_attempts=int(os.getenv("RETRY_ATTEMPTS", "3")),
-        retry_min_wait=int(os.getenv("RETRY_MIN_WAIT", "2")),
-        retry_max_wait=int(os.getenv("RETRY_MAX_WAIT", "10")),
+        retry_attempts=get_int("RETRY_ATTEMPTS", 3),
+        retry_min_wait=get_int("RETRY_MIN_WAIT", 2),
+        retry_max_wait=get_int("RETRY_MAX_WAIT", 10),
         # Cache configuration
-        enable_cache=os.getenv("ENABLE_CACHE", "true").lower() == "true",
-        cache_size=int(os.getenv("CACHE_SIZE", "100")),
-        cache_ttl_seconds=int(os.getenv("CACHE_TTL_SECONDS", "3600"))
+        enable_cache=get_bool("ENABLE_CACHE", True),
+        cache_size=get_int("CACHE_SIZE", 100),
+        cache_ttl_seconds=get_int("CACHE_TTL_SECONDS", 3600),
+        enable_semantic_cache=get_bool("ENABLE_SEMANTIC_CACHE", False)
     )
     
     return config
 
 
+@lru_cache(maxsize=1)
 def get_config() -> ReasoningBankConfig:
     """
     Get validated configuration instance
     
     This is the main entry point for accessing configuration.
-    Call this once at application startup and reuse the instance.
+    The environment is read and validated on the first call only; later
+    calls return the same instance. Call get_config.cache_clear() after
+    changing environment variables (e.g. in tests) to reload it.
     
     Returns:
         Validated ReasoningBankConfig
@@ -125,7 +146,7 @@ def get_config() -> ReasoningBankConfig:
 
 # Convenience function for backwards compatibility
 def get_token_budget() -> TokenBudgetConfig:
-    """Get token budget configuration"""
+    """Get token budget configuration (from the cached config)"""
     config = get_config()
     return config.token_budget
 
@@ -16,24 +16,53 @@ class ReasoningBankError(Exception):
     allowing for easy catching of all ReasoningBank-specific errors.
     """
     
-    def __init__(self, message: str, context: Optional[Dict[str, Any]] = None):
+    # Context fields that may hold long text, mapped to the number of
+    # characters kept when the error is formatted. The context itself keeps
+    # the full value; truncation only happens in __str__.
+    _truncate_fields: Dict[str, int] = {}
+    
+    def __init__(self, message: str, context: Optional[Dict[str, Any]] = None,
+                 **fields: Any):
         """
         Initialize the exception with a message and optional context.
         
         Args:
             message: Human-readable error message
             context: Optional dictionary containing additional error context
+            **fields: Named context fields; None values are skipped and the
+                rest take precedence over keys in context
         """
         super().__init__(message)
         self.message = message
         self.context = context or {}
+        if fields:
+            extra = {k: v for k, v in fields.items() if v is not None}
+            if extra:
+                # Merge into a new dict rather than mutating the caller's
+                self.context = {**self.context, **extra}
+        self._str: Optional[str] = None
     
     def __str__(self) -> str:
         """Return string representation with context if available."""
-        if self.context:
-            context_str = ", ".join(f"{k}={v}" for k, v in self.context.items())
-            return f"{self.message} (Context: {context_str})"
-        return self.message
+        # Formatted once and reused, since errors are often logged repeatedly
+        if self._str is None:
+            if self.context:
+                limits = self._truncate_fields
+                context_str = ", ".join(
+                    f"{k}={self._truncate(v, limits[k]) if k in limits else v}"
+                    for k, v in self.context.items()
+                )
+                self._str = f"{self.message} (Context: {context_str})"
+            else:
+                self._str = self.message
+        return self._str
+    
+    @staticmethod
+    def _truncate(value: Any, limit: int) -> Any:
+        """Shorten a long string context value for display."""
+        if isinstance(value, str) and len(value) > limit:
+            return value[:limit] + "..."
+        return value
 
 
 class MemoryRetrievalError(ReasoningBankError):
@@ -55,10 +84,7 @@ class MemoryRetrievalError(ReasoningBankError):
             query: The query that failed (if applicable)
             context: Additional error context
         """
-        ctx = context or {}
-        if query:
-            ctx['query'] = query
-        super().__init__(message, ctx)
+        super().__init__(message, context, query=query)
 
 
 class MemoryStorageError(ReasoningBankError):
@@ -80,10 +106,7 @@ class MemoryStorageError(ReasoningBankError):
             memory_id: ID of the memory that failed to store
             context: Additional error context
         """
-        ctx = context or {}
-        if memory_id:
-            ctx['memory_id'] = memory_id
-        super().__init__(message, ctx)
+        super().__init__(message, context, memory_id=memory_id)
 
 
 class LLMGenerationError(ReasoningBankError):
@@ -107,12 +130,7 @@ class LLMGenerationError(ReasoningBankError):
             status_code: HTTP status code if applicable
             context: Additional error context
         """
-        ctx = context or {}
-        if model:
-            ctx['model'] = model
-        if status_code:
-            ctx['status_code'] = status_code
-        super().__init__(message, ctx)
+        super().__init__(message, context, model=model, status_code=status_code)
 
 
 class InvalidTaskError(ReasoningBankError):
@@ -123,6 +141,8 @@ class InvalidTaskError(ReasoningBankError):
     or contain invalid characters or formatting.
     """
     
+    _truncate_fields = {'task': 100}
+    
     def __init__(self, message: str = "Invalid task description provided",
                  task: Optional[str] = None,
                  context: Optional[Dict[str, Any]] = None):
@@ -131,14 +151,10 @@ class InvalidTaskError(ReasoningBankError):
         
         Args:
             message: Error message
-            task: The invalid task description
+            task: The invalid task description (truncated when formatted)
             context: Additional error context
         """
-        ctx = context or {}
-        if task:
-            # Truncate task if too long for error message
-            ctx['task'] = task[:100] + "..." if len(task) > 100 else task
-        super().__init__(message, ctx)
+        super().__init__(message, context, task=task)
 
 
 class JSONParseError(ReasoningBankError):
@@ -149,6 +165,8 @@ class JSONParseError(ReasoningBankError):
     data is corrupted.
     """
     
+    _truncate_fields = {'raw_content': 200}
+    
     def __init__(self, message: str = "Failed to parse JSON response",
                  raw_content: Optional[str] = None,
                  context: Optional[Dict[str, Any]] = None):
@@ -157,14 +175,10 @@ class JSONParseError(ReasoningBankError):
         
         Args:
             message: Error message
-            raw_content: The raw content that failed to parse
+            raw_content: The raw content that failed to parse (truncated when formatted)
             context: Additional error context
         """
-        ctx = context or {}
-        if raw_content:
-            # Truncate content if too long
-            ctx['raw_content'] = raw_content[:200] + "..." if len(raw_content) > 200 else raw_content
-        super().__init__(message, ctx)
+        super().__init__(message, context, raw_content=raw_content)
 
 
 class EmbeddingError(ReasoningBankError):
@@ -175,6 +189,8 @@ class EmbeddingError(ReasoningBankError):
     or embedding service failures.
     """
     
+    _truncate_fields = {'text': 100}
+    
     def __init__(self, message: str = "Failed to generate embeddings",
                  text: Optional[str] = None,
                  model_name: Optional[str] = None,
@@ -184,17 +200,11 @@ class EmbeddingError(ReasoningBankError):
         
         Args:
             message: Error message
-            text: The text that failed to embed
+            text: The text that failed to embed (truncated when formatted)
             model_name: The embedding model that failed
             context: Additional error context
         """
-        ctx = context or {}
-        if text:
-            # Truncate text if too long
-            ctx['text'] = text[:100] + "..." if len(text) > 100 else text
-        if model_name:
-            ctx['model_name'] = model_name
-        super().__init__(message, ctx)
+        super().__init__(message, context, text=text, model_name=model_name)
 
 
 class APIKeyError(ReasoningBankError):
@@ -216,10 +226,7 @@ class APIKeyError(ReasoningBankError):
             key_name: Name of the missing/invalid API key
             context: Additional error context
         """
-        ctx = context or {}
-        if key_name:
-            ctx['key_name'] = key_name
-        super().__init__(message, ctx)
+        super().__init__(message, context, key_name=key_name)
 
 
 class TokenBudgetExceededError(ReasoningBankError):
@@ -243,12 +250,8 @@ class TokenBudgetExceededError(ReasoningBankError):
             token_limit: The token limit that was exceeded
             context: Additional error context
         """
-        ctx = context or {}
-        if tokens_used is not None:
-            ctx['tokens_used'] = tokens_used
-        if token_limit is not None:
-            ctx['token_limit'] = token_limit
-        super().__init__(message, ctx)
+        super().__init__(message, context, tokens_used=tokens_used,
+                         token_limit=token_limit)
 
 
 class MemoryValidationError(ReasoningBankError):
@@ -272,9 +275,5 @@ class MemoryValidationError(ReasoningBankError):
             validation_errors: List of specific validation errors
             context: Additional error context
         """
-        ctx = context or {}
-        if memory_id:
-            ctx['memory_id'] = memory_id
-        if validation_errors:
-            ctx['validation_errors'] = validation_errors
-        super().__init__(message, ctx)
+        super().__init__(message, context, memory_id=memory_id,
+                         validation_errors=validation_errors)
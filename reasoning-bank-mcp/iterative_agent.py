@@ -15,23 +15,140 @@ Requirements addressed: 2.1-2.5, 3.1-3.5, 14.1-14.5
 
 import asyncio
 import hashlib
+import inspect
+import json
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
+from functools import lru_cache
 from typing import List, Dict, Optional, Any, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+import numpy as np
 
 from reasoning_bank_core import ReasoningBank, MemoryItem
 from cached_llm_client import CachedLLMClient
+from performance_optimizer import SemanticCache
 from exceptions import (
     LLMGenerationError,
     TokenBudgetExceededError,
     InvalidTaskError
 )
 from schemas import TrajectoryStep
-from performance_optimizer import PromptCompressor
+
+# xxhash is an optional, much faster non-cryptographic hash for loop
+# detection; blake3 (SIMD, already used for LLM cache keys) is the next
+# choice and a truncated SHA256 the last (hardware-accelerated on most CPUs,
+# so faster than blake2b here)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# tiktoken gives real token counts for the prompt budget; without it the
+# 4 chars/token heuristic is used
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
 
 
 logger = logging.getLogger(__name__)
 
+# Number of initial generation and refinement prompts memoized per agent
+PROMPT_CACHE_SIZE = 32
+
+# Think-step system prefixes memoized per process (shared by all agents),
+# see _static_prefix_text
+STATIC_PREFIX_CACHE_SIZE = 512
+
+# Most recent solution hashes remembered for loop detection
+MAX_TRAJECTORY_HASHES = 64
+
+# Evaluation results memoized per agent run, see _evaluate_step
+EVAL_CACHE_SIZE = 128
+
+# Scores from evaluator_model this close to success_threshold are
+# re-evaluated with the generation model, since they decide termination
+EVALUATOR_ESCALATION_MARGIN = 0.05
+
+# Texts longer than this are not tokenized in full; the token count is
+# extrapolated from a head and tail sample of TOKEN_SAMPLE_CHARS each
+EXACT_TOKENIZE_MAX_CHARS = 64_000
+TOKEN_SAMPLE_CHARS = 4096
+
+# Inserted by _truncate_prompt where the middle of a prompt was removed
+TRUNCATION_MARKER = "\n\n[... Content truncated to fit token budget ...]\n\n"
+
+# Role line opening the system message of every think step
+THINK_SYSTEM_PROMPT = "You are an expert problem solver and programmer."
+
+# Static instructions opening the generation and refinement prompts; they
+# come before the task so the cacheable prefix extends past them
+GENERATION_INSTRUCTIONS = """# Instructions
+Generate a high-quality solution to the task below.
+If memories are provided, learn from the patterns and avoid past mistakes.
+Provide clear, well-structured code with explanations."""
+
+REFINEMENT_INSTRUCTIONS = """# Instructions
+Refine the previous solution based on the evaluation feedback.
+Address the specific issues mentioned in the feedback.
+Maintain what was working well in the previous attempt.
+Provide an improved, complete solution."""
+
+# "Score: ..." / "Feedback: ..." lines of an evaluation response; matched
+# the way the line-by-line parser did (case-insensitive, leading whitespace
+# allowed, rest of that line only)
+_SCORE_LINE_RE = re.compile(r"^[^\S\n]*score:(.*)$", re.IGNORECASE | re.MULTILINE)
+_FEEDBACK_LINE_RE = re.compile(r"^[^\S\n]*feedback:(.*)$", re.IGNORECASE | re.MULTILINE)
+
+# Static evaluation instructions. They form the system message so the
+# provider can cache them as a prefix; only the task and solution(s)
+# follow in the user message.
+_SCORING_GUIDE = """**Scoring Guide:**
+- 0.0-0.3: Major issues, doesn't work
+- 0.4-0.6: Partial solution, has problems
+- 0.7-0.8: Good solution, minor issues
+- 0.9-1.0: Excellent solution"""
+
+EVALUATION_SYSTEM_PROMPT = f"""You are an expert code reviewer and evaluator.
+
+# Instructions
+Evaluate the solution to the task given below and provide:
+1. A quality score from 0.0 to 1.0
+2. Specific feedback for improvement
+
+{_SCORING_GUIDE}
+
+**Format your response as:**
+Score: <number between 0.0 and 1.0>
+Feedback: <specific feedback for improvement>"""
+
+BATCH_EVALUATION_SYSTEM_PROMPT = f"""You are an expert code reviewer and evaluator.
+
+# Instructions
+Evaluate each of the candidate solutions to the task given below and provide:
+1. A quality score from 0.0 to 1.0
+2. Specific feedback for improvement
+Compare the candidates against each other when scoring.
+
+{_SCORING_GUIDE}
+
+**Respond with only a JSON array, one object per candidate:**
+[{{"id": 1, "score": <number between 0.0 and 1.0>, "feedback": "<specific feedback>"}}, ...]"""
+
+# Characters of each MaTTS candidate solution kept in serialized trajectories
+CANDIDATE_PREVIEW_CHARS = 200
+
 
 # ============================================================================
 # Data Classes
@@ -48,12 +165,92 @@ class IterationResult:
     trajectory_hash: str
 
 
+@dataclass(slots=True)
+class TrajectoryEntry:
+    """
+    Single step of a reasoning trajectory
+    
+    Slotted to keep per-step memory low; converted to the plain dict form
+    (see serialize_trajectory) only when the trajectory leaves the agent.
+    Optional fields that are unset are omitted from the dict. When
+    output_limit is set, output holds the full text (shared with the
+    candidate, not copied) and is only truncated on conversion.
+    """
+    iteration: int
+    action: str
+    output: str
+    output_limit: Optional[int] = None
+    thought: Optional[str] = None
+    output_hash: Optional[int] = None
+    previous_score: Optional[float] = None
+    score: Optional[float] = None
+    candidate_id: Optional[int] = None
+    extra: Optional[Dict[str, Any]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the trajectory step dict stored with reasoning traces"""
+        step: Dict[str, Any] = {"iteration": self.iteration, "action": self.action}
+        if self.thought is not None:
+            step["thought"] = self.thought
+        if self.output_limit is not None and len(self.output) > self.output_limit:
+            step["output"] = self.output[:self.output_limit] + "..."
+        else:
+            step["output"] = self.output
+        if self.output_hash is not None:
+            step["output_hash"] = f"{self.output_hash:016x}"
+        if self.previous_score is not None:
+            step["previous_score"] = self.previous_score
+        if self.score is not None:
+            step["score"] = self.score
+        if self.candidate_id is not None:
+            step["candidate_id"] = self.candidate_id
+        if self.extra:
+            step.update(self.extra)
+        return step
+
+
+def serialize_trajectory(trajectory: List[Any]) -> List[Dict[str, Any]]:
+    """Convert a trajectory to JSON-serializable step dicts"""
+    return [
+        step.to_dict() if isinstance(step, TrajectoryEntry) else step
+        for step in trajectory
+    ]
+
+
+@lru_cache(maxsize=STATIC_PREFIX_CACHE_SIZE)
+def _static_prefix_text(formatted_memories: Tuple[str, ...]) -> str:
+    """
+    Build the think-step system prefix from formatted memories
+    
+    Keyed on the formatted memory text itself, so the cache stays correct
+    if a memory changes; MemoryItem.formatted_prompt returns the same string
+    object each time, which keeps hashing and comparing the key cheap.
+    """
+    prompt_parts = [THINK_SYSTEM_PROMPT]
+    
+    # Add memory context if available
+    if formatted_memories:
+        prompt_parts.extend([
+            "",
+            "# Relevant Past Experiences",
+            "Here are relevant memories from past similar tasks. "
+            "Learn from these patterns and avoid past mistakes:\n"
+        ])
+        
+        for i, formatted in enumerate(formatted_memories, 1):
+            prompt_parts.append(f"## Memory {i}")
+            prompt_parts.append(formatted)
+            prompt_parts.append("")
+    
+    return "\n".join(prompt_parts)
+
+
 @dataclass
 class SolutionResult:
     """Final result from task solving"""
     solution: str
     score: float
-    trajectory: List[Dict[str, Any]]
+    trajectory: List[TrajectoryEntry]
     iterations: int
     total_tokens: int
     early_termination: bool
@@ -105,7 +302,13 @@ class IterativeReasoningAgent:
         evaluation_tokens: int = 3000,
         max_prompt_tokens: int = 12000,
         truncation_threshold: int = 12000,
-        truncation_head_ratio: float = 0.6
+        truncation_head_ratio: float = 0.6,
+        max_concurrency: int = 8,
+        enable_semantic_cache: bool = False,
+        semantic_cache_threshold: float = 0.87,
+        prompt_cache_control: bool = True,
+        tokenizer_model: Optional[str] = None,
+        evaluator_model: Optional[str] = None
     ):
         """
         Initialize the iterative reasoning agent
@@ -122,6 +325,15 @@ class IterativeReasoningAgent:
             max_prompt_tokens: Maximum prompt tokens
             truncation_threshold: Token threshold for truncation
             truncation_head_ratio: Ratio of content to preserve at head
+            max_concurrency: Maximum in-flight LLM calls during MaTTS generation
+            enable_semantic_cache: Reuse results of semantically equivalent tasks
+            semantic_cache_threshold: Cosine similarity needed for a cache hit
+            prompt_cache_control: Mark system messages with cache_control
+                breakpoints for providers with explicit prompt caching
+            tokenizer_model: Model name used to pick the tiktoken encoding
+                (cl100k_base if unknown or not given)
+            evaluator_model: Cheaper/faster model for evaluate steps (the
+                client's default model if not given)
         """
         self.llm_client = llm_client
         self.reasoning_bank = reasoning_bank
@@ -134,24 +346,71 @@ class IterativeReasoningAgent:
         self.max_prompt_tokens = max_prompt_tokens
         self.truncation_threshold = truncation_threshold
         self.truncation_head_ratio = truncation_head_ratio
+        self.max_concurrency = max_concurrency
+        self.prompt_cache_control = prompt_cache_control
+        self.tokenizer_model = tokenizer_model
+        self.evaluator_model = evaluator_model
+        
+        # Extra arguments routing evaluation calls to evaluator_model
+        self._evaluator_kwargs = {"model": evaluator_model} if evaluator_model else {}
         
-        # Track seen trajectory hashes for loop detection
-        self._trajectory_hashes: set = set()
+        # tiktoken encoding, loaded on first use, see _get_encoder
+        self._encoder = None
+        self._truncation_marker_tokens = 0
+        
+        # Track recently seen trajectory hashes for loop detection; the set
+        # gives O(1) membership and the deque bounds it to the newest
+        # MAX_TRAJECTORY_HASHES in insertion order
+        self._trajectory_hashes: set[int] = set()
+        self._trajectory_order: deque = deque(maxlen=MAX_TRAJECTORY_HASHES)
         
         # Token usage tracking
         self._total_tokens_used = 0
         
-        # Initialize prompt compressor for token optimization
-        self.prompt_compressor = PromptCompressor(
-            max_tokens=max_prompt_tokens,
-            compression_ratio=0.7
+        # Prompt compressor for token optimization, created on first use since
+        # most prompts never exceed truncation_threshold
+        self._prompt_compressor = None
+        
+        # Successful results keyed by task embedding, see _semantic_cache_lookup
+        self.semantic_cache = (
+            SemanticCache(threshold=semantic_cache_threshold)
+            if enable_semantic_cache else None
         )
         
+        # Initial generation prompts keyed by task, see _get_initial_prompt
+        self._initial_prompt_cache: OrderedDict = OrderedDict()
+        
+        # Refinement prompts keyed by input hashes, see _get_refinement_prompt
+        self._refinement_prompt_cache: OrderedDict = OrderedDict()
+        
+        # (task hash, solution hash) -> (score, feedback), see _evaluate_step
+        self._eval_cache: OrderedDict = OrderedDict()
+        
+        # System message objects keyed by content and prompt_cache_control,
+        # see _system_message
+        self._system_message_cache: OrderedDict = OrderedDict()
+        
         logger.info(
             f"IterativeReasoningAgent initialized: max_iterations={max_iterations}, "
             f"success_threshold={success_threshold}, prompt_compression=enabled"
         )
     
+    @property
+    def prompt_compressor(self):
+        """
+        Prompt compressor, imported and initialized on first access
+        
+        Returns:
+            PromptCompressor sized to max_prompt_tokens
+        """
+        if self._prompt_compressor is None:
+            from performance_optimizer import PromptCompressor
+            self._prompt_compressor = PromptCompressor(
+                max_tokens=self.max_prompt_tokens,
+                compression_ratio=0.7
+            )
+        return self._prompt_compressor
+    
     def solve_task(
         self,
         task: str,
@@ -162,7 +421,8 @@ class IterativeReasoningAgent:
         Main entry point for task solving with iterative refinement
         
         Implements the Think → Evaluate → Refine loop:
-        1. Retrieve relevant memories (if use_memory=True)
+        1. Retrieve relevant memories once (if use_memory=True); they stay
+           fixed across iterations as the cacheable system prefix
         2. Generate initial solution with memory context
         3. Evaluate solution quality
         4. If score < threshold and iterations remain, refine and repeat
@@ -189,8 +449,7 @@ class IterativeReasoningAgent:
             )
         
         # Reset state
-        self._trajectory_hashes.clear()
-        self._total_tokens_used = 0
+        self.reset_state()
         
         # Retrieve memories if needed
         if use_memory and memories is None:
@@ -206,8 +465,14 @@ class IterativeReasoningAgent:
         elif memories is None:
             memories = []
         
+        # Reuse the result of a semantically equivalent task solved with the same memories
+        cached, task_embedding, cache_scope = self._semantic_cache_lookup(task, memories)
+        if cached is not None:
+            return cached
+        
         # Initialize tracking
-        trajectory = []
+        trajectory: List[TrajectoryEntry] = []
+        think_count = 0
         best_solution = None
         best_score = 0.0
         current_solution = None
@@ -221,13 +486,16 @@ class IterativeReasoningAgent:
             
             try:
                 # Think: Generate or refine solution
-                solution, tokens_think = self._think_step(
-                    task=task,
-                    memories=memories,
-                    iteration=iteration,
-                    previous_solution=current_solution,
-                    feedback=current_feedback
-                )
+                if iteration == 1:
+                    solution, tokens_think = self._think_step_initial(task, memories)
+                else:
+                    solution, tokens_think = self._think_step_refine(
+                        task=task,
+                        memories=memories,
+                        iteration=iteration,
+                        previous_solution=current_solution,
+                        feedback=current_feedback
+                    )
                 
                 # Track tokens
                 self._total_tokens_used += tokens_think
@@ -237,24 +505,25 @@ class IterativeReasoningAgent:
                 if trajectory_hash in self._trajectory_hashes:
                     logger.warning(f"Loop detected at iteration {iteration}")
                     loop_detected = True
-                    trajectory.append({
-                        "iteration": iteration,
-                        "action": "loop_detected",
-                        "output": "Reasoning loop detected, terminating",
-                        "output_hash": trajectory_hash
-                    })
+                    trajectory.append(TrajectoryEntry(
+                        iteration=iteration,
+                        action="loop_detected",
+                        output="Reasoning loop detected, terminating",
+                        output_hash=trajectory_hash
+                    ))
                     break
                 
-                self._trajectory_hashes.add(trajectory_hash)
+                self._remember_trajectory_hash(trajectory_hash)
                 
                 # Add to trajectory
-                trajectory.append({
-                    "iteration": iteration,
-                    "action": "think",
-                    "thought": f"Generated solution attempt {iteration}",
-                    "output": solution,
-                    "output_hash": trajectory_hash
-                })
+                trajectory.append(TrajectoryEntry(
+                    iteration=iteration,
+                    action="think",
+                    thought=f"Generated solution attempt {iteration}",
+                    output=solution,
+                    output_hash=trajectory_hash
+                ))
+                think_count += 1
                 
                 # Evaluate: Score the solution
                 score, feedback, tokens_eval = self._evaluate_step(
@@ -267,13 +536,13 @@ class IterativeReasoningAgent:
                 self._total_tokens_used += tokens_eval
                 
                 # Add to trajectory
-                trajectory.append({
-                    "iteration": iteration,
-                    "action": "evaluate",
-                    "thought": f"Evaluated solution quality",
-                    "output": f"Score: {score:.2f}\nFeedback: {feedback}",
-                    "previous_score": score
-                })
+                trajectory.append(TrajectoryEntry(
+                    iteration=iteration,
+                    action="evaluate",
+                    thought="Evaluated solution quality",
+                    output=f"Score: {score:.2f}\nFeedback: {feedback}",
+                    previous_score=score
+                ))
                 
                 logger.info(f"Iteration {iteration}: score={score:.2f}")
                 
@@ -288,11 +557,11 @@ class IterativeReasoningAgent:
                         f"Success threshold reached: {score:.2f} >= {self.success_threshold}"
                     )
                     early_termination = True
-                    trajectory.append({
-                        "iteration": iteration,
-                        "action": "success",
-                        "output": f"Success threshold reached: {score:.2f}"
-                    })
+                    trajectory.append(TrajectoryEntry(
+                        iteration=iteration,
+                        action="success",
+                        output=f"Success threshold reached: {score:.2f}"
+                    ))
                     break
                 
                 # Prepare for next iteration
@@ -305,19 +574,19 @@ class IterativeReasoningAgent:
                 
             except TokenBudgetExceededError as e:
                 logger.error(f"Token budget exceeded at iteration {iteration}: {e}")
-                trajectory.append({
-                    "iteration": iteration,
-                    "action": "error",
-                    "output": f"Token budget exceeded: {e}"
-                })
+                trajectory.append(TrajectoryEntry(
+                    iteration=iteration,
+                    action="error",
+                    output=f"Token budget exceeded: {e}"
+                ))
                 break
             except Exception as e:
                 logger.error(f"Error at iteration {iteration}: {e}")
-                trajectory.append({
-                    "iteration": iteration,
-                    "action": "error",
-                    "output": f"Error: {str(e)}"
-                })
+                trajectory.append(TrajectoryEntry(
+                    iteration=iteration,
+                    action="error",
+                    output=f"Error: {str(e)}"
+                ))
                 # Continue with best solution so far
                 break
         
@@ -331,7 +600,7 @@ class IterativeReasoningAgent:
             solution=best_solution,
             score=best_score,
             trajectory=trajectory,
-            iterations=len([t for t in trajectory if t.get("action") == "think"]),
+            iterations=think_count,
             total_tokens=self._total_tokens_used,
             early_termination=early_termination,
             loop_detected=loop_detected
@@ -342,6 +611,8 @@ class IterativeReasoningAgent:
             f"tokens={self._total_tokens_used}, early_termination={early_termination}"
         )
         
+        self._semantic_cache_store(task_embedding, cache_scope, result)
+        
         return result
     
     def solve_with_matts(
@@ -403,8 +674,7 @@ class IterativeReasoningAgent:
             mode = "parallel"
         
         # Reset state
-        self._trajectory_hashes.clear()
-        self._total_tokens_used = 0
+        self.reset_state()
         
         # Retrieve memories if needed
         if use_memory and memories is None:
@@ -420,23 +690,34 @@ class IterativeReasoningAgent:
         elif memories is None:
             memories = []
         
+        # Reuse the result of a semantically equivalent task solved with the same memories
+        cached, task_embedding, cache_scope = self._semantic_cache_lookup(task, memories)
+        if cached is not None:
+            return cached
+        
         # Initialize trajectory
-        trajectory = []
-        trajectory.append({
-            "iteration": 0,
-            "action": "matts_start",
-            "output": f"Starting MaTTS with k={k}, mode={mode}",
-            "k": k,
-            "mode": mode
-        })
+        trajectory: List[TrajectoryEntry] = []
+        trajectory.append(TrajectoryEntry(
+            iteration=0,
+            action="matts_start",
+            output=f"Starting MaTTS with k={k}, mode={mode}",
+            extra={"k": k, "mode": mode}
+        ))
         
         logger.info(f"Starting MaTTS: k={k}, mode={mode}, refine_best={refine_best}")
         
+        # Every candidate starts from the same prompt, so build it once
+        initial_prompt = self._get_initial_prompt(task)
+        
         # Generate k solution candidates
         if mode == "parallel":
-            candidates = self._generate_parallel_solutions(task, memories, k, trajectory)
+            candidates = self._generate_parallel_solutions(
+                task, memories, k, trajectory, initial_prompt
+            )
         else:
-            candidates = self._generate_sequential_solutions(task, memories, k, trajectory)
+            candidates = self._generate_sequential_solutions(
+                task, memories, k, trajectory, initial_prompt
+            )
         
         # Check if we got any candidates
         if not candidates:
@@ -451,22 +732,25 @@ class IterativeReasoningAgent:
                 loop_detected=False
             )
         
-        # Select best candidate
-        best_candidate = max(candidates, key=lambda c: c.score)
+        # Select best candidate (argmax keeps the first candidate on ties)
+        scores = np.fromiter(
+            (c.score for c in candidates), dtype=np.float64, count=len(candidates)
+        )
+        best_candidate = candidates[int(scores.argmax())]
         
         logger.info(
             f"Best candidate: id={best_candidate.candidate_id}, "
             f"score={best_candidate.score:.2f}"
         )
         
-        trajectory.append({
-            "iteration": 0,
-            "action": "matts_select_best",
-            "output": f"Selected candidate {best_candidate.candidate_id} with score {best_candidate.score:.2f}",
-            "candidate_id": best_candidate.candidate_id,
-            "score": best_candidate.score,
-            "all_scores": [c.score for c in candidates]
-        })
+        trajectory.append(TrajectoryEntry(
+            iteration=0,
+            action="matts_select_best",
+            output=f"Selected candidate {best_candidate.candidate_id} with score {best_candidate.score:.2f}",
+            candidate_id=best_candidate.candidate_id,
+            score=best_candidate.score,
+            extra={"all_scores": scores.tolist()}
+        ))
         
         # Optionally refine the best solution
         final_solution = best_candidate.solution
@@ -475,7 +759,7 @@ class IterativeReasoningAgent:
         if refine_best and best_candidate.score < self.success_threshold:
             logger.info("Refining best solution")
             try:
-                refined_solution, tokens_refine = self._think_step(
+                refined_solution, tokens_refine = self._think_step_refine(
                     task=task,
                     memories=memories,
                     iteration=1,
@@ -494,13 +778,13 @@ class IterativeReasoningAgent:
                 
                 self._total_tokens_used += tokens_eval
                 
-                trajectory.append({
-                    "iteration": 1,
-                    "action": "matts_refine",
-                    "output": refined_solution,
-                    "score": refined_score,
-                    "previous_score": best_candidate.score
-                })
+                trajectory.append(TrajectoryEntry(
+                    iteration=1,
+                    action="matts_refine",
+                    output=refined_solution,
+                    score=refined_score,
+                    previous_score=best_candidate.score
+                ))
                 
                 # Use refined solution if better
                 if refined_score > best_candidate.score:
@@ -517,11 +801,11 @@ class IterativeReasoningAgent:
                 
             except Exception as e:
                 logger.warning(f"Failed to refine best solution: {e}")
-                trajectory.append({
-                    "iteration": 1,
-                    "action": "matts_refine_error",
-                    "output": f"Refinement failed: {str(e)}"
-                })
+                trajectory.append(TrajectoryEntry(
+                    iteration=1,
+                    action="matts_refine_error",
+                    output=f"Refinement failed: {str(e)}"
+                ))
         
         # Build final result
         result = SolutionResult(
@@ -539,106 +823,156 @@ class IterativeReasoningAgent:
             f"candidates={len(candidates)}, tokens={self._total_tokens_used}"
         )
         
+        self._semantic_cache_store(task_embedding, cache_scope, result)
+        
         return result
     
+    def _semantic_cache_lookup(
+        self,
+        task: str,
+        memories: List[MemoryItem]
+    ) -> Tuple[Optional[SolutionResult], Optional[List[float]], Any]:
+        """
+        Look up a previously solved, semantically equivalent task
+        
+        Runs after memory retrieval, so the storage backend's encoder hands
+        back the embedding it just computed for the retrieval query. Entries
+        are scoped to the workspace and the ids of the memories the task is
+        solved with: a result is only reused when the same guidance applies.
+        
+        Args:
+            task: Task description
+            memories: Memories the task would be solved with
+        
+        Returns:
+            Tuple of (cached result or None, task embedding, cache scope);
+            the embedding is None when the cache is disabled or unavailable
+        """
+        if self.semantic_cache is None:
+            return None, None, None
+        
+        workspace_id = None
+        workspace_manager = getattr(self.reasoning_bank, "workspace_manager", None)
+        if workspace_manager is not None:
+            workspace_id = workspace_manager.get_workspace_id()
+        scope = (workspace_id, tuple(m.id for m in memories))
+        
+        try:
+            task_embedding = self.reasoning_bank.storage.generate_embedding(task)
+            hit = self.semantic_cache.search(task_embedding, scope)
+        except Exception as e:
+            logger.debug(f"Semantic cache unavailable: {e}")
+            return None, None, scope
+        
+        if hit is None:
+            return None, task_embedding, scope
+        
+        cached, similarity = hit
+        logger.info(f"Semantic cache hit: similarity={similarity:.3f}, score={cached.score:.2f}")
+        result = replace(
+            cached,
+            trajectory=[TrajectoryEntry(
+                iteration=0,
+                action="semantic_cache_hit",
+                output=f"Reused solution of a similar task (similarity {similarity:.3f})",
+                extra={"similarity": similarity}
+            )] + cached.trajectory,
+            total_tokens=0,
+            early_termination=True
+        )
+        return result, task_embedding, scope
+    
+    def _semantic_cache_store(
+        self,
+        task_embedding: Optional[List[float]],
+        scope: Any,
+        result: SolutionResult
+    ):
+        """Cache a result that met the success threshold"""
+        if task_embedding is None or result.score < self.success_threshold:
+            return
+        self.semantic_cache.put(task_embedding, result, scope)
+    
     def _generate_parallel_solutions(
         self,
         task: str,
         memories: List[MemoryItem],
         k: int,
-        trajectory: List[Dict[str, Any]]
+        trajectory: List[TrajectoryEntry],
+        initial_prompt: Optional[str] = None
     ) -> List[MaTTSSolutionCandidate]:
         """
         Generate k solution attempts in parallel using asyncio
         
-        This method creates k concurrent solution generation tasks and
-        evaluates them all. The parallel approach completes in approximately
-        1x the time of a single attempt (not k×).
+        The k solutions are sampled from a single n=k request when the LLM
+        client supports it, then scored together in a single evaluation
+        request (see _evaluate_batch_async), so the run completes in
+        approximately 1x the time of a single attempt (not k×). In-flight
+        calls are bounded by max_concurrency to respect provider rate limits.
+        
+        Duplicate solutions are evaluated once and share the score. When
+        solutions are generated individually (or the batch evaluation
+        fails), candidates flow through a queue: each is evaluated as soon
+        as it is generated, overlapping with the ones still generating, and
+        everything still in flight is cancelled once a candidate meets
+        success_threshold, so fewer than k candidates may be returned.
         
         Args:
             task: Task description
             memories: Retrieved memories
             k: Number of parallel attempts
             trajectory: Trajectory list to append to
+            initial_prompt: Prebuilt generation prompt shared by all candidates
         
         Returns:
             List of MaTTSSolutionCandidate objects
         """
         logger.info(f"Generating {k} parallel solution attempts")
         
-        # Create async wrapper for solution generation
-        async def generate_and_evaluate_async(candidate_id: int) -> Optional[MaTTSSolutionCandidate]:
-            """Generate and evaluate a single solution candidate"""
-            try:
-                # Generate solution
-                solution, tokens_think = self._think_step(
-                    task=task,
-                    memories=memories,
-                    iteration=candidate_id,
-                    previous_solution=None,
-                    feedback=None
-                )
-                
-                # Evaluate solution
-                score, feedback, tokens_eval = self._evaluate_step(
-                    task=task,
-                    solution=solution,
-                    iteration=candidate_id
-                )
-                
-                total_tokens = tokens_think + tokens_eval
-                
-                logger.info(
-                    f"Candidate {candidate_id}: score={score:.2f}, tokens={total_tokens}"
-                )
-                
-                return MaTTSSolutionCandidate(
-                    solution=solution,
-                    score=score,
-                    feedback=feedback,
-                    tokens_used=total_tokens,
-                    candidate_id=candidate_id
-                )
-                
-            except Exception as e:
-                logger.error(f"Failed to generate candidate {candidate_id}: {e}")
-                return None
-        
-        # Run all generations in parallel
+        # Sample all k solutions in one request and score them in one batch
+        # evaluation when possible, otherwise pipeline generation and
+        # evaluation per candidate
         async def run_parallel():
-            tasks = [generate_and_evaluate_async(i) for i in range(1, k + 1)]
-            return await asyncio.gather(*tasks, return_exceptions=True)
+            semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+            solutions = await self._think_candidates_batched_async(
+                task, memories, k, semaphore, initial_prompt
+            )
+            
+            if len(solutions) == k and k > 1:
+                results = await self._evaluate_candidates_batched_async(
+                    task, solutions, semaphore
+                )
+                if results is not None:
+                    return results, 0
+                logger.warning("Batch evaluation unusable, evaluating candidates individually")
+            
+            return await self._pipeline_candidates_async(
+                task, memories, k, semaphore, initial_prompt, solutions
+            )
         
         # Execute parallel generation
         try:
-            # Check if we're already in an event loop
             try:
-                loop = asyncio.get_running_loop()
-                # We're in an async context - run tasks directly in current loop
-                logger.info("Running parallel generation in existing event loop")
-                # Create a new task for parallel execution
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor(max_workers=k) as executor:
-                    # Run synchronous generation in thread pool
-                    futures = []
-                    for i in range(1, k + 1):
-                        future = executor.submit(self._generate_single_candidate, task, memories, i)
-                        futures.append(future)
-                    
-                    results = []
-                    for future in concurrent.futures.as_completed(futures):
-                        try:
-                            result = future.result()
-                            results.append(result)
-                        except Exception as e:
-                            results.append(e)
-                
+                asyncio.get_running_loop()
             except RuntimeError:
                 # No event loop, create one
-                results = asyncio.run(run_parallel())
+                results, unevaluated_tokens = asyncio.run(run_parallel())
+            else:
+                # Called synchronously from inside a running loop (e.g. an MCP
+                # tool handler), which cannot be re-entered; drive our own loop
+                # on a single helper thread instead of one thread per candidate
+                logger.info("Running parallel generation on a helper event loop")
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    results, unevaluated_tokens = executor.submit(
+                        asyncio.run, run_parallel()
+                    ).result()
         except Exception as e:
             logger.error(f"Parallel generation failed: {e}, falling back to sequential")
-            return self._generate_sequential_solutions(task, memories, k, trajectory)
+            return self._generate_sequential_solutions(
+                task, memories, k, trajectory, initial_prompt
+            )
+        
+        self._total_tokens_used += unevaluated_tokens
         
         # Filter out None results and exceptions
         candidates = []
@@ -647,13 +981,14 @@ class IterativeReasoningAgent:
                 candidates.append(result)
                 self._total_tokens_used += result.tokens_used
                 
-                trajectory.append({
-                    "iteration": 0,
-                    "action": "matts_candidate",
-                    "candidate_id": result.candidate_id,
-                    "score": result.score,
-                    "output": result.solution[:200] + "..." if len(result.solution) > 200 else result.solution
-                })
+                trajectory.append(TrajectoryEntry(
+                    iteration=0,
+                    action="matts_candidate",
+                    candidate_id=result.candidate_id,
+                    score=result.score,
+                    output=result.solution,
+                    output_limit=CANDIDATE_PREVIEW_CHARS
+                ))
             elif isinstance(result, Exception):
                 logger.error(f"Candidate generation raised exception: {result}")
         
@@ -661,99 +996,274 @@ class IterativeReasoningAgent:
         
         return candidates
     
-    def _generate_single_candidate(
+    async def _think_candidates_batched_async(
         self,
         task: str,
         memories: List[MemoryItem],
-        candidate_id: int
-    ) -> Optional[MaTTSSolutionCandidate]:
+        k: int,
+        semaphore: asyncio.Semaphore,
+        initial_prompt: Optional[str] = None
+    ) -> List[Tuple[int, str, int]]:
         """
-        Generate and evaluate a single solution candidate (thread-safe)
+        Sample initial MaTTS solutions from a single n=k request
         
-        This is called from ThreadPoolExecutor for true parallel execution
-        when running in an async context.
+        Only used when the LLM client supports it (acreate_n). Providers
+        that ignore n return fewer choices; the caller generates the rest.
         
         Args:
             task: Task description
             memories: Retrieved memories
-            candidate_id: Candidate identifier
+            k: Number of solutions
+            semaphore: Bounds in-flight LLM calls
+            initial_prompt: Prebuilt generation prompt shared by all candidates
         
         Returns:
-            MaTTSSolutionCandidate or None if failed
+            List of (candidate_id, solution, tokens_used), possibly empty
         """
+        generated: List[Tuple[int, str, int]] = []
+        acreate_n = getattr(self.llm_client, "acreate_n", None)
+        if k < 2 or not inspect.iscoroutinefunction(acreate_n):
+            return generated
+        
+        messages = self._build_initial_messages(task, memories, initial_prompt)
         try:
-            # Generate solution
-            solution, tokens_think = self._think_step(
-                task=task,
-                memories=memories,
-                iteration=candidate_id,
-                previous_solution=None,
-                feedback=None
-            )
-            
-            # Evaluate solution
-            score, feedback, tokens_eval = self._evaluate_step(
-                task=task,
-                solution=solution,
-                iteration=candidate_id
-            )
-            
-            total_tokens = tokens_think + tokens_eval
-            
+            async with semaphore:
+                results = await acreate_n(
+                    k,
+                    messages=messages,
+                    temperature=self.temperature_generate,
+                    max_output_tokens=self.max_output_tokens
+                )
+            for candidate_id, result in enumerate(results[:k], 1):
+                generated.append((candidate_id, result.content, result.total_tokens))
+            logger.info(f"Batched generation returned {len(generated)}/{k} solutions")
+        except Exception as e:
+            logger.warning(f"Batched generation failed: {e}, generating individually")
+        
+        return generated
+    
+    async def _evaluate_candidates_batched_async(
+        self,
+        task: str,
+        solutions: List[Tuple[int, str, int]],
+        semaphore: asyncio.Semaphore
+    ) -> Optional[List[MaTTSSolutionCandidate]]:
+        """
+        Score generated solutions with one batch evaluation request
+        
+        Identical solutions (common at low temperature) are listed once and
+        share the score; evaluation tokens are split across the distinct
+        solutions and charged to the first candidate with each.
+        
+        Args:
+            task: Task description
+            solutions: (candidate_id, solution, tokens_used) tuples
+            semaphore: Bounds in-flight LLM calls
+        
+        Returns:
+            Candidates ordered by candidate_id, or None if the batch
+            evaluation failed
+        """
+        groups: Dict[int, List[Tuple[int, str, int]]] = {}
+        for entry in solutions:
+            groups.setdefault(self._compute_trajectory_hash(entry[1]), []).append(entry)
+        unique = list(groups.values())
+        if len(unique) < len(solutions):
             logger.info(
-                f"Candidate {candidate_id}: score={score:.2f}, tokens={total_tokens}"
+                f"Skipping evaluation of {len(solutions) - len(unique)} "
+                f"duplicate candidates"
             )
-            
-            return MaTTSSolutionCandidate(
-                solution=solution,
-                score=score,
-                feedback=feedback,
-                tokens_used=total_tokens,
-                candidate_id=candidate_id
+        
+        async with semaphore:
+            batch = await self._evaluate_batch_async(
+                task, [group[0][1] for group in unique]
             )
-            
-        except Exception as e:
-            logger.error(f"Failed to generate candidate {candidate_id}: {e}")
+        if batch is None:
             return None
+        
+        evaluations, tokens_eval = batch
+        tokens_eval_each = tokens_eval // len(unique)
+        results = []
+        for group, (score, feedback) in zip(unique, evaluations):
+            for position, (candidate_id, solution, tokens_think) in enumerate(group):
+                total_tokens = tokens_think + (tokens_eval_each if position == 0 else 0)
+                logger.info(
+                    f"Candidate {candidate_id}: score={score:.2f}, tokens={total_tokens}"
+                )
+                results.append(MaTTSSolutionCandidate(
+                    solution=solution,
+                    score=score,
+                    feedback=feedback,
+                    tokens_used=total_tokens,
+                    candidate_id=candidate_id
+                ))
+        results.sort(key=lambda c: c.candidate_id)
+        return results
+    
+    async def _pipeline_candidates_async(
+        self,
+        task: str,
+        memories: List[MemoryItem],
+        k: int,
+        semaphore: asyncio.Semaphore,
+        initial_prompt: Optional[str] = None,
+        pregenerated: Optional[List[Tuple[int, str, int]]] = None
+    ) -> Tuple[List[MaTTSSolutionCandidate], int]:
+        """
+        Generate and evaluate candidates as a producer/consumer pipeline
+        
+        One producer per candidate generates a solution (unless it is in
+        pregenerated), evaluates it and puts the result on a queue, so early
+        finishers are evaluated while others are still generating. Identical
+        solutions share a single evaluation. The consumer stops at the first
+        candidate meeting success_threshold and cancels the remaining work.
+        
+        Args:
+            task: Task description
+            memories: Retrieved memories
+            k: Number of candidates
+            semaphore: Bounds in-flight LLM calls
+            initial_prompt: Prebuilt generation prompt shared by all candidates
+            pregenerated: Already generated (candidate_id, solution, tokens_used)
+        
+        Returns:
+            Tuple of (candidates in completion order, generation tokens of
+            candidates that were generated but never evaluated)
+        """
+        known = {entry[0]: entry for entry in pregenerated or []}
+        queue: asyncio.Queue = asyncio.Queue(maxsize=k)
+        evaluations: Dict[int, asyncio.Task] = {}
+        generated_tokens: Dict[int, int] = {}
+        
+        async def produce(candidate_id: int) -> None:
+            candidate = None
+            try:
+                if candidate_id in known:
+                    _, solution, tokens_think = known[candidate_id]
+                else:
+                    async with semaphore:
+                        solution, tokens_think = await self._think_step_initial_async(
+                            task=task,
+                            memories=memories,
+                            iteration=candidate_id,
+                            prebuilt_prompt=initial_prompt
+                        )
+                generated_tokens[candidate_id] = tokens_think
+                
+                # Identical solutions await the first one's evaluation
+                solution_hash = self._compute_trajectory_hash(solution)
+                evaluation = evaluations.get(solution_hash)
+                first = evaluation is None
+                if first:
+                    evaluation = asyncio.create_task(
+                        evaluate(solution, candidate_id)
+                    )
+                    evaluations[solution_hash] = evaluation
+                score, feedback, tokens_eval = await asyncio.shield(evaluation)
+                
+                total_tokens = tokens_think + (tokens_eval if first else 0)
+                logger.info(
+                    f"Candidate {candidate_id}: score={score:.2f}, tokens={total_tokens}"
+                )
+                candidate = MaTTSSolutionCandidate(
+                    solution=solution,
+                    score=score,
+                    feedback=feedback,
+                    tokens_used=total_tokens,
+                    candidate_id=candidate_id
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to generate or evaluate candidate {candidate_id}: {e}")
+            await queue.put(candidate)
+        
+        async def evaluate(solution: str, candidate_id: int) -> Tuple[float, str, int]:
+            async with semaphore:
+                return await self._evaluate_step_async(
+                    task=task,
+                    solution=solution,
+                    iteration=candidate_id
+                )
+        
+        producers = [
+            asyncio.create_task(produce(candidate_id))
+            for candidate_id in range(1, k + 1)
+        ]
+        
+        results: List[MaTTSSolutionCandidate] = []
+        try:
+            for _ in producers:
+                candidate = await queue.get()
+                if candidate is None:
+                    continue
+                results.append(candidate)
+                if candidate.score >= self.success_threshold:
+                    remaining = sum(1 for producer in producers if not producer.done())
+                    if remaining:
+                        logger.info(
+                            f"Candidate met success threshold, cancelled "
+                            f"{remaining} remaining candidates"
+                        )
+                    break
+        finally:
+            for pending in producers + list(evaluations.values()):
+                pending.cancel()
+        
+        # Generation tokens of candidates whose evaluation never completed
+        evaluated = {candidate.candidate_id for candidate in results}
+        unevaluated_tokens = sum(
+            tokens for candidate_id, tokens in generated_tokens.items()
+            if candidate_id not in evaluated
+        )
+        return results, unevaluated_tokens
     
     def _generate_sequential_solutions(
         self,
         task: str,
         memories: List[MemoryItem],
         k: int,
-        trajectory: List[Dict[str, Any]]
+        trajectory: List[TrajectoryEntry],
+        initial_prompt: Optional[str] = None
     ) -> List[MaTTSSolutionCandidate]:
         """
         Generate k solution attempts sequentially
         
+        Candidates are evaluated one by one so generation can stop early;
+        batch evaluation is only used in parallel mode.
+        
         This is a fallback mode when parallel generation is not available
-        or fails. It generates solutions one at a time.
+        or fails. It generates solutions one at a time, stopping early once
+        a candidate meets success_threshold.
         
         Args:
             task: Task description
             memories: Retrieved memories
             k: Number of sequential attempts
             trajectory: Trajectory list to append to
+            initial_prompt: Prebuilt generation prompt shared by all candidates
         
         Returns:
             List of MaTTSSolutionCandidate objects
         """
         logger.info(f"Generating {k} sequential solution attempts")
         
+        if initial_prompt is None:
+            initial_prompt = self._get_initial_prompt(task)
+        
         candidates = []
         
         for candidate_id in range(1, k + 1):
             try:
                 # Generate solution
-                solution, tokens_think = self._think_step(
+                solution, tokens_think = self._think_step_initial(
                     task=task,
                     memories=memories,
                     iteration=candidate_id,
-                    previous_solution=None,
-                    feedback=None
+                    prebuilt_prompt=initial_prompt
                 )
                 
-                # Evaluate solution
+                # Evaluate solution (an identical earlier one is not re-evaluated)
                 score, feedback, tokens_eval = self._evaluate_step(
                     task=task,
                     solution=solution,
@@ -777,102 +1287,269 @@ class IterativeReasoningAgent:
                 
                 candidates.append(candidate)
                 
-                trajectory.append({
-                    "iteration": 0,
-                    "action": "matts_candidate",
-                    "candidate_id": candidate_id,
-                    "score": score,
-                    "output": solution[:200] + "..." if len(solution) > 200 else solution
-                })
+                trajectory.append(TrajectoryEntry(
+                    iteration=0,
+                    action="matts_candidate",
+                    candidate_id=candidate_id,
+                    score=score,
+                    output=solution,
+                    output_limit=CANDIDATE_PREVIEW_CHARS
+                ))
+                
+                # Good enough: skip the remaining attempts
+                if score >= self.success_threshold:
+                    logger.info(
+                        f"Candidate {candidate_id} met success threshold, "
+                        f"skipping {k - candidate_id} remaining attempts"
+                    )
+                    break
                 
             except Exception as e:
                 logger.error(f"Failed to generate candidate {candidate_id}: {e}")
-                trajectory.append({
-                    "iteration": 0,
-                    "action": "matts_candidate_error",
-                    "candidate_id": candidate_id,
-                    "output": f"Error: {str(e)}"
-                })
+                trajectory.append(TrajectoryEntry(
+                    iteration=0,
+                    action="matts_candidate_error",
+                    candidate_id=candidate_id,
+                    output=f"Error: {str(e)}"
+                ))
         
         logger.info(f"Generated {len(candidates)}/{k} sequential candidates successfully")
         
         return candidates
     
-    def _think_step(
+    def _think_step_initial(
         self,
         task: str,
         memories: List[MemoryItem],
-        iteration: int,
-        previous_solution: Optional[str] = None,
-        feedback: Optional[str] = None
+        iteration: int = 1,
+        prebuilt_prompt: Optional[str] = None
     ) -> Tuple[str, int]:
         """
-        Generate or refine solution with memory context
+        Generate an initial solution with memory guidance
         
-        On first iteration: Generate initial solution with memory guidance
-        On subsequent iterations: Refine previous solution based on feedback
+        Used for the first iteration of solve_task and for every MaTTS
+        candidate, which all share the same memoized prompt.
         
         Args:
             task: Task description
             memories: Retrieved relevant memories
-            iteration: Current iteration number
-            previous_solution: Previous solution attempt (if refining)
-            feedback: Evaluation feedback (if refining)
+            iteration: Iteration or candidate number (for logging)
+            prebuilt_prompt: Prompt from _get_initial_prompt, if already known
         
         Returns:
             Tuple of (solution, tokens_used)
         
         Raises:
             LLMGenerationError: If generation fails
-            TokenBudgetExceededError: If token budget exceeded
         """
-        # Build prompt
-        if iteration == 1:
-            # Initial generation
-            prompt = self._build_generation_prompt(task, memories)
-        else:
-            # Refinement
-            prompt = self._build_refinement_prompt(
-                task, previous_solution, feedback, memories
-            )
+        messages = self._build_initial_messages(task, memories, prebuilt_prompt)
+        return self._generate(messages, iteration)
+    
+    def _think_step_refine(
+        self,
+        task: str,
+        memories: List[MemoryItem],
+        iteration: int,
+        previous_solution: str,
+        feedback: str
+    ) -> Tuple[str, int]:
+        """
+        Refine a previous solution based on evaluation feedback
         
-        # Use prompt compressor for token optimization
-        estimated_tokens = self._estimate_tokens(prompt)
-        if estimated_tokens > self.truncation_threshold:
-            logger.warning(
-                f"Prompt exceeds threshold ({estimated_tokens} > {self.truncation_threshold}), "
-                f"compressing"
-            )
-            prompt = self.prompt_compressor.compress(prompt)
+        Args:
+            task: Task description
+            memories: Retrieved relevant memories
+            iteration: Current iteration number
+            previous_solution: Previous solution attempt
+            feedback: Evaluation feedback on that attempt
+        
+        Returns:
+            Tuple of (solution, tokens_used)
         
-        # Generate solution
+        Raises:
+            LLMGenerationError: If generation fails
+        """
+        prompt = self._get_refinement_prompt(task, previous_solution, feedback)
         messages = [
-            {"role": "system", "content": "You are an expert problem solver and programmer."},
+            self._system_message(self._build_static_prefix(memories)),
             {"role": "user", "content": prompt}
         ]
+        return self._generate(messages, iteration)
+    
+    async def _think_step_initial_async(
+        self,
+        task: str,
+        memories: List[MemoryItem],
+        iteration: int = 1,
+        prebuilt_prompt: Optional[str] = None
+    ) -> Tuple[str, int]:
+        """
+        Async variant of _think_step_initial used for parallel MaTTS generation
+        
+        Returns:
+            Tuple of (solution, tokens_used)
+        
+        Raises:
+            LLMGenerationError: If generation fails
+        """
+        messages = self._build_initial_messages(task, memories, prebuilt_prompt)
         
         try:
-            result = self.llm_client.create(
+            result = await self._llm_acreate(
                 messages=messages,
                 temperature=self.temperature_generate,
                 max_output_tokens=self.max_output_tokens
             )
-            
-            solution = result.content
-            tokens_used = result.total_tokens
-            
-            logger.info(
-                f"Think step {iteration}: generated {len(solution)} chars, "
-                f"{tokens_used} tokens"
+        except Exception as e:
+            raise LLMGenerationError(
+                f"Failed to generate solution at iteration {iteration}",
+                context={"iteration": iteration, "error": str(e)}
+            )
+        
+        return self._log_generation(result, iteration)
+    
+    def _generate(self, messages: List[Dict[str, str]], iteration: int) -> Tuple[str, int]:
+        """Run a think-step LLM call, wrapping failures in LLMGenerationError"""
+        try:
+            result = self.llm_client.create(
+                messages=messages,
+                temperature=self.temperature_generate,
+                max_output_tokens=self.max_output_tokens
             )
-            
-            return solution, tokens_used
-            
         except Exception as e:
             raise LLMGenerationError(
                 f"Failed to generate solution at iteration {iteration}",
                 context={"iteration": iteration, "error": str(e)}
             )
+        
+        return self._log_generation(result, iteration)
+    
+    def _log_generation(self, result: Any, iteration: int) -> Tuple[str, int]:
+        """Log a think-step result and unpack it to (solution, tokens_used)"""
+        solution = result.content
+        tokens_used = result.total_tokens
+        
+        logger.info(
+            f"Think step {iteration}: generated {len(solution)} chars, "
+            f"{tokens_used} tokens"
+        )
+        
+        return solution, tokens_used
+    
+    def _build_initial_messages(
+        self,
+        task: str,
+        memories: List[MemoryItem],
+        prebuilt_prompt: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for an initial generation
+        
+        Memories go in the static system prefix and only the task in the
+        user message (see _build_static_prefix).
+        """
+        if prebuilt_prompt is None:
+            prebuilt_prompt = self._get_initial_prompt(task)
+        
+        return [
+            self._system_message(self._build_static_prefix(memories)),
+            {"role": "user", "content": prebuilt_prompt}
+        ]
+    
+    def _compress_if_needed(self, prompt: str) -> str:
+        """Compress a prompt that exceeds truncation_threshold"""
+        # Length pre-check so the common short prompt is never tokenized. With
+        # the heuristic it is exact (len // 4 > t  <=>  len >= 4 * (t + 1));
+        # with a tokenizer it only relies on a token covering >= 1 char
+        if TIKTOKEN_AVAILABLE:
+            if len(prompt) <= self.truncation_threshold:
+                return prompt
+        elif len(prompt) < (self.truncation_threshold + 1) * 4:
+            return prompt
+        
+        # Use prompt compressor for token optimization
+        estimated_tokens = self._estimate_tokens(prompt)
+        if estimated_tokens <= self.truncation_threshold:
+            return prompt
+        logger.warning(
+            f"Prompt exceeds threshold ({estimated_tokens} > {self.truncation_threshold}), "
+            f"compressing"
+        )
+        return self.prompt_compressor.compress(prompt)
+    
+    def _get_initial_prompt(self, task: str) -> str:
+        """
+        Get the (compressed) initial generation prompt, memoized per task
+        
+        Every MaTTS candidate starts from the same prompt, so it is built
+        and compressed once and reused across candidates and repeat runs.
+        Memories live in the system prefix and do not affect it.
+        
+        Args:
+            task: Task description
+        
+        Returns:
+            Prompt ready to pass as prebuilt_prompt
+        """
+        prompt = self._initial_prompt_cache.get(task)
+        if prompt is None:
+            prompt = self._compress_if_needed(self._build_generation_prompt(task))
+            self._initial_prompt_cache[task] = prompt
+            if len(self._initial_prompt_cache) > PROMPT_CACHE_SIZE:
+                self._initial_prompt_cache.popitem(last=False)
+        return prompt
+    
+    def _get_refinement_prompt(
+        self,
+        task: str,
+        previous_solution: str,
+        feedback: str
+    ) -> str:
+        """
+        Get the (compressed) refinement prompt, memoized on its inputs
+        
+        Keyed on 64-bit hashes of the task, previous solution and feedback
+        so large solutions are not retained as keys. Repeat runs of a task
+        (with cached LLM responses) and MaTTS refine passes over an already
+        seen candidate skip rebuilding and recompressing the prompt.
+        Memories live in the system prefix and do not affect it.
+        
+        Args:
+            task: Task description
+            previous_solution: Previous solution attempt
+            feedback: Evaluation feedback on that attempt
+        
+        Returns:
+            Prompt ready to send as the user message
+        """
+        key = (
+            self._compute_trajectory_hash(task),
+            self._compute_trajectory_hash(previous_solution),
+            self._compute_trajectory_hash(feedback)
+        )
+        prompt = self._refinement_prompt_cache.get(key)
+        if prompt is None:
+            prompt = self._compress_if_needed(
+                self._build_refinement_prompt(task, previous_solution, feedback)
+            )
+            self._refinement_prompt_cache[key] = prompt
+            if len(self._refinement_prompt_cache) > PROMPT_CACHE_SIZE:
+                self._refinement_prompt_cache.popitem(last=False)
+        else:
+            self._refinement_prompt_cache.move_to_end(key)
+        return prompt
+    
+    async def _llm_acreate(self, **kwargs):
+        """
+        Await an LLM call without blocking the event loop
+        
+        Uses the client's acreate() when available and falls back to running
+        the blocking create() in a worker thread otherwise.
+        """
+        acreate = getattr(self.llm_client, "acreate", None)
+        if inspect.iscoroutinefunction(acreate):
+            return await acreate(**kwargs)
+        return await asyncio.to_thread(self.llm_client.create, **kwargs)
     
     def _evaluate_step(
         self,
@@ -884,7 +1561,10 @@ class IterativeReasoningAgent:
         Evaluate solution quality and provide feedback
         
         Uses LLM to score the solution (0.0-1.0) and provide specific
-        feedback for improvement.
+        feedback for improvement. A solution already evaluated for the task
+        in this run reuses its score and feedback without an LLM call.
+        Evaluations run on evaluator_model when set; scores close to
+        success_threshold are then re-checked with the generation model.
         
         Args:
             task: Original task description
@@ -897,31 +1577,42 @@ class IterativeReasoningAgent:
         Raises:
             LLMGenerationError: If evaluation fails
         """
-        # Build evaluation prompt
-        prompt = self._build_evaluation_prompt(task, solution)
+        key, cached = self._lookup_evaluation(task, solution, iteration)
+        if cached is not None:
+            return cached[0], cached[1], 0
         
-        # Call LLM for evaluation
-        messages = [
-            {"role": "system", "content": "You are an expert code reviewer and evaluator."},
-            {"role": "user", "content": prompt}
-        ]
+        messages = self._build_evaluation_messages(task, solution)
         
         try:
             result = self.llm_client.create(
                 messages=messages,
                 temperature=self.temperature_evaluate,  # Deterministic
-                max_output_tokens=self.evaluation_tokens
+                max_output_tokens=self.evaluation_tokens,
+                **self._evaluator_kwargs
             )
             
             # Parse evaluation response
             score, feedback = self._parse_evaluation_response(result.content)
             tokens_used = result.total_tokens
             
+            if self._should_escalate(score):
+                try:
+                    result = self.llm_client.create(
+                        messages=messages,
+                        temperature=self.temperature_evaluate,
+                        max_output_tokens=self.evaluation_tokens
+                    )
+                    score, feedback = self._parse_evaluation_response(result.content)
+                    tokens_used += result.total_tokens
+                except Exception as e:
+                    logger.warning(f"Escalated evaluation failed, keeping score: {e}")
+            
             logger.info(
                 f"Evaluate step {iteration}: score={score:.2f}, "
                 f"{tokens_used} tokens"
             )
             
+            self._store_evaluation(key, score, feedback)
             return score, feedback, tokens_used
             
         except Exception as e:
@@ -929,108 +1620,289 @@ class IterativeReasoningAgent:
             # Return default score and feedback
             return 0.5, "Evaluation failed, continuing with default score", 0
     
-    def _build_generation_prompt(
+    async def _evaluate_step_async(
         self,
         task: str,
-        memories: List[MemoryItem]
-    ) -> str:
-        """Build prompt for initial solution generation"""
-        prompt_parts = [
-            "# Task",
-            task,
-            ""
-        ]
+        solution: str,
+        iteration: int
+    ) -> Tuple[float, str, int]:
+        """
+        Async variant of _evaluate_step used for parallel MaTTS generation
+        
+        Returns:
+            Tuple of (score, feedback, tokens_used)
+        """
+        key, cached = self._lookup_evaluation(task, solution, iteration)
+        if cached is not None:
+            return cached[0], cached[1], 0
         
-        # Add memory context if available
-        if memories:
-            prompt_parts.append("# Relevant Past Experiences")
-            prompt_parts.append(
-                "Here are relevant memories from past similar tasks. "
-                "Learn from these patterns and avoid past mistakes:\n"
+        messages = self._build_evaluation_messages(task, solution)
+        
+        try:
+            result = await self._llm_acreate(
+                messages=messages,
+                temperature=self.temperature_evaluate,  # Deterministic
+                max_output_tokens=self.evaluation_tokens,
+                **self._evaluator_kwargs
             )
             
-            for i, memory in enumerate(memories[:3], 1):  # Limit to top 3
-                prompt_parts.append(f"## Memory {i}")
-                prompt_parts.append(memory.format_for_prompt())
-                prompt_parts.append("")
+            # Parse evaluation response
+            score, feedback = self._parse_evaluation_response(result.content)
+            tokens_used = result.total_tokens
+            
+            if self._should_escalate(score):
+                try:
+                    result = await self._llm_acreate(
+                        messages=messages,
+                        temperature=self.temperature_evaluate,
+                        max_output_tokens=self.evaluation_tokens
+                    )
+                    score, feedback = self._parse_evaluation_response(result.content)
+                    tokens_used += result.total_tokens
+                except Exception as e:
+                    logger.warning(f"Escalated evaluation failed, keeping score: {e}")
+            
+            logger.info(
+                f"Evaluate step {iteration}: score={score:.2f}, "
+                f"{tokens_used} tokens"
+            )
+            
+            self._store_evaluation(key, score, feedback)
+            return score, feedback, tokens_used
+            
+        except Exception as e:
+            logger.error(f"Failed to evaluate solution: {e}")
+            # Return default score and feedback
+            return 0.5, "Evaluation failed, continuing with default score", 0
+    
+    def _should_escalate(self, score: float) -> bool:
+        """Whether an evaluator_model score is too close to the threshold to trust"""
+        return (
+            self.evaluator_model is not None
+            and abs(score - self.success_threshold) <= EVALUATOR_ESCALATION_MARGIN
+        )
+    
+    def _lookup_evaluation(
+        self,
+        task: str,
+        solution: str,
+        iteration: int
+    ) -> Tuple[Tuple[int, int], Optional[Tuple[float, str]]]:
+        """
+        Look up a memoized evaluation of a solution
         
-        prompt_parts.extend([
-            "# Instructions",
-            "Generate a high-quality solution to the task above.",
-            "If memories are provided, learn from the patterns and avoid past mistakes.",
-            "Provide clear, well-structured code with explanations.",
-            "",
-            "# Solution"
-        ])
+        Returns:
+            Tuple of (cache key, (score, feedback) or None on a miss)
+        """
+        key = (
+            self._compute_trajectory_hash(task),
+            self._compute_trajectory_hash(solution)
+        )
+        cached = self._eval_cache.get(key)
+        if cached is not None:
+            self._eval_cache.move_to_end(key)
+            logger.debug(f"Evaluate step {iteration}: reusing evaluation of identical solution")
+        return key, cached
+    
+    def _store_evaluation(self, key: Tuple[int, int], score: float, feedback: str) -> None:
+        """Memoize a successful evaluation, evicting the least recently used"""
+        self._eval_cache[key] = (score, feedback)
+        if len(self._eval_cache) > EVAL_CACHE_SIZE:
+            self._eval_cache.popitem(last=False)
+    
+    def _build_evaluation_messages(self, task: str, solution: str) -> List[Dict[str, str]]:
+        """Build the chat messages for an evaluate step"""
+        return [
+            self._system_message(EVALUATION_SYSTEM_PROMPT),
+            {"role": "user", "content": self._build_evaluation_prompt(task, solution)}
+        ]
+    
+    def _system_message(self, content: str) -> Dict[str, Any]:
+        """
+        Build a system message holding a static, cacheable prompt prefix
+        
+        With prompt_cache_control the content is sent as a single text part
+        carrying an ephemeral cache_control breakpoint, which providers with
+        explicit prompt caching (Anthropic, Gemini via OpenRouter) need in
+        order to cache it; others cache the prefix automatically or ignore it.
+        
+        The same message object is returned for the same content (the
+        evaluation prompts, memoized think prefixes), which lets
+        CachedLLMClient reuse its serialization; it must not be modified.
+        """
+        key = (content, self.prompt_cache_control)
+        message = self._system_message_cache.get(key)
+        if message is not None:
+            self._system_message_cache.move_to_end(key)
+            return message
+        
+        if not self.prompt_cache_control:
+            message = {"role": "system", "content": content}
+        else:
+            message = {
+                "role": "system",
+                "content": [{
+                    "type": "text",
+                    "text": content,
+                    "cache_control": {"type": "ephemeral"}
+                }]
+            }
+        
+        self._system_message_cache[key] = message
+        if len(self._system_message_cache) > PROMPT_CACHE_SIZE:
+            self._system_message_cache.popitem(last=False)
+        return message
+    
+    async def _evaluate_batch_async(
+        self,
+        task: str,
+        solutions: List[str]
+    ) -> Optional[Tuple[List[Tuple[float, str]], int]]:
+        """
+        Score several solutions to the same task in one evaluation request
+        
+        The evaluator sees all candidates side by side, which both saves
+        k-1 round trips and lets it contrast them when scoring.
+        
+        Args:
+            task: Original task description
+            solutions: Solutions to evaluate
+        
+        Returns:
+            Tuple of ([(score, feedback) per solution, in order], tokens_used),
+            or None if the request failed or the response could not be parsed
+        """
+        messages = [
+            self._system_message(BATCH_EVALUATION_SYSTEM_PROMPT),
+            {"role": "user", "content": self._build_batch_evaluation_prompt(task, solutions)}
+        ]
+        
+        try:
+            result = await self._llm_acreate(
+                messages=messages,
+                temperature=self.temperature_evaluate,  # Deterministic
+                max_output_tokens=self.evaluation_tokens,
+                **self._evaluator_kwargs
+            )
+        except Exception as e:
+            logger.warning(f"Batch evaluation failed: {e}")
+            return None
+        
+        evaluations = self._parse_batch_evaluation_response(result.content, len(solutions))
+        if evaluations is None:
+            return None
+        
+        logger.info(
+            f"Batch evaluation: {len(solutions)} solutions, {result.total_tokens} tokens"
+        )
         
-        return "\n".join(prompt_parts)
+        return evaluations, result.total_tokens
+    
+    def _build_static_prefix(self, memories: List[MemoryItem]) -> str:
+        """
+        Build the system message for think steps
+        
+        Holds everything that stays fixed for a task: the role line and the
+        memory context. Keeping it byte-identical across iterations and MaTTS
+        candidates lets provider-side prompt caching reuse the prefix, while
+        the per-call parts go in the user message. Memories are serialized
+        once per distinct set and memoized process-wide, so later iterations,
+        runs and other agents reuse the same prefix string.
+        """
+        return _static_prefix_text(
+            tuple(memory.formatted_prompt for memory in memories[:3])  # Top 3
+        )
+    
+    def _build_generation_prompt(self, task: str) -> str:
+        """Build prompt for initial solution generation"""
+        return f"{GENERATION_INSTRUCTIONS}\n\n# Task\n{task}\n\n# Solution"
     
     def _build_refinement_prompt(
         self,
         task: str,
         previous_solution: str,
-        feedback: str,
-        memories: List[MemoryItem]
+        feedback: str
     ) -> str:
         """Build prompt for solution refinement"""
-        prompt_parts = [
-            "# Task",
-            task,
-            "",
-            "# Previous Solution Attempt",
-            previous_solution,
-            "",
-            "# Evaluation Feedback",
-            feedback,
-            ""
-        ]
-        
-        # Add memory context if available
-        if memories:
-            prompt_parts.append("# Relevant Past Experiences")
-            for i, memory in enumerate(memories[:2], 1):  # Limit to top 2 for refinement
-                prompt_parts.append(f"## Memory {i}")
-                prompt_parts.append(memory.format_for_prompt())
-                prompt_parts.append("")
-        
-        prompt_parts.extend([
-            "# Instructions",
-            "Refine the previous solution based on the evaluation feedback.",
-            "Address the specific issues mentioned in the feedback.",
-            "Maintain what was working well in the previous attempt.",
-            "Provide an improved, complete solution.",
-            "",
+        # Static instructions and the task first, so every refinement of a
+        # task shares the prefix and only the attempt and feedback differ
+        return (
+            f"{REFINEMENT_INSTRUCTIONS}\n\n"
+            f"# Task\n{task}\n\n"
+            f"# Previous Solution Attempt\n{previous_solution}\n\n"
+            f"# Evaluation Feedback\n{feedback}\n\n"
             "# Refined Solution"
-        ])
-        
-        return "\n".join(prompt_parts)
+        )
     
     def _build_evaluation_prompt(self, task: str, solution: str) -> str:
-        """Build prompt for solution evaluation"""
-        prompt = f"""# Task
+        """Build prompt for solution evaluation (instructions are in EVALUATION_SYSTEM_PROMPT)"""
+        return f"""# Task
 {task}
 
 # Solution to Evaluate
 {solution}
 
-# Instructions
-Evaluate the solution and provide:
-1. A quality score from 0.0 to 1.0
-2. Specific feedback for improvement
-
-**Scoring Guide:**
-- 0.0-0.3: Major issues, doesn't work
-- 0.4-0.6: Partial solution, has problems
-- 0.7-0.8: Good solution, minor issues
-- 0.9-1.0: Excellent solution
-
-**Format your response as:**
-Score: <number between 0.0 and 1.0>
-Feedback: <specific feedback for improvement>
-
 # Evaluation
 """
-        return prompt
+    
+    def _build_batch_evaluation_prompt(self, task: str, solutions: List[str]) -> str:
+        """
+        Build prompt for evaluating several solutions at once
+        
+        Instructions are in BATCH_EVALUATION_SYSTEM_PROMPT.
+        """
+        candidates = "".join(
+            f"# Candidate {i}\n{solution}\n\n"
+            for i, solution in enumerate(solutions, 1)
+        )
+        return (
+            f"# Task\n{task}\n\n{candidates}"
+            f"# Evaluation\nScore all {len(solutions)} candidates."
+        )
+    
+    def _parse_batch_evaluation_response(
+        self,
+        response: str,
+        count: int
+    ) -> Optional[List[Tuple[float, str]]]:
+        """
+        Parse a batch evaluation response
+        
+        Args:
+            response: LLM evaluation response (JSON array)
+            count: Number of candidates that were evaluated
+        
+        Returns:
+            List of (score, feedback) in candidate order, or None unless every
+            candidate got a valid score
+        """
+        try:
+            # Remove markdown code blocks if present
+            response = response.strip()
+            if response.startswith("```json"):
+                response = response[7:]
+            elif response.startswith("```"):
+                response = response[3:]
+            if response.endswith("```"):
+                response = response[:-3]
+            
+            items = json.loads(response.strip())
+            if not isinstance(items, list):
+                raise ValueError("response is not a list")
+            
+            by_id = {}
+            for item in items:
+                candidate_id = int(item["id"])
+                # Clamp to [0, 1]
+                score = max(0.0, min(1.0, float(item["score"])))
+                feedback = str(item.get("feedback") or "No feedback provided")
+                by_id[candidate_id] = (score, feedback)
+            
+            return [by_id[i] for i in range(1, count + 1)]
+            
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Failed to parse batch evaluation response: {e}")
+            return None
     
     def _parse_evaluation_response(self, response: str) -> Tuple[float, str]:
         """
@@ -1046,54 +1918,86 @@ Feedback: <specific feedback for improvement>
         Returns:
             Tuple of (score, feedback)
         """
-        lines = response.strip().split('\n')
         score = 0.5  # Default
         feedback = "No feedback provided"
         
-        for line in lines:
-            line = line.strip()
-            if line.lower().startswith('score:'):
-                try:
-                    score_str = line.split(':', 1)[1].strip()
-                    score = float(score_str)
-                    # Clamp to [0, 1]
-                    score = max(0.0, min(1.0, score))
-                except (ValueError, IndexError) as e:
-                    logger.warning(f"Failed to parse score: {e}")
-            elif line.lower().startswith('feedback:'):
-                feedback = line.split(':', 1)[1].strip()
+        # The first well-formed "Score:" line wins; scanning stops there
+        for match in _SCORE_LINE_RE.finditer(response):
+            try:
+                # Clamp to [0, 1]
+                score = max(0.0, min(1.0, float(match.group(1).strip())))
+                break
+            except ValueError as e:
+                logger.warning(f"Failed to parse score: {e}")
+        
+        # Likewise the first "Feedback:" line, without scanning a long
+        # feedback body for further matches
+        feedback_match = _FEEDBACK_LINE_RE.search(response)
+        if feedback_match:
+            feedback = feedback_match.group(1).strip()
         
         # If feedback not found in expected format, use entire response
         if feedback == "No feedback provided" and len(response) > 20:
             # Extract everything after "Feedback:" or use full response
-            if "Feedback:" in response:
-                feedback = response.split("Feedback:", 1)[1].strip()
+            feedback_index = response.find("Feedback:")
+            if feedback_index >= 0:
+                feedback = response[feedback_index + len("Feedback:"):].strip()
             else:
                 feedback = response.strip()
         
         return score, feedback
     
-    def _compute_trajectory_hash(self, solution: str) -> str:
+    def _compute_trajectory_hash(self, solution: str) -> int:
         """
         Compute hash of solution for loop detection
         
-        Uses SHA256 to create a deterministic hash of the solution.
+        Uses a 64-bit digest (xxh3, else truncated BLAKE3, else truncated
+        SHA256) of the solution with surrounding whitespace stripped.
         If we see the same hash again, we've entered a loop.
         
         Args:
             solution: Solution text to hash
         
         Returns:
-            SHA256 hash string
+            64-bit hash as an int
         """
-        hash_obj = hashlib.sha256(solution.encode('utf-8'))
-        return hash_obj.hexdigest()[:16]  # Use first 16 chars
+        data = solution.strip().encode('utf-8')
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_64_intdigest(data)
+        if BLAKE3_AVAILABLE:
+            return int.from_bytes(blake3.blake3(data).digest(length=8), "little")
+        return int.from_bytes(hashlib.sha256(data).digest()[:8], "little")
+    
+    def _remember_trajectory_hash(self, trajectory_hash: int) -> None:
+        """Record a hash for loop detection, evicting the oldest when full"""
+        order = self._trajectory_order
+        if len(order) == order.maxlen:
+            self._trajectory_hashes.discard(order[0])
+        order.append(trajectory_hash)
+        self._trajectory_hashes.add(trajectory_hash)
+    
+    def _get_encoder(self):
+        """
+        tiktoken encoding for tokenizer_model, loaded on first use
+        
+        Returns:
+            Encoding, or None if tiktoken is not installed
+        """
+        if self._encoder is None and TIKTOKEN_AVAILABLE:
+            try:
+                self._encoder = tiktoken.encoding_for_model(self.tokenizer_model or "")
+            except KeyError:
+                self._encoder = tiktoken.get_encoding("cl100k_base")
+            self._truncation_marker_tokens = len(self._encoder.encode(TRUNCATION_MARKER))
+        return self._encoder
     
     def _estimate_tokens(self, text: str) -> int:
         """
-        Estimate token count using 4 chars/token heuristic
+        Estimate token count with tiktoken
         
-        This is a rough estimate. Actual tokenization may vary.
+        Texts up to EXACT_TOKENIZE_MAX_CHARS are tokenized in full; longer
+        ones are extrapolated from the token/char ratio of their head and
+        tail. Falls back to the 4 chars/token heuristic without tiktoken.
         
         Args:
             text: Text to estimate
@@ -1101,14 +2005,24 @@ Feedback: <specific feedback for improvement>
         Returns:
             Estimated token count
         """
-        return len(text) // 4
+        encoder = self._get_encoder()
+        if encoder is None:
+            return len(text) // 4
+        
+        if len(text) <= EXACT_TOKENIZE_MAX_CHARS:
+            return len(encoder.encode(text, disallowed_special=()))
+        
+        sample = text[:TOKEN_SAMPLE_CHARS] + text[-TOKEN_SAMPLE_CHARS:]
+        sample_tokens = len(encoder.encode(sample, disallowed_special=()))
+        return int(len(text) * sample_tokens / len(sample))
     
     def _truncate_prompt(self, prompt: str, max_tokens: int) -> str:
         """
         Truncate prompt while preserving head and tail context
         
         Keeps the beginning (task, instructions) and end (current context)
-        while removing middle content if needed.
+        while removing middle content if needed. With tiktoken the prompt
+        is cut on token boundaries; otherwise at max_tokens * 4 chars.
         
         Args:
             prompt: Prompt to truncate
@@ -1117,25 +2031,30 @@ Feedback: <specific feedback for improvement>
         Returns:
             Truncated prompt
         """
-        max_chars = max_tokens * 4  # Convert tokens to chars
-        
-        if len(prompt) <= max_chars:
-            return prompt
-        
-        # Calculate head and tail sizes
-        head_size = int(max_chars * self.truncation_head_ratio)
-        tail_size = max_chars - head_size - 100  # Reserve 100 for truncation message
-        
-        # Extract head and tail
-        head = prompt[:head_size]
-        tail = prompt[-tail_size:]
+        encoder = self._get_encoder()
+        if encoder is not None:
+            ids = encoder.encode(prompt, disallowed_special=())
+            if len(ids) <= max_tokens:
+                return prompt
+            
+            head_n = int(max_tokens * self.truncation_head_ratio)
+            tail_n = max(max_tokens - head_n - self._truncation_marker_tokens, 0)
+            head = encoder.decode(ids[:head_n])
+            tail = encoder.decode(ids[len(ids) - tail_n:])
+        else:
+            max_chars = max_tokens * 4  # Convert tokens to chars
+            
+            if len(prompt) <= max_chars:
+                return prompt
+            
+            # Calculate head and tail sizes, reserving 100 chars for the marker
+            head_size = int(max_chars * self.truncation_head_ratio)
+            tail_size = max(max_chars - head_size - 100, 0)
+            head = prompt[:head_size]
+            tail = prompt[len(prompt) - tail_size:]
         
         # Combine with truncation message
-        truncated = (
-            f"{head}\n\n"
-            f"[... Content truncated to fit token budget ...]\n\n"
-            f"{tail}"
-        )
+        truncated = f"{head}{TRUNCATION_MARKER}{tail}"
         
         logger.warning(
             f"Truncated prompt from {len(prompt)} to {len(truncated)} chars"
@@ -1146,6 +2065,8 @@ Feedback: <specific feedback for improvement>
     def reset_state(self):
         """Reset agent state for new task"""
         self._trajectory_hashes.clear()
+        self._trajectory_order.clear()
+        self._eval_cache.clear()
         self._total_tokens_used = 0
 
 
@@ -11,16 +11,24 @@ This module implements the KnowledgeRetriever class that provides:
 Requirements addressed: 1.2, 13.1, 13.2
 """
 
+import heapq
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
 
+import numpy as np
+
 from reasoning_bank_core import ReasoningBank, MemoryItem
 from exceptions import MemoryRetrievalError
 
 
 logger = logging.getLogger(__name__)
 
+# Separator placed after each memory in format_for_prompt
+MEMORY_DIVIDER = "\n\n" + "-" * 80
+
 
 # ============================================================================
 # Configuration
@@ -38,6 +46,10 @@ class KnowledgeRetrieverConfig:
         boost_recent_memories: Apply recency boost to scoring
         boost_error_context: Apply boost to memories with error context
         max_pattern_tags: Maximum pattern tags to consider for filtering
+        fanout_domains: Domains queried concurrently, one query each, when
+            no domain filter is given (for backends with per-domain indices;
+            memories without a domain category are not searched then)
+        max_fanout_workers: Thread pool size for domain fan-out queries
     """
     default_n_results: int = 5
     min_relevance_score: float = 0.3
@@ -45,6 +57,8 @@ class KnowledgeRetrieverConfig:
     boost_recent_memories: bool = True
     boost_error_context: bool = True
     max_pattern_tags: int = 5
+    fanout_domains: Optional[List[str]] = None
+    max_fanout_workers: int = 8
 
 
 # ============================================================================
@@ -88,6 +102,9 @@ class KnowledgeRetriever:
         self._total_memories_retrieved = 0
         self._filtered_memories_count = 0
         
+        # Thread pool for domain fan-out, created on first use
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        
         logger.info(
             f"KnowledgeRetriever initialized with min_relevance={self.config.min_relevance_score}, "
             f"default_n_results={self.config.default_n_results}"
@@ -100,7 +117,8 @@ class KnowledgeRetriever:
         domain_filter: Optional[str] = None,
         pattern_tags: Optional[List[str]] = None,
         include_errors: bool = True,
-        min_score: Optional[float] = None
+        min_score: Optional[float] = None,
+        errors_only: bool = False
     ) -> List[MemoryItem]:
         """
         Retrieve relevant knowledge with filtering and ranking.
@@ -118,6 +136,7 @@ class KnowledgeRetriever:
             pattern_tags: Filter by pattern tags (memories must have at least one matching tag)
             include_errors: Include memories with error context
             min_score: Minimum relevance score threshold (uses config default if None)
+            errors_only: Only retrieve memories with error context
         
         Returns:
             List of MemoryItem objects ranked by relevance
@@ -138,25 +157,48 @@ class KnowledgeRetriever:
             # Retrieve more than needed for post-filtering
             retrieval_count = n_results * 2 if pattern_tags else n_results
             
-            memories = self.reasoning_bank.retrieve_memories(
-                query=query,
-                n_results=retrieval_count,
-                include_errors=include_errors,
-                domain_filter=domain_filter
-            )
+            fanout_domains = self.config.fanout_domains
+            if domain_filter is None and fanout_domains and len(fanout_domains) > 1:
+                memories = self._retrieve_across_domains(
+                    query, retrieval_count, include_errors, errors_only, fanout_domains
+                )
+            else:
+                memories = self.reasoning_bank.retrieve_memories(
+                    query=query,
+                    n_results=retrieval_count,
+                    include_errors=include_errors,
+                    domain_filter=domain_filter,
+                    errors_only=errors_only
+                )
             
             self._total_memories_retrieved += len(memories)
             
-            # Apply pattern tag filtering if specified
+            # Single pass over the ranked results: tag filter, score
+            # threshold and top-k limit. ReasoningBank returns memories
+            # sorted by composite score, so the first n_results that pass
+            # are the top-k.
+            required = None
             if pattern_tags:
-                memories = self._filter_by_pattern_tags(memories, pattern_tags)
-                self._filtered_memories_count += len(memories)
+                required = frozenset(
+                    tag.lower() for tag in pattern_tags[:self.config.max_pattern_tags]
+                )
             
-            # Apply minimum score threshold
-            memories = [m for m in memories if (m.composite_score or 0.0) >= min_score]
+            selected = []
+            tag_matches = 0
+            for memory in memories:
+                if required is not None:
+                    if memory.tags_lc.isdisjoint(required):
+                        continue
+                    tag_matches += 1
+                if len(selected) < n_results and (memory.composite_score or 0.0) >= min_score:
+                    selected.append(memory)
+                    # Without tags there is nothing left to count
+                    if required is None and len(selected) == n_results:
+                        break
             
-            # Limit to requested number of results
-            memories = memories[:n_results]
+            if required is not None:
+                self._filtered_memories_count += tag_matches
+            memories = selected
             
             logger.info(
                 f"Retrieved {len(memories)} memories for query: '{query[:50]}...' "
@@ -173,6 +215,61 @@ class KnowledgeRetriever:
                 context={"error": str(e)}
             )
     
+    def _retrieve_across_domains(
+        self,
+        query: str,
+        n_results: int,
+        include_errors: bool,
+        errors_only: bool,
+        domains: List[str]
+    ) -> List[MemoryItem]:
+        """
+        Query each domain concurrently and merge the ranked results.
+        
+        Each per-domain result list is already ranked by composite score,
+        so the merge keeps the overall top n_results.
+        
+        Args:
+            query: Search query text
+            n_results: Number of results to return
+            include_errors: Include memories with error context
+            errors_only: Only retrieve memories with error context
+            domains: Domain categories to query
+        
+        Returns:
+            List of MemoryItem objects ranked by composite score
+        """
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=self.config.max_fanout_workers,
+                thread_name_prefix="knowledge-retrieval"
+            )
+        
+        futures = [
+            self._io_pool.submit(
+                self.reasoning_bank.retrieve_memories,
+                query=query,
+                n_results=n_results,
+                include_errors=include_errors,
+                domain_filter=domain,
+                errors_only=errors_only
+            )
+            for domain in domains
+        ]
+        results = [future.result() for future in futures]
+        
+        return heapq.nlargest(
+            n_results,
+            chain.from_iterable(results),
+            key=lambda m: m.composite_score or 0.0
+        )
+    
+    def close(self):
+        """Shut down the domain fan-out thread pool, if one was started."""
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=False)
+            self._io_pool = None
+    
     def retrieve_by_domain(
         self,
         query: str,
@@ -252,10 +349,12 @@ class KnowledgeRetriever:
             query=query,
             n_results=n_results,
             domain_filter=domain_filter,
-            include_errors=True
+            include_errors=True,
+            errors_only=True
         )
         
-        # Filter to only memories with error context
+        # The storage backend already restricts the search to memories with
+        # error context, this only guards against backends that do not
         error_memories = [m for m in memories if m.error_context]
         
         logger.info(f"Retrieved {len(error_memories)} error pattern memories")
@@ -288,40 +387,49 @@ class KnowledgeRetriever:
         if max_memories:
             memories = memories[:max_memories]
         
-        formatted_parts = ["# Relevant Past Experiences\n"]
+        blocks = [
+            self._format_one(memory, i, include_metadata)
+            for i, memory in enumerate(memories, 1)
+        ]
+        return "\n".join(["# Relevant Past Experiences\n", *blocks])
+    
+    @staticmethod
+    def _format_one(memory: MemoryItem, index: int, include_metadata: bool) -> str:
+        """Format a single memory block for format_for_prompt."""
+        score = memory.composite_score
+        block = (
+            f"\n## Memory {index}: {memory.title}\n"
+            + (f"**Relevance Score:** {score:.3f}\n" if score else "")
+            + f"\n**Description:** {memory.description}\n"
+            f"\n**Content:**\n{memory.content}"
+        )
         
-        for i, memory in enumerate(memories, 1):
-            formatted_parts.append(f"\n## Memory {i}: {memory.title}")
-            formatted_parts.append(f"**Relevance Score:** {memory.composite_score:.3f}" if memory.composite_score else "")
-            formatted_parts.append(f"\n**Description:** {memory.description}")
-            formatted_parts.append(f"\n**Content:**\n{memory.content}")
-            
-            # Add error warning if present
-            if memory.error_context:
-                formatted_parts.append("\n⚠️ **Error Warning:** This memory contains failure patterns:")
-                formatted_parts.append(f"- **Error Type:** {memory.error_context.get('error_type', 'Unknown')}")
-                formatted_parts.append(f"- **Failure Pattern:** {memory.error_context.get('failure_pattern', 'N/A')}")
-                formatted_parts.append(f"- **Corrective Guidance:** {memory.error_context.get('corrective_guidance', 'N/A')}")
-            
-            # Add metadata if requested
-            if include_metadata:
-                metadata_parts = []
-                
-                if memory.pattern_tags:
-                    metadata_parts.append(f"**Tags:** {', '.join(memory.pattern_tags)}")
-                
-                if memory.difficulty_level:
-                    metadata_parts.append(f"**Difficulty:** {memory.difficulty_level}")
-                
-                if memory.domain_category:
-                    metadata_parts.append(f"**Domain:** {memory.domain_category}")
-                
-                if metadata_parts:
-                    formatted_parts.append("\n" + " | ".join(metadata_parts))
-            
-            formatted_parts.append("\n" + "-" * 80)
+        # Add error warning if present
+        error_context = memory.error_context
+        if error_context:
+            error_type = error_context.get('error_type', 'Unknown')
+            failure_pattern = error_context.get('failure_pattern', 'N/A')
+            guidance = error_context.get('corrective_guidance', 'N/A')
+            block += (
+                "\n\n⚠️ **Error Warning:** This memory contains failure patterns:\n"
+                f"- **Error Type:** {error_type}\n"
+                f"- **Failure Pattern:** {failure_pattern}\n"
+                f"- **Corrective Guidance:** {guidance}"
+            )
         
-        return "\n".join(formatted_parts)
+        # Add metadata if requested
+        if include_metadata:
+            metadata_parts = []
+            if memory.pattern_tags:
+                metadata_parts.append(f"**Tags:** {', '.join(memory.pattern_tags)}")
+            if memory.difficulty_level:
+                metadata_parts.append(f"**Difficulty:** {memory.difficulty_level}")
+            if memory.domain_category:
+                metadata_parts.append(f"**Domain:** {memory.domain_category}")
+            if metadata_parts:
+                block += "\n\n" + " | ".join(metadata_parts)
+        
+        return block + MEMORY_DIVIDER
     
     def get_related_memories(
         self,
@@ -377,26 +485,30 @@ class KnowledgeRetriever:
         if not boost_factors:
             boost_factors = {}
         
-        # Apply boost factors
-        for memory in memories:
-            base_score = memory.composite_score or 0.0
-            boosted_score = base_score
-            
-            # Apply error context boost
-            if memory.error_context and boost_factors.get("has_error"):
-                boosted_score *= boost_factors["has_error"]
-            
-            # Apply recency boost (if memory is recent)
-            if boost_factors.get("recent") and memory.trace_timestamp:
-                # This would require timestamp parsing and age calculation
-                # Simplified for now
-                pass
-            
-            # Update composite score with boost
-            memory.composite_score = min(1.0, boosted_score)
+        count = len(memories)
+        scores = np.fromiter(
+            (m.composite_score or 0.0 for m in memories), dtype=np.float64, count=count
+        )
         
-        # Sort by boosted composite score
-        memories.sort(key=lambda m: m.composite_score or 0.0, reverse=True)
+        # Apply error context boost
+        error_boost = boost_factors.get("has_error")
+        if error_boost:
+            has_error = np.fromiter(
+                (bool(m.error_context) for m in memories), dtype=bool, count=count
+            )
+            scores[has_error] *= error_boost
+        
+        # Recency boost ("recent") would need trace_timestamp parsing and age
+        # calculation; not applied yet
+        
+        # Update composite scores with boost
+        np.minimum(scores, 1.0, out=scores)
+        for memory, score in zip(memories, scores.tolist()):
+            memory.composite_score = score
+        
+        # Sort by boosted composite score (stable, like list.sort)
+        order = np.argsort(-scores, kind="stable")
+        memories[:] = [memories[i] for i in order.tolist()]
         
         return memories
     
@@ -422,15 +534,10 @@ class KnowledgeRetriever:
         
         # Limit tags to max_pattern_tags
         required_tags = required_tags[:self.config.max_pattern_tags]
-        required_tags_set = set(tag.lower() for tag in required_tags)
+        required = frozenset(tag.lower() for tag in required_tags)
         
-        filtered = []
-        for memory in memories:
-            if memory.pattern_tags:
-                memory_tags_set = set(tag.lower() for tag in memory.pattern_tags)
-                # Check if any required tag matches
-                if memory_tags_set & required_tags_set:
-                    filtered.append(memory)
+        # MemoryItem.tags_lc caches the lowercased set per memory
+        filtered = [m for m in memories if not m.tags_lc.isdisjoint(required)]
         
         logger.debug(
             f"Filtered {len(memories)} memories to {len(filtered)} "
@@ -5,10 +5,191 @@ Configures structlog to wrap the standard logging library, providing
 JSON-formatted structured logs while maintaining backward compatibility
 with existing logging.info() calls throughout the codebase.
 """
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+import time
+from typing import Optional
 import structlog
 
+# orjson serializes each log event far faster than stdlib json (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Stdout buffer size in bytes for log output; 0 keeps per-record writes.
+# Off by default: under the MCP stdio transport, stdout carries JSON-RPC
+# written through sys.stdout.buffer, and a second buffered writer on the
+# same fd can flush log lines into the middle of a protocol message.
+DEFAULT_LOG_BUFFER_SIZE = 0
+# Seconds between background flushes of the buffered log stream
+LOG_FLUSH_INTERVAL = 0.1
+
+_flush_stop: Optional[threading.Event] = None
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last timestamp
+_ts_second = (None, "")
+
+
+def _orjson_dumps(obj, default=None, **kwargs):
+    """JSONRenderer serializer backed by orjson, returning ``str``."""
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _add_timestamp(logger, method_name, event_dict):
+    """
+    Add an ISO 8601 UTC timestamp, like TimeStamper(fmt="iso").
+    
+    The date/time prefix is formatted once per second and only the
+    microseconds are formatted per event, avoiding a datetime object
+    and isoformat() call for every log line.
+    """
+    global _ts_second
+    
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _ts_second
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _ts_second = (second, prefix)
+    event_dict["timestamp"] = f"{prefix}.{int((now - second) * 1_000_000):06d}Z"
+    return event_dict
+
+
+def _log_buffer_size() -> int:
+    """Read REASONINGBANK_LOG_BUFFER, falling back to the default on bad input."""
+    raw = os.environ.get("REASONINGBANK_LOG_BUFFER")
+    if raw is None:
+        return DEFAULT_LOG_BUFFER_SIZE
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return DEFAULT_LOG_BUFFER_SIZE
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that skips the flush after every record.
+    
+    StreamHandler.emit() flushes per record, which would defeat a
+    buffered stream; flush_buffer() does the real flush instead.
+    """
+
+    def flush(self):
+        pass
+
+    def flush_buffer(self):
+        super().flush()
+
+
+def _buffer_stdout_handler(buffer_size: int):
+    """
+    Swap the root stdout handler for one writing to a block-buffered stream.
+    
+    A background thread flushes it every LOG_FLUSH_INTERVAL seconds and
+    an atexit hook flushes whatever is left, so records are delayed by at
+    most one interval instead of costing a write() each.
+    """
+    global _flush_stop
+    
+    if _flush_stop is not None:
+        return
+    
+    root = logging.getLogger()
+    handler = next(
+        (h for h in root.handlers
+         if type(h) is logging.StreamHandler and h.stream is sys.stdout),
+        None,
+    )
+    if handler is None:
+        return
+    
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # Replaced stdout (e.g. captured under pytest); leave it alone
+        return
+    
+    sys.stdout.flush()
+    stream = open(
+        fd, "w",
+        buffering=buffer_size,
+        encoding=sys.stdout.encoding,
+        errors=sys.stdout.errors,
+        closefd=False,
+    )
+    buffered = _BufferedStreamHandler(stream)
+    buffered.setLevel(handler.level)
+    buffered.setFormatter(handler.formatter)
+    for log_filter in handler.filters:
+        buffered.addFilter(log_filter)
+    root.removeHandler(handler)
+    root.addHandler(buffered)
+    
+    _flush_stop = threading.Event()
+    
+    def _flush_loop():
+        while not _flush_stop.wait(LOG_FLUSH_INTERVAL):
+            buffered.flush_buffer()
+    
+    threading.Thread(target=_flush_loop, name="log-flush", daemon=True).start()
+    atexit.register(buffered.flush_buffer)
+
+
+class _PreformattedFormatter(logging.Formatter):
+    """
+    Formatter for records that QueueHandler.prepare() already rendered.
+    
+    prepare() formats the message (with any traceback) into record.msg,
+    so re-running "%(message)s" formatting on the listener is redundant.
+    """
+
+    def format(self, record):
+        return record.getMessage()
+
+
+def _start_queue_listener():
+    """
+    Route root-logger records through a queue drained by a worker thread.
+    
+    Callers render the message and enqueue the record; the handlers that
+    actually write run on the QueueListener thread.
+    """
+    global _queue_listener
+    
+    if _queue_listener is not None:
+        return
+    
+    root = logging.getLogger()
+    handlers = [
+        h for h in root.handlers
+        if not isinstance(h, logging.handlers.QueueHandler)
+    ]
+    if not handlers:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+        formatter = handler.formatter
+        if formatter is None or getattr(formatter, "_fmt", None) == "%(message)s":
+            handler.setFormatter(_PreformattedFormatter())
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+    # Registered after the buffer flush hook, so it runs first at exit
+    atexit.register(_queue_listener.stop)
+
 
 def configure_logging():
     """
@@ -21,25 +202,41 @@ def configure_logging():
     - timestamp: ISO 8601 formatted timestamp
     - logger: Name of the logger
     - Additional context fields as provided
+    
+    Each record is written immediately. Setting REASONINGBANK_LOG_BUFFER
+    to a byte count (e.g. 65536) block-buffers the output instead, flushed
+    every 100 ms; only do so when stdout is not the MCP stdio transport.
+    Records are handed to a background QueueListener, so logging calls
+    return after an enqueue.
     """
+    if ORJSON_AVAILABLE:
+        renderer = structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    else:
+        renderer = structlog.processors.JSONRenderer()
+
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
         level=logging.INFO,
     )
 
+    buffer_size = _log_buffer_size()
+    if buffer_size > 0:
+        _buffer_stdout_handler(buffer_size)
+    _start_queue_listener()
+
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
-            structlog.processors.TimeStamper(fmt="iso"),
+            _add_timestamp,
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer()
+            renderer
         ],
         wrapper_class=structlog.stdlib.BoundLogger,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
-    print("✓ Structured logging configured successfully")
\ No newline at end of file
+    structlog.get_logger(__name__).info("logging_configured")
\ No newline at end of file
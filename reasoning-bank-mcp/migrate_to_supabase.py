@@ -14,7 +14,10 @@ import sys
 import json
 import argparse
 import logging
-from typing import List, Dict, Any
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime
 
 # Setup logging
@@ -24,9 +27,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Traces uploaded per insert round-trip
+DEFAULT_BATCH_SIZE = 50
+# Batches uploaded concurrently (overridable with MIGRATE_CONCURRENCY)
+DEFAULT_CONCURRENCY = 16
+
+# Minimum seconds between progress log lines during migration
+PROGRESS_LOG_INTERVAL = 1.0
+
+# Fields every exported trace must carry
+_REQUIRED_TRACE_FIELDS = frozenset({"id", "task", "trajectory", "outcome", "memory_items"})
+
+# orjson parses large trace exports considerably faster (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# httpx provides the pooled HTTP/2 connection shared by concurrent uploads
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# ijson streams traces one at a time instead of loading the whole export (optional)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 try:
-    from supabase_storage import SupabaseStorage
-    from reasoning_bank_core import ReasoningBank, MemoryItem, ReasoningTrace
+    from supabase_storage import SupabaseAdapter
 except ImportError as e:
     logger.error(f"Failed to import required modules: {e}")
     logger.error("Make sure you've installed all dependencies: pip install -r requirements.txt")
@@ -42,7 +76,9 @@ class MigrationManager:
         traces_file: str = None,
         supabase_url: str = None,
         supabase_key: str = None,
-        dry_run: bool = False
+        dry_run: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: Optional[int] = None
     ):
         """
         Initialize migration manager
@@ -53,28 +89,67 @@ class MigrationManager:
             supabase_url: Supabase project URL
             supabase_key: Supabase API key
             dry_run: If True, only validate without uploading
+            batch_size: Number of traces uploaded per batch insert
+            concurrency: Batches uploaded in parallel (from env:
+                MIGRATE_CONCURRENCY, default 16)
         """
         self.chromadb_data_dir = chromadb_data_dir
         self.traces_file = traces_file or os.path.join(chromadb_data_dir, "traces.json")
         self.dry_run = dry_run
+        self.batch_size = max(1, batch_size)
+        if concurrency is None:
+            concurrency = int(os.getenv("MIGRATE_CONCURRENCY", str(DEFAULT_CONCURRENCY)))
+        self.concurrency = max(1, concurrency)
         
         logger.info(f"ChromaDB data directory: {self.chromadb_data_dir}")
         logger.info(f"Traces file: {self.traces_file}")
         logger.info(f"Dry run mode: {self.dry_run}")
         
+        # Keep-alive HTTP/2 pool sized to the upload concurrency, reused
+        # for every insert of the migration
+        self._http_client = None
+        
         # Initialize Supabase storage (only if not dry run)
         if not dry_run:
+            self._http_client = self._create_http_client()
             try:
-                self.supabase_storage = SupabaseStorage(
+                self.supabase_storage = SupabaseAdapter(
                     supabase_url=supabase_url,
                     supabase_key=supabase_key,
-                    logger=logger
+                    http_client=self._http_client
                 )
                 logger.info("✓ Supabase connection established")
             except Exception as e:
                 logger.error(f"Failed to connect to Supabase: {e}")
+                self.close()
                 raise
     
+    def _create_http_client(self):
+        """
+        Create the HTTP client shared by all Supabase requests
+        
+        Returns:
+            httpx.Client, or None to use the Supabase default
+        """
+        if not HTTPX_AVAILABLE:
+            return None
+        
+        limits = httpx.Limits(
+            max_connections=self.concurrency,
+            max_keepalive_connections=self.concurrency
+        )
+        try:
+            return httpx.Client(http2=True, limits=limits, timeout=120.0, follow_redirects=True)
+        except ImportError:
+            # http2=True needs the h2 package
+            return httpx.Client(limits=limits, timeout=120.0, follow_redirects=True)
+    
+    def close(self):
+        """Close the shared HTTP client"""
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+    
     def load_traces_from_chromadb(self) -> List[Dict]:
         """
         Load traces from ChromaDB JSON file
@@ -82,19 +157,57 @@ class MigrationManager:
         Returns:
             List of trace dictionaries
         """
-        if not os.path.exists(self.traces_file):
+        try:
+            # Both parsers take the UTF-8 bytes directly
+            with open(self.traces_file, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
             logger.warning(f"Traces file not found: {self.traces_file}")
             return []
+        except OSError as e:
+            logger.error(f"Failed to load traces: {e}")
+            return []
         
         try:
-            with open(self.traces_file, 'r') as f:
-                traces = json.load(f)
+            traces = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
             logger.info(f"✓ Loaded {len(traces)} traces from {self.traces_file}")
             return traces
         except Exception as e:
             logger.error(f"Failed to load traces: {e}")
             return []
     
+    def iter_traces_from_chromadb(self) -> Iterator[Dict]:
+        """
+        Iterate over traces in the ChromaDB JSON file
+        
+        With ijson installed the file is parsed incrementally, so only one
+        trace is held in memory at a time; otherwise this falls back to
+        load_traces_from_chromadb.
+        
+        Yields:
+            Trace dictionaries
+        """
+        if not IJSON_AVAILABLE:
+            yield from self.load_traces_from_chromadb()
+            return
+        
+        try:
+            f = open(self.traces_file, 'rb')
+        except FileNotFoundError:
+            logger.warning(f"Traces file not found: {self.traces_file}")
+            return
+        except OSError as e:
+            logger.error(f"Failed to load traces: {e}")
+            return
+        
+        with f:
+            try:
+                # use_float keeps numbers as floats rather than Decimal so
+                # they serialize like json.load output
+                yield from ijson.items(f, 'item', use_float=True)
+            except ijson.JSONError as e:
+                logger.error(f"Failed to load traces: {e}")
+    
     def validate_trace(self, trace: Dict) -> bool:
         """
         Validate trace data structure
@@ -105,19 +218,61 @@ class MigrationManager:
         Returns:
             True if valid, False otherwise
         """
-        required_fields = ["id", "task", "trajectory", "outcome", "memory_items"]
-        
-        for field in required_fields:
-            if field not in trace:
-                logger.warning(f"Trace {trace.get('id', 'unknown')} missing field: {field}")
-                return False
+        missing = _REQUIRED_TRACE_FIELDS.difference(trace)
+        if missing:
+            logger.warning(
+                f"Trace {trace.get('id', 'unknown')} missing field: {', '.join(sorted(missing))}"
+            )
+            return False
         
-        if not isinstance(trace["memory_items"], list):
+        if type(trace["memory_items"]) is not list:
             logger.warning(f"Trace {trace['id']} has invalid memory_items type")
             return False
         
         return True
     
+    def prepare_trace(self, trace: Dict) -> Optional[Dict]:
+        """
+        Validate a trace and normalize it into an upload payload
+        
+        Args:
+            trace: Trace dictionary
+            
+        Returns:
+            Payload dictionary, or None if the trace is invalid
+        """
+        if not self.validate_trace(trace):
+            return None
+        
+        # Convert memory items, ensuring all required fields exist. A dict
+        # display of .get() calls is faster here than merging a defaults
+        # dict and re-selecting the allowed keys.
+        memory_items = [
+            {
+                "id": mem_dict.get("id"),
+                "title": mem_dict.get("title", "Untitled"),
+                "description": mem_dict.get("description", ""),
+                "content": mem_dict.get("content", ""),
+                "error_context": mem_dict.get("error_context"),
+                "pattern_tags": mem_dict.get("pattern_tags", []),
+                "difficulty_level": mem_dict.get("difficulty_level"),
+                "domain_category": mem_dict.get("domain_category"),
+                "parent_memory_id": mem_dict.get("parent_memory_id"),
+                "evolution_stage": mem_dict.get("evolution_stage", 0)
+            }
+            for mem_dict in trace["memory_items"]
+        ]
+        
+        return {
+            "id": trace["id"],
+            "task": trace["task"],
+            "trajectory": trace["trajectory"],
+            "outcome": trace["outcome"],
+            "metadata": trace.get("metadata", {}),
+            "parent_trace_id": trace.get("parent_trace_id"),
+            "memory_items": memory_items
+        }
+    
     def migrate_trace(self, trace: Dict) -> bool:
         """
         Migrate a single trace to Supabase
@@ -129,58 +284,65 @@ class MigrationManager:
             True if successful, False otherwise
         """
         try:
-            # Validate trace
-            if not self.validate_trace(trace):
-                return False
-            
-            # Extract trace data
-            trace_id = trace["id"]
-            task = trace["task"]
-            trajectory = trace["trajectory"]
-            outcome = trace["outcome"]
-            metadata = trace.get("metadata", {})
-            parent_trace_id = trace.get("parent_trace_id")
-            
-            # Convert memory items
-            memory_items = []
-            for mem_dict in trace["memory_items"]:
-                # Ensure all required fields exist
-                memory_item = {
-                    "id": mem_dict.get("id"),
-                    "title": mem_dict.get("title", "Untitled"),
-                    "description": mem_dict.get("description", ""),
-                    "content": mem_dict.get("content", ""),
-                    "error_context": mem_dict.get("error_context"),
-                    "pattern_tags": mem_dict.get("pattern_tags", []),
-                    "difficulty_level": mem_dict.get("difficulty_level"),
-                    "domain_category": mem_dict.get("domain_category"),
-                    "parent_memory_id": mem_dict.get("parent_memory_id"),
-                    "evolution_stage": mem_dict.get("evolution_stage", 0)
-                }
-                memory_items.append(memory_item)
-            
             if self.dry_run:
-                logger.info(f"[DRY RUN] Would migrate trace {trace_id} with {len(memory_items)} memories")
-                return True
+                return self._dry_run_trace(trace)
             
-            # Upload to Supabase
-            self.supabase_storage.add_trace(
-                trace_id=trace_id,
-                task=task,
-                trajectory=trajectory,
-                outcome=outcome,
-                memory_items=memory_items,
-                metadata=metadata,
-                parent_trace_id=parent_trace_id
-            )
+            payload = self.prepare_trace(trace)
+            if payload is None:
+                return False
+            
+            # Upload to Supabase; the batch path upserts, so this also
+            # completes a trace whose batch was partially written
+            self.supabase_storage.add_traces_batch([payload])
             
-            logger.info(f"✓ Migrated trace {trace_id}")
+            logger.info(f"✓ Migrated trace {payload['id']}")
             return True
             
         except Exception as e:
             logger.error(f"Failed to migrate trace {trace.get('id', 'unknown')}: {e}")
             return False
     
+    def _dry_run_trace(self, trace: Dict) -> bool:
+        """Validate a trace and log what would be migrated, without converting it"""
+        if not self.validate_trace(trace):
+            return False
+        logger.info(f"[DRY RUN] Would migrate trace {trace['id']} with {len(trace['memory_items'])} memories")
+        return True
+    
+    def migrate_batch(self, payloads: List[Dict], traces: List[Dict]) -> int:
+        """
+        Upload prepared traces with one batch insert
+        
+        If the batch insert fails, the traces are retried one at a time
+        so that a single bad trace does not fail the others.
+        
+        Args:
+            payloads: Payloads from prepare_trace
+            traces: The original trace dictionaries, in the same order
+            
+        Returns:
+            Number of traces migrated successfully
+        """
+        if not payloads:
+            return 0
+        
+        if self.dry_run:
+            for payload in payloads:
+                logger.info(
+                    f"[DRY RUN] Would migrate trace {payload['id']} "
+                    f"with {len(payload['memory_items'])} memories"
+                )
+            return len(payloads)
+        
+        try:
+            self.supabase_storage.add_traces_batch(payloads)
+            logger.info(f"✓ Migrated batch of {len(payloads)} traces")
+            return len(payloads)
+        except Exception as e:
+            logger.warning(f"Batch insert failed ({e}); retrying traces individually")
+        
+        return sum(map(self.migrate_trace, traces))
+    
     def run_migration(self) -> Dict[str, Any]:
         """
         Run the full migration process
@@ -192,33 +354,99 @@ class MigrationManager:
         logger.info("Starting ChromaDB to Supabase Migration")
         logger.info("="*60)
         
-        # Load traces
-        traces = self.load_traces_from_chromadb()
-        
-        if not traces:
-            logger.warning("No traces found to migrate")
-            return {
-                "total_traces": 0,
-                "successful": 0,
-                "failed": 0,
-                "skipped": 0
-            }
-        
-        # Migrate traces
         stats = {
-            "total_traces": len(traces),
+            "total_traces": 0,
             "successful": 0,
             "failed": 0,
             "skipped": 0
         }
         
-        for i, trace in enumerate(traces, 1):
-            logger.info(f"Processing trace {i}/{len(traces)}: {trace.get('id', 'unknown')}")
+        # Traces are streamed from the export, validated and grouped into
+        # batches that are uploaded concurrently to overlap the round-trips
+        # to Supabase; at most two per worker are in flight so memory stays
+        # bounded. Concurrent batches can commit in any order, so a trace
+        # whose parent_trace_id foreign key could point at a row of another
+        # batch is held back and uploaded after its parent (see below).
+        pending = deque()
+        children = {}
+        
+        def collect_oldest():
+            stats["successful"] += pending.popleft().result()
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            def submit(payloads, batch_traces):
+                pending.append(executor.submit(self.migrate_batch, payloads, batch_traces))
+                while len(pending) > 2 * self.concurrency:
+                    collect_oldest()
+            
+            def upload(items):
+                """Upload (payload, trace) pairs and wait until all are stored"""
+                payloads = []
+                batch_traces = []
+                for payload, trace in items:
+                    payloads.append(payload)
+                    batch_traces.append(trace)
+                    if len(payloads) >= self.batch_size:
+                        submit(payloads, batch_traces)
+                        payloads, batch_traces = [], []
+                if payloads:
+                    submit(payloads, batch_traces)
+                
+                while pending:
+                    collect_oldest()
+            
+            def root_traces():
+                """Stream the export, yielding traces without a parent"""
+                # Per-trace lines are DEBUG; INFO gets a throttled progress line
+                debug_on = logger.isEnabledFor(logging.DEBUG)
+                next_progress = time.monotonic() + PROGRESS_LOG_INTERVAL
+                for i, trace in enumerate(self.iter_traces_from_chromadb(), 1):
+                    stats["total_traces"] = i
+                    if debug_on:
+                        logger.debug("Processing trace %d: %s", i, trace.get('id', 'unknown'))
+                    now = time.monotonic()
+                    if now >= next_progress:
+                        logger.info(f"Processed {i} traces")
+                        next_progress = now + PROGRESS_LOG_INTERVAL
+                    
+                    if self.dry_run:
+                        # Validation only; skip the payload conversion and uploads
+                        stats["successful"] += self._dry_run_trace(trace)
+                        continue
+                    
+                    payload = self.prepare_trace(trace)
+                    if payload is None:
+                        continue
+                    
+                    if payload["parent_trace_id"]:
+                        children[payload["id"]] = (payload, trace)
+                    else:
+                        yield payload, trace
             
-            if self.migrate_trace(trace):
-                stats["successful"] += 1
-            else:
-                stats["failed"] += 1
+            upload(root_traces())
+            
+            # Each round uploads the held back traces whose parent is not
+            # itself still waiting, and completes before the next starts,
+            # so parents are committed first at every depth. Parents absent
+            # from the export are expected to exist in Supabase already.
+            while children:
+                ready = [
+                    item for item in children.values()
+                    if item[0]["parent_trace_id"] not in children
+                ]
+                if not ready:
+                    # Cyclic parent links cannot be ordered; upload them as-is
+                    ready = list(children.values())
+                for payload, _ in ready:
+                    del children[payload["id"]]
+                upload(ready)
+        
+        # Every trace that was not migrated (invalid or upload error) failed
+        stats["failed"] = stats["total_traces"] - stats["successful"]
+        
+        if not stats["total_traces"]:
+            logger.warning("No traces found to migrate")
+            return stats
         
         # Print summary
         logger.info("="*60)
@@ -264,6 +492,17 @@ def main():
         "--supabase-key",
         help="Supabase API key (or set SUPABASE_KEY env var)"
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Traces uploaded per batch insert (default: {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help=f"Batches uploaded in parallel (default: MIGRATE_CONCURRENCY or {DEFAULT_CONCURRENCY})"
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -288,11 +527,14 @@ def main():
             traces_file=args.traces_file,
             supabase_url=supabase_url,
             supabase_key=supabase_key,
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency
         )
         
         # Run migration
         stats = manager.run_migration()
+        manager.close()
         
         # Exit with appropriate code
         if stats["failed"] > 0:
@@ -12,9 +12,10 @@ valuable Q&A exchanges without explicit storage requests. It provides:
 Requirements addressed: 9.1, 9.2, 9.3, 9.4, 9.5
 """
 
+import json
 import logging
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
 from reasoning_bank_core import ReasoningBank
@@ -24,28 +25,60 @@ from exceptions import LLMGenerationError, JSONParseError
 
 logger = logging.getLogger(__name__)
 
+# orjson parses extraction responses faster than stdlib json (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+EXTRACTION_SYSTEM_PROMPT = "You are an expert at extracting reusable knowledge from conversations."
+
+
+# Quality heuristic vocabularies, built once rather than per exchange
+EXPLANATION_KEYWORDS = (
+    "because", "reason", "explanation", "how to", "why",
+    "this is", "this means", "in other words", "essentially"
+)
+TECHNICAL_INDICATORS = (
+    "function", "class", "method", "algorithm", "pattern",
+    "implementation", "architecture", "design", "approach",
+    "solution", "technique", "strategy"
+)
+# Step-by-step markers: literal ones use substring checks, which are much
+# faster than regex searches; only the numbered forms need a pattern
+STEP_MARKER_WORDS = ("first,", "second,", "third,", "next,", "then,", "finally,")
+NUMBERED_STEP_PATTERN = re.compile(r"\d\.")
+STEP_NUMBER_PATTERN = re.compile(r"step \d")
+
 
 # ============================================================================
 # Configuration
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PassiveLearnerConfig:
     """
     Configuration for passive learning system.
     
+    Instances are immutable; use dataclasses.replace() to derive a
+    modified configuration.
+    
     Attributes:
         min_answer_length: Minimum answer length in characters to consider valuable
         auto_store_enabled: Whether to automatically store valuable exchanges
         quality_threshold: Minimum quality score (0.0-1.0) to trigger auto-storage
         max_extractions_per_exchange: Maximum knowledge items to extract per exchange
         temperature: LLM temperature for knowledge extraction
+        batch_size: Maximum exchanges sent in one extraction prompt by
+            process_exchanges()
     """
     min_answer_length: int = 100
     auto_store_enabled: bool = True
     quality_threshold: float = 0.6
     max_extractions_per_exchange: int = 2
     temperature: float = 0.0
+    batch_size: int = 8
 
 
 # ============================================================================
@@ -128,31 +161,22 @@ class PassiveLearner:
             return True
         
         # Heuristic 3: Contains explanations
-        explanation_keywords = [
-            "because", "reason", "explanation", "how to", "why",
-            "this is", "this means", "in other words", "essentially"
-        ]
         answer_lower = answer.lower()
-        if any(keyword in answer_lower for keyword in explanation_keywords):
+        if any(keyword in answer_lower for keyword in EXPLANATION_KEYWORDS):
             logger.debug("Answer contains explanatory language - valuable")
             return True
         
         # Heuristic 4: Contains step-by-step guidance
-        step_markers = [
-            r"\d+\.", r"step \d+", r"first,", r"second,", r"third,",
-            r"next,", r"then,", r"finally,"
-        ]
-        if any(re.search(marker, answer_lower) for marker in step_markers):
+        if (
+            any(marker in answer_lower for marker in STEP_MARKER_WORDS)
+            or NUMBERED_STEP_PATTERN.search(answer_lower)
+            or STEP_NUMBER_PATTERN.search(answer_lower)
+        ):
             logger.debug("Answer contains step-by-step guidance - valuable")
             return True
         
         # Heuristic 5: Technical depth indicators
-        technical_indicators = [
-            "function", "class", "method", "algorithm", "pattern",
-            "implementation", "architecture", "design", "approach",
-            "solution", "technique", "strategy"
-        ]
-        technical_count = sum(1 for indicator in technical_indicators if indicator in answer_lower)
+        technical_count = sum(1 for indicator in TECHNICAL_INDICATORS if indicator in answer_lower)
         if technical_count >= 3:
             logger.debug(f"Answer has technical depth ({technical_count} indicators) - valuable")
             return True
@@ -202,7 +226,7 @@ class PassiveLearner:
             messages = [
                 {
                     "role": "system",
-                    "content": "You are an expert at extracting reusable knowledge from conversations."
+                    "content": EXTRACTION_SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
@@ -219,17 +243,7 @@ class PassiveLearner:
             # Parse JSON response
             knowledge_items = self._parse_extraction_response(result.content)
             
-            # Limit to max extractions
-            knowledge_items = knowledge_items[:self.config.max_extractions_per_exchange]
-            
-            # Tag with source type metadata
-            for item in knowledge_items:
-                if "metadata" not in item:
-                    item["metadata"] = {}
-                item["metadata"]["source_type"] = "passive_learning"
-                item["metadata"]["source_question"] = question[:200]
-            
-            self._knowledge_items_extracted += len(knowledge_items)
+            knowledge_items = self._finalize_items(knowledge_items, question)
             
             logger.info(f"Extracted {len(knowledge_items)} knowledge items from Q&A exchange")
             
@@ -318,6 +332,166 @@ class PassiveLearner:
         
         return result
     
+    def process_exchanges(
+        self,
+        exchanges: List[Tuple[str, str, Optional[str]]],
+        force_store: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several Q&A exchanges, batching the extraction LLM calls.
+        
+        Valuable exchanges are sent to the LLM up to config.batch_size at
+        a time, so a batch costs one round trip instead of one per
+        exchange. Storage and the returned results match what
+        process_exchange() produces for each exchange.
+        
+        Args:
+            exchanges: (question, answer, context) tuples; context may be None
+            force_store: Force storage even if auto_store is disabled
+        
+        Returns:
+            One process_exchange()-style result dictionary per exchange,
+            in input order
+        """
+        results = [
+            {
+                "is_valuable": False,
+                "knowledge_items": [],
+                "stored": False,
+                "trace_id": None
+            }
+            for _ in exchanges
+        ]
+        
+        valuable = [
+            i for i, (question, answer, _) in enumerate(exchanges)
+            if self.is_valuable(question, answer)
+        ]
+        
+        batch_size = max(1, self.config.batch_size)
+        for start in range(0, len(valuable), batch_size):
+            indices = valuable[start:start + batch_size]
+            batch = [exchanges[i] for i in indices]
+            try:
+                extracted = self.extract_knowledge_batch(batch)
+            except Exception as e:
+                logger.error(f"Failed to process exchange batch: {e}")
+                for i in indices:
+                    results[i]["is_valuable"] = True
+                    results[i]["error"] = str(e)
+                continue
+            
+            for i, (question, answer, context), knowledge_items in zip(indices, batch, extracted):
+                result = results[i]
+                result["is_valuable"] = True
+                result["knowledge_items"] = knowledge_items
+                
+                if not knowledge_items:
+                    continue
+                if not (self.config.auto_store_enabled or force_store):
+                    continue
+                
+                try:
+                    result["trace_id"] = self._store_knowledge(
+                        question=question,
+                        answer=answer,
+                        knowledge_items=knowledge_items,
+                        context=context
+                    )
+                    result["stored"] = True
+                    self._exchanges_stored += 1
+                except Exception as e:
+                    logger.error(f"Failed to process exchange: {e}")
+                    result["error"] = str(e)
+        
+        return results
+    
+    def extract_knowledge_batch(
+        self,
+        exchanges: List[Tuple[str, str, Optional[str]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Extract knowledge from several Q&A exchanges with one LLM call.
+        
+        A single exchange goes through extract_knowledge() so its prompt
+        (and cache key) is unchanged. If the batched response cannot be
+        matched to the exchanges, each exchange is extracted on its own.
+        
+        Args:
+            exchanges: (question, answer, context) tuples; context may be None
+        
+        Returns:
+            Knowledge items for each exchange, in input order
+        
+        Raises:
+            LLMGenerationError: If LLM call fails
+        """
+        if len(exchanges) == 1:
+            return [self.extract_knowledge(*exchanges[0])]
+        if not exchanges:
+            return []
+        
+        try:
+            messages = [
+                {
+                    "role": "system",
+                    "content": EXTRACTION_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": self._build_batch_extraction_prompt(exchanges)
+                }
+            ]
+            
+            result = self.llm_client.create(
+                messages=messages,
+                temperature=self.config.temperature,
+                max_output_tokens=4000 * len(exchanges)
+            )
+            
+            per_exchange = self._parse_batch_extraction_response(result.content, len(exchanges))
+            if per_exchange is None:
+                # Items could belong to any exchange; extract one at a time
+                return [self.extract_knowledge(*exchange) for exchange in exchanges]
+            
+            extracted = [
+                self._finalize_items(items, question)
+                for items, (question, _, _) in zip(per_exchange, exchanges)
+            ]
+            
+            logger.info(
+                f"Extracted {sum(len(items) for items in extracted)} knowledge items "
+                f"from {len(exchanges)} Q&A exchanges"
+            )
+            
+            return extracted
+            
+        except Exception as e:
+            logger.error(f"Failed to extract knowledge: {e}")
+            raise LLMGenerationError(
+                "Failed to extract knowledge from conversations",
+                context={"error": str(e), "batch_size": len(exchanges)}
+            )
+    
+    def _finalize_items(
+        self,
+        knowledge_items: List[Dict[str, Any]],
+        question: str
+    ) -> List[Dict[str, Any]]:
+        """Limit extracted items and tag them with source metadata."""
+        # Limit to max extractions
+        knowledge_items = knowledge_items[:self.config.max_extractions_per_exchange]
+        
+        # Tag with source type metadata
+        for item in knowledge_items:
+            if "metadata" not in item:
+                item["metadata"] = {}
+            item["metadata"]["source_type"] = "passive_learning"
+            item["metadata"]["source_question"] = question[:200]
+        
+        self._knowledge_items_extracted += len(knowledge_items)
+        return knowledge_items
+    
     def _store_knowledge(
         self,
         question: str,
@@ -428,52 +602,147 @@ Make each knowledge item:
 """
         return prompt
     
-    def _parse_extraction_response(self, response: str) -> List[Dict[str, Any]]:
-        """Parse JSON response from extraction LLM."""
-        try:
-            # Clean response
-            response = response.strip()
-            
-            # Remove markdown code blocks if present
-            if response.startswith("```json"):
-                response = response[7:]
-            elif response.startswith("```"):
-                response = response[3:]
-            
-            if response.endswith("```"):
-                response = response[:-3]
-            
-            response = response.strip()
-            
-            # Parse JSON
-            import json
-            knowledge_items = json.loads(response)
+    def _build_batch_extraction_prompt(
+        self,
+        exchanges: List[Tuple[str, str, Optional[str]]]
+    ) -> str:
+        """Build one prompt for knowledge extraction from several Q&As."""
+        sections = []
+        for number, (question, answer, context) in enumerate(exchanges, 1):
+            context_section = f"\n**Context:**\n{context}\n" if context else ""
+            sections.append(
+                f"### Exchange {number}\n\n**Question:**\n{question}\n\n"
+                f"**Answer:**\n{answer}\n{context_section}"
+            )
+        exchanges_text = "\n".join(sections)
+        count = len(exchanges)
+        
+        return f"""Extract reusable knowledge from each of the following {count} Q&A exchanges.
+
+{exchanges_text}
+**Instructions:**
+For each exchange, extract 1-{self.config.max_extractions_per_exchange} key pieces of reusable knowledge.
+Focus on:
+- Patterns and techniques that can be applied to similar problems
+- Best practices and recommendations
+- Common pitfalls and how to avoid them
+- Technical concepts and their explanations
+- Code patterns and implementation approaches
+
+Return a JSON array with exactly {count} elements, one per exchange in order.
+Each element is the array of knowledge items for that exchange:
+
+[
+    [
+        {{
+            "title": "<concise title (5-10 words)>",
+            "description": "<one-sentence summary>",
+            "content": "<detailed knowledge content with examples and insights>",
+            "pattern_tags": ["<tag1>", "<tag2>", ...],
+            "difficulty_level": "simple" | "moderate" | "complex" | "expert",
+            "domain_category": "<domain like 'algorithms', 'api_usage', 'debugging', etc.>"
+        }}
+    ]
+]
+
+Make each knowledge item:
+- Specific and actionable
+- Reusable for similar future problems
+- Well-structured with clear explanations
+- Tagged appropriately for retrieval
+"""
+    
+    @staticmethod
+    def _load_json_response(response: str) -> Any:
+        """Strip markdown code fences and parse an LLM JSON response."""
+        # Clean response
+        response = response.strip()
+        
+        # Remove markdown code blocks if present
+        if response.startswith("```json"):
+            response = response[7:]
+        elif response.startswith("```"):
+            response = response[3:]
+        
+        if response.endswith("```"):
+            response = response[:-3]
+        
+        response = response.strip()
+        
+        # Parse JSON (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+        if ORJSON_AVAILABLE:
+            return orjson.loads(response)
+        return json.loads(response)
+    
+    @staticmethod
+    def _validate_items(knowledge_items: Any) -> List[Dict[str, Any]]:
+        """Keep well-formed knowledge items, normalizing pattern_tags."""
+        # Ensure it's a list
+        if not isinstance(knowledge_items, list):
+            logger.warning("Extraction response is not a list, wrapping")
+            knowledge_items = [knowledge_items]
+        
+        # Validate and clean each item
+        validated_items = []
+        for item in knowledge_items:
+            if not isinstance(item, dict):
+                continue
             
-            # Ensure it's a list
-            if not isinstance(knowledge_items, list):
-                logger.warning("Extraction response is not a list, wrapping")
-                knowledge_items = [knowledge_items]
+            # Ensure required fields
+            if "title" not in item or "description" not in item or "content" not in item:
+                logger.warning("Knowledge item missing required fields, skipping")
+                continue
             
-            # Validate and clean each item
-            validated_items = []
-            for item in knowledge_items:
-                if not isinstance(item, dict):
-                    continue
-                
-                # Ensure required fields
-                if "title" not in item or "description" not in item or "content" not in item:
-                    logger.warning("Knowledge item missing required fields, skipping")
-                    continue
-                
-                # Ensure pattern_tags is a list
-                if "pattern_tags" not in item:
-                    item["pattern_tags"] = []
-                elif not isinstance(item["pattern_tags"], list):
-                    item["pattern_tags"] = []
-                
-                validated_items.append(item)
+            # Ensure pattern_tags is a list
+            if "pattern_tags" not in item:
+                item["pattern_tags"] = []
+            elif not isinstance(item["pattern_tags"], list):
+                item["pattern_tags"] = []
             
-            return validated_items
+            validated_items.append(item)
+        
+        return validated_items
+    
+    def _parse_batch_extraction_response(
+        self,
+        response: str,
+        count: int
+    ) -> Optional[List[List[Dict[str, Any]]]]:
+        """
+        Parse a batched extraction response into per-exchange item lists.
+        
+        Returns None if the response is not a list with one element per
+        exchange, since its elements cannot then be attributed reliably.
+        
+        Raises:
+            JSONParseError: If the response is not valid JSON
+        """
+        try:
+            parsed = self._load_json_response(response)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse batch extraction response as JSON: {e}")
+            raise JSONParseError(
+                "Failed to parse knowledge extraction response",
+                raw_content=response[:200],
+                context={"error": str(e)}
+            )
+        
+        if not isinstance(parsed, list):
+            logger.warning("Batch extraction response is not a list, extracting individually")
+            return None
+        if len(parsed) != count:
+            logger.warning(
+                f"Batch extraction returned {len(parsed)} results for {count} exchanges, "
+                "extracting individually"
+            )
+            return None
+        
+        return [self._validate_items(items) for items in parsed]
+    
+    def _parse_extraction_response(self, response: str) -> List[Dict[str, Any]]:
+        """Parse JSON response from extraction LLM."""
+        try:
+            return self._validate_items(self._load_json_response(response))
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse extraction response as JSON: {e}")
@@ -4,6 +4,7 @@ Performance optimization utilities for ReasoningBank MCP System
 This module provides:
 - Batch embedding generation for multiple memories
 - In-memory caching for frequently accessed memories
+- Semantic caching of solved tasks by embedding similarity
 - Prompt compression for token optimization
 - Connection pooling for API clients
 
@@ -12,16 +13,29 @@ Requirements addressed: 1.2, 11.3, 14.1, 14.2
 
 import logging
 import hashlib
+import threading
 import time
 from typing import List, Dict, Any, Optional, Tuple
 from collections import OrderedDict
 from dataclasses import dataclass
 import re
 
+import numpy as np
+
 
 logger = logging.getLogger(__name__)
 
 
+# Patterns used by PromptCompressor, compiled once at import
+# Only runs that actually change are matched: a single space or a double
+# newline would be replaced by itself
+_MULTI_SPACE_RE = re.compile(r'  +')
+_MULTI_NEWLINE_RE = re.compile(r'\n\n\n+')
+_CODE_BLOCK_RE = re.compile(r'```[\w]*\n(.*?)```', re.DOTALL)
+_HASH_COMMENT_RE = re.compile(r'#.*$', re.MULTILINE)
+_SLASH_COMMENT_RE = re.compile(r'//.*$', re.MULTILINE)
+
+
 # ============================================================================
 # Batch Embedding Generator
 # ============================================================================
@@ -228,6 +242,151 @@ class MemoryCache:
         }
 
 
+# ============================================================================
+# Semantic Cache
+# ============================================================================
+
+class SemanticCache:
+    """
+    Cache of results keyed by embedding similarity
+    
+    Lookups return the stored value whose key embedding has the highest
+    cosine similarity to the query, provided it reaches the threshold, so
+    paraphrased repeats of a request hit the cache.
+    
+    Features:
+    - Exact cosine search as one matrix-vector product over a preallocated
+      array (fast at the few-thousand-entry sizes this cache holds)
+    - Scopes: entries only match queries with an equal scope value
+    - FIFO eviction once max_size is reached
+    - Hit/miss statistics
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.87,
+        max_size: int = 1000
+    ):
+        """
+        Initialize semantic cache
+        
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_size: Maximum number of cached entries
+        """
+        self.threshold = threshold
+        self.max_size = max_size
+        
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None  # (max_size, dim), unit rows
+        self._values: List[Any] = []
+        self._scopes: List[Any] = []
+        self._next_slot = 0
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        
+        logger.info(
+            f"SemanticCache initialized: threshold={threshold}, max_size={max_size}"
+        )
+    
+    @staticmethod
+    def _normalize(embedding: Any) -> Optional[np.ndarray]:
+        """Convert an embedding to a unit float32 vector (None if degenerate)"""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        if vector.size == 0 or norm == 0.0:
+            return None
+        return vector / norm
+    
+    def search(self, embedding: Any, scope: Any = None) -> Optional[Tuple[Any, float]]:
+        """
+        Find the most similar cached value
+        
+        Args:
+            embedding: Query embedding
+            scope: Only entries stored with an equal scope can match
+        
+        Returns:
+            Tuple of (value, similarity) on a hit, None otherwise
+        """
+        query = self._normalize(embedding)
+        
+        with self._lock:
+            if query is None or self._vectors is None or query.shape[0] != self._vectors.shape[1]:
+                self.misses += 1
+                return None
+            
+            similarities = self._vectors[:len(self._values)] @ query
+            for index in np.argsort(similarities)[::-1]:
+                similarity = float(similarities[index])
+                if similarity < self.threshold:
+                    break
+                if self._scopes[index] == scope:
+                    self.hits += 1
+                    return self._values[index], similarity
+            
+            self.misses += 1
+            return None
+    
+    def put(self, embedding: Any, value: Any, scope: Any = None):
+        """
+        Add a value to the cache
+        
+        Args:
+            embedding: Key embedding
+            value: Value to cache
+            scope: Scope the entry belongs to
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        
+        with self._lock:
+            if self._vectors is None or vector.shape[0] != self._vectors.shape[1]:
+                # First entry (or embedding model changed): start afresh
+                self._vectors = np.zeros((self.max_size, vector.shape[0]), dtype=np.float32)
+                self._values = []
+                self._scopes = []
+                self._next_slot = 0
+            
+            slot = self._next_slot
+            self._vectors[slot] = vector
+            if slot < len(self._values):
+                # Full: overwrite the oldest entry
+                self._values[slot] = value
+                self._scopes[slot] = scope
+            else:
+                self._values.append(value)
+                self._scopes.append(scope)
+            self._next_slot = (slot + 1) % self.max_size
+    
+    def clear(self):
+        """Clear all cached entries"""
+        with self._lock:
+            self._vectors = None
+            self._values = []
+            self._scopes = []
+            self._next_slot = 0
+        logger.info("Semantic cache cleared")
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        total_requests = self.hits + self.misses
+        hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0.0
+        
+        return {
+            "cache_size": len(self._values),
+            "max_size": self.max_size,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(hit_rate, 2),
+            "total_requests": total_requests
+        }
+
+
 # ============================================================================
 # Prompt Compressor
 # ============================================================================
@@ -313,10 +472,10 @@ class PromptCompressor:
     def _remove_excessive_whitespace(self, text: str) -> str:
         """Remove excessive whitespace while preserving structure"""
         # Replace multiple spaces with single space
-        text = re.sub(r' +', ' ', text)
+        text = _MULTI_SPACE_RE.sub(' ', text)
         
         # Replace multiple newlines with double newline
-        text = re.sub(r'\n\n+', '\n\n', text)
+        text = _MULTI_NEWLINE_RE.sub('\n\n', text)
         
         # Remove trailing whitespace from lines
         lines = [line.rstrip() for line in text.split('\n')]
@@ -327,14 +486,12 @@ class PromptCompressor:
     def _compress_code_blocks(self, text: str) -> str:
         """Compress code blocks by removing comments and extra whitespace"""
         # Find code blocks (between ``` markers)
-        code_block_pattern = r'```[\w]*\n(.*?)```'
-        
         def compress_code(match):
             code = match.group(1)
             
             # Remove single-line comments
-            code = re.sub(r'#.*$', '', code, flags=re.MULTILINE)
-            code = re.sub(r'//.*$', '', code, flags=re.MULTILINE)
+            code = _HASH_COMMENT_RE.sub('', code)
+            code = _SLASH_COMMENT_RE.sub('', code)
             
             # Remove empty lines
             lines = [line for line in code.split('\n') if line.strip()]
@@ -342,7 +499,7 @@ class PromptCompressor:
             
             return f"```\n{code}\n```"
         
-        text = re.sub(code_block_pattern, compress_code, text, flags=re.DOTALL)
+        text = _CODE_BLOCK_RE.sub(compress_code, text)
         
         return text
     
@@ -16,8 +16,9 @@ import json
 import logging
 import math
 import uuid
+from functools import cached_property
 from datetime import datetime, timezone
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, FrozenSet
 from dataclasses import dataclass, asdict
 
 from schemas import (
@@ -71,6 +72,21 @@ class MemoryItem:
     trace_outcome: Optional[str] = None
     trace_timestamp: Optional[str] = None
     
+    @property
+    def tags_lc(self) -> FrozenSet[str]:
+        """
+        Lowercased pattern tags, computed once and cached on the instance.
+        
+        The cache is keyed on the identity of ``pattern_tags``, so assigning
+        a new list refreshes it; in-place mutation of the list does not.
+        """
+        cached = self.__dict__.get("_tags_lc")
+        if cached is not None and cached[0] is self.pattern_tags:
+            return cached[1]
+        tags = frozenset(tag.lower() for tag in self.pattern_tags or ())
+        self.__dict__["_tags_lc"] = (self.pattern_tags, tags)
+        return tags
+    
     def to_schema(self) -> MemoryItemSchema:
         """Convert to Pydantic schema for validation"""
         data = {
@@ -136,6 +152,16 @@ class MemoryItem:
             parts.append(f"**Difficulty:** {self.difficulty_level}")
         
         return "\n".join(parts)
+    
+    @cached_property
+    def formatted_prompt(self) -> str:
+        """
+        format_for_prompt() output, computed once per instance
+        
+        Retrieved memories are not modified after retrieval, so the same
+        text is reused across iterations and MaTTS candidates.
+        """
+        return self.format_for_prompt()
 
 
 # ============================================================================
@@ -305,7 +331,8 @@ class ReasoningBank:
         query: str,
         n_results: Optional[int] = None,
         include_errors: bool = True,
-        domain_filter: Optional[str] = None
+        domain_filter: Optional[str] = None,
+        errors_only: bool = False
     ) -> List[MemoryItem]:
         """
         Retrieve relevant memories with semantic search and composite scoring
@@ -321,6 +348,8 @@ class ReasoningBank:
             n_results: Number of results (defaults to self.retrieval_k)
             include_errors: Include memories with error context
             domain_filter: Optional domain category filter
+            errors_only: Only retrieve memories with error context; the
+                filter is applied by the storage backend
         
         Returns:
             List of MemoryItem objects ranked by composite score
@@ -343,7 +372,8 @@ class ReasoningBank:
                 n_results=n_results * 2,  # Get more for re-ranking
                 include_errors=include_errors,
                 domain_filter=domain_filter,
-                workspace_id=workspace_id
+                workspace_id=workspace_id,
+                errors_only=errors_only
             )
             
             if not memory_schemas:
@@ -32,7 +32,7 @@ from mcp import types
 # ReasoningBank components
 from config import get_config
 from reasoning_bank_core import ReasoningBank
-from iterative_agent import IterativeReasoningAgent
+from iterative_agent import IterativeReasoningAgent, serialize_trajectory
 from cached_llm_client import CachedLLMClient
 from responses_alpha_client import ResponsesAPIClient
 from passive_learner import PassiveLearner
@@ -198,7 +198,9 @@ async def lifespan(app: Server):
             evaluation_tokens=config.token_budget.evaluation_tokens,
             max_prompt_tokens=config.token_budget.max_prompt_tokens,
             truncation_threshold=config.token_budget.truncation_threshold,
-            truncation_head_ratio=config.token_budget.truncation_head_ratio
+            truncation_head_ratio=config.token_budget.truncation_head_ratio,
+            enable_semantic_cache=config.enable_semantic_cache,
+            evaluator_model=config.evaluator_model
         )
         logger.info("✅ Iterative agent initialized")
         
@@ -355,6 +357,8 @@ async def solve_coding_task(
                    f"iterations={result.iterations}, "
                    f"early_termination={result.early_termination}")
         
+        trajectory = serialize_trajectory(result.trajectory)
+        
         # Judge solution and extract learnings
         judgment = reasoning_bank.judge_solution(
             task=task,
@@ -377,7 +381,7 @@ async def solve_coding_task(
                 # Store trace with learnings
                 trace_id = reasoning_bank.store_trace(
                     task=task,
-                    trajectory=result.trajectory,
+                    trajectory=trajectory,
                     outcome=outcome,
                     memory_items=judgment.get("learnings", []),
                     metadata={
@@ -401,7 +405,7 @@ async def solve_coding_task(
             "success": result.score >= config.success_threshold,
             "solution": result.solution,
             "score": result.score,
-            "trajectory": result.trajectory,
+            "trajectory": trajectory,
             "iterations": result.iterations,
             "memories_used": len(memories),
             "early_termination": result.early_termination,
@@ -958,7 +962,7 @@ async def backup_memories(
     
     Args:
         action: Action to perform - "create", "restore", or "validate"
-        backup_path: Path to backup file (.tar.gz)
+        backup_path: Path to backup file (.tar.gz, or .tar.zst with zstandard)
         workspace_id: Filter by workspace (None = all workspaces)
         incremental: For "create" - only backup data since last backup
         overwrite: For "restore" - overwrite existing memories
@@ -976,7 +980,7 @@ async def backup_memories(
         - backup_size_mb: Size in megabytes
         - trace_count: Number of traces backed up
         - memory_count: Number of memories backed up
-        - checksum: SHA256 integrity checksum
+        - checksum: Integrity checksum (see checksum_algorithm)
         
         For "restore":
         - restored_count: Number of memories restored
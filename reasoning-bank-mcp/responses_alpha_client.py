@@ -9,8 +9,18 @@ reasoning tokens separately from output tokens.
 
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional, Literal
+import asyncio
 import requests
 import os
+import threading
+
+# Async HTTP client for concurrent requests on a single event loop
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
 from exceptions import LLMGenerationError, APIKeyError
 from performance_optimizer import APIConnectionPool
 
@@ -32,6 +42,8 @@ class ResponsesAPIResult:
         total_tokens: Total tokens used (reasoning + output + input)
         model: The model used for generation
         finish_reason: Why the generation stopped (e.g., "stop", "length")
+        cached_input_tokens: Input tokens read from the provider's prompt cache
+        cache_write_tokens: Input tokens written to the provider's prompt cache
     """
     content: str
     reasoning_tokens: int
@@ -40,6 +52,8 @@ class ResponsesAPIResult:
     total_tokens: int
     model: str
     finish_reason: str
+    cached_input_tokens: int = 0
+    cache_write_tokens: int = 0
     
     def __repr__(self) -> str:
         """String representation showing token breakdown."""
@@ -48,6 +62,7 @@ class ResponsesAPIResult:
             f"reasoning_tokens={self.reasoning_tokens}, "
             f"output_tokens={self.output_tokens}, "
             f"input_tokens={self.input_tokens}, "
+            f"cached_input_tokens={self.cached_input_tokens}, "
             f"total_tokens={self.total_tokens})"
         )
 
@@ -100,6 +115,10 @@ class ResponsesAPIClient:
         # API endpoint
         self.chat_endpoint = f"{self.base_url}/chat/completions"
         
+        # httpx.AsyncClient per event loop, see _get_async_client
+        self._async_clients: Dict[asyncio.AbstractEventLoop, Any] = {}
+        self._async_clients_lock = threading.Lock()
+        
         # Initialize connection pool for better performance
         try:
             self.connection_pool = APIConnectionPool(
@@ -214,6 +233,114 @@ class ResponsesAPIClient:
         Raises:
             LLMGenerationError: If API call fails or response is invalid
         """
+        return self._request(
+            None, model, messages, temperature, max_tokens,
+            max_output_tokens, reasoning_effort, kwargs
+        )[0]
+    
+    async def acreate(
+        self,
+        model: Optional[str] = None,
+        messages: Optional[List[Dict[str, str]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_output_tokens: Optional[int] = None,
+        reasoning_effort: Optional[ReasoningEffort] = None,
+        **kwargs
+    ) -> ResponsesAPIResult:
+        """
+        Async variant of create() using httpx.AsyncClient.
+        
+        Lets callers multiplex several requests over one event loop with
+        asyncio.gather instead of a thread per request. Falls back to
+        running create() in a worker thread if httpx is not installed.
+        
+        Args:
+            Same as create()
+            
+        Returns:
+            ResponsesAPIResult with content and token tracking
+            
+        Raises:
+            LLMGenerationError: If API call fails or response is invalid
+        """
+        results = await self._arequest(
+            None, model, messages, temperature, max_tokens,
+            max_output_tokens, reasoning_effort, kwargs
+        )
+        return results[0]
+    
+    def create_n(
+        self,
+        n: int,
+        model: Optional[str] = None,
+        messages: Optional[List[Dict[str, str]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_output_tokens: Optional[int] = None,
+        reasoning_effort: Optional[ReasoningEffort] = None,
+        **kwargs
+    ) -> List[ResponsesAPIResult]:
+        """
+        Sample n completions of the same messages in a single request.
+        
+        Passes n to the chat completions API so the provider returns n
+        choices for one round trip. Token usage is reported per request and
+        is split evenly across the returned results. Providers that ignore
+        n return a single choice, so callers must handle short lists.
+        
+        Args:
+            n: Number of completions to sample
+            Remaining arguments as for create()
+            
+        Returns:
+            One ResponsesAPIResult per returned choice
+            
+        Raises:
+            LLMGenerationError: If API call fails or response is invalid
+        """
+        return self._request(
+            n, model, messages, temperature, max_tokens,
+            max_output_tokens, reasoning_effort, kwargs
+        )
+    
+    async def acreate_n(
+        self,
+        n: int,
+        model: Optional[str] = None,
+        messages: Optional[List[Dict[str, str]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_output_tokens: Optional[int] = None,
+        reasoning_effort: Optional[ReasoningEffort] = None,
+        **kwargs
+    ) -> List[ResponsesAPIResult]:
+        """
+        Async variant of create_n().
+        
+        Returns:
+            One ResponsesAPIResult per returned choice
+            
+        Raises:
+            LLMGenerationError: If API call fails or response is invalid
+        """
+        return await self._arequest(
+            n, model, messages, temperature, max_tokens,
+            max_output_tokens, reasoning_effort, kwargs
+        )
+    
+    def _request(
+        self,
+        n: Optional[int],
+        model: Optional[str],
+        messages: Optional[List[Dict[str, str]]],
+        temperature: float,
+        max_tokens: Optional[int],
+        max_output_tokens: Optional[int],
+        reasoning_effort: Optional[ReasoningEffort],
+        extra: Dict[str, Any]
+    ) -> List[ResponsesAPIResult]:
+        """Send one request with the blocking HTTP client and parse its choices."""
         # Use defaults if not provided
         model = model or self.default_model
         reasoning_effort = reasoning_effort or self.default_reasoning_effort
@@ -224,38 +351,10 @@ class ResponsesAPIClient:
                 model=model
             )
         
-        # Convert messages to Responses API format
-        # For simplicity with OpenRouter, we'll use the standard OpenAI format
-        # as OpenRouter supports both formats
-        
-        # Prepare request payload
-        payload = {
-            "model": model,
-            "messages": messages,
-            "temperature": temperature,
-        }
-        
-        # Add optional parameters - prefer max_output_tokens over max_tokens
-        if max_output_tokens:
-            payload["max_output_tokens"] = max_output_tokens
-        elif max_tokens:
-            payload["max_tokens"] = max_tokens
-        
-        # Add reasoning effort as a provider-specific parameter
-        # This maps to the extended thinking capability
-        if reasoning_effort:
-            payload["reasoning_effort"] = reasoning_effort
-        
-        # Add any additional kwargs
-        payload.update(kwargs)
-        
-        # Prepare headers
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/reasoning-bank-mcp",
-            "X-Title": "ReasoningBank MCP Server"
-        }
+        payload = self._build_payload(
+            model, messages, temperature, max_tokens,
+            max_output_tokens, reasoning_effort, extra, n
+        )
         
         try:
             # Make API request using connection pool if available
@@ -263,7 +362,7 @@ class ResponsesAPIClient:
                 response = self.connection_pool.post(
                     self.chat_endpoint,
                     json=payload,
-                    headers=headers
+                    headers=self._build_headers()
                 )
             else:
                 # Use tuple timeout format: (connect_timeout, read_timeout)
@@ -271,65 +370,11 @@ class ResponsesAPIClient:
                 response = requests.post(
                     self.chat_endpoint,
                     json=payload,
-                    headers=headers,
+                    headers=self._build_headers(),
                     timeout=(10, self.timeout)
                 )
             
-            # Check for HTTP errors
-            if response.status_code != 200:
-                error_detail = response.text
-                try:
-                    error_json = response.json()
-                    error_detail = error_json.get("error", {}).get("message", error_detail)
-                except:
-                    pass
-                
-                raise LLMGenerationError(
-                    f"API request failed: {error_detail}",
-                    model=model,
-                    status_code=response.status_code,
-                    context={"response": error_detail}
-                )
-            
-            # Parse response
-            response_data = response.json()
-            
-            # Extract content and token usage
-            if "choices" not in response_data or len(response_data["choices"]) == 0:
-                raise LLMGenerationError(
-                    "API response missing choices",
-                    model=model,
-                    context={"response": response_data}
-                )
-            
-            choice = response_data["choices"][0]
-            content = choice.get("message", {}).get("content", "")
-            finish_reason = choice.get("finish_reason", "unknown")
-            
-            # Extract token usage
-            usage = response_data.get("usage", {})
-            total_tokens = usage.get("total_tokens", 0)
-            input_tokens = usage.get("prompt_tokens", 0)
-            
-            # For models with extended thinking, reasoning tokens may be tracked separately
-            # Otherwise, we estimate based on the response structure
-            reasoning_tokens = usage.get("reasoning_tokens", 0)
-            output_tokens = usage.get("completion_tokens", 0)
-            
-            # If reasoning_tokens not provided, estimate from total
-            if reasoning_tokens == 0 and total_tokens > 0:
-                # Reasoning tokens = total - input - output (rough estimate)
-                reasoning_tokens = max(0, total_tokens - input_tokens - output_tokens)
-            
-            return ResponsesAPIResult(
-                content=content,
-                reasoning_tokens=reasoning_tokens,
-                output_tokens=output_tokens,
-                input_tokens=input_tokens,
-                total_tokens=total_tokens,
-                model=model,
-                finish_reason=finish_reason
-            )
+            return self._parse_choices(response, model)
             
         except requests.exceptions.Timeout:
             raise LLMGenerationError(
@@ -353,6 +398,239 @@ class ResponsesAPIClient:
                 context={"error": str(e), "type": type(e).__name__}
             )
     
+    async def _arequest(
+        self,
+        n: Optional[int],
+        model: Optional[str],
+        messages: Optional[List[Dict[str, str]]],
+        temperature: float,
+        max_tokens: Optional[int],
+        max_output_tokens: Optional[int],
+        reasoning_effort: Optional[ReasoningEffort],
+        extra: Dict[str, Any]
+    ) -> List[ResponsesAPIResult]:
+        """Send one request with httpx.AsyncClient and parse its choices."""
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(
+                self._request,
+                n, model, messages, temperature, max_tokens,
+                max_output_tokens, reasoning_effort, extra
+            )
+        
+        model = model or self.default_model
+        reasoning_effort = reasoning_effort or self.default_reasoning_effort
+        
+        if not messages:
+            raise LLMGenerationError(
+                "Messages list cannot be empty",
+                model=model
+            )
+        
+        payload = self._build_payload(
+            model, messages, temperature, max_tokens,
+            max_output_tokens, reasoning_effort, extra, n
+        )
+        
+        try:
+            client = await self._get_async_client()
+            response = await client.post(
+                self.chat_endpoint,
+                json=payload,
+                headers=self._build_headers()
+            )
+            
+            return self._parse_choices(response, model)
+            
+        except httpx.TimeoutException:
+            raise LLMGenerationError(
+                f"API request timed out after {self.timeout} seconds",
+                model=model,
+                context={"timeout": self.timeout}
+            )
+        except httpx.HTTPError as e:
+            raise LLMGenerationError(
+                f"API request failed: {str(e)}",
+                model=model,
+                context={"error": str(e)}
+            )
+        except Exception as e:
+            if isinstance(e, LLMGenerationError):
+                raise
+            raise LLMGenerationError(
+                f"Unexpected error during API call: {str(e)}",
+                model=model,
+                context={"error": str(e), "type": type(e).__name__}
+            )
+    
+    async def _get_async_client(self) -> "httpx.AsyncClient":
+        """
+        Return the httpx.AsyncClient of the running event loop.
+        
+        httpx clients are bound to the loop they were opened on, so one is
+        kept per loop and reused by every request on it. It is closed when
+        the loop shuts down its async generators, as asyncio.run() does on
+        exit, and dropped if the loop was closed without doing so.
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            for closed_loop in [l for l in self._async_clients if l.is_closed()]:
+                del self._async_clients[closed_loop]
+            entry = self._async_clients.get(loop)
+        if entry is not None:
+            return entry[0]
+        
+        client = httpx.AsyncClient(timeout=httpx.Timeout(self.timeout, connect=10))
+        # Runs to its first yield without suspending, so no other request
+        # on this loop can open a second client in between
+        lifetime = self._async_client_lifetime(loop, client)
+        await lifetime.__anext__()
+        with self._async_clients_lock:
+            self._async_clients[loop] = (client, lifetime)
+        return client
+    
+    async def _async_client_lifetime(self, loop: asyncio.AbstractEventLoop, client: Any):
+        """Async generator kept suspended until its loop shuts down, then closes client."""
+        try:
+            yield
+        finally:
+            with self._async_clients_lock:
+                self._async_clients.pop(loop, None)
+            await client.aclose()
+    
+    def _build_payload(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        max_output_tokens: Optional[int],
+        reasoning_effort: Optional[ReasoningEffort],
+        extra: Dict[str, Any],
+        n: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Build the request payload shared by all request methods."""
+        # Convert messages to Responses API format
+        # For simplicity with OpenRouter, we'll use the standard OpenAI format
+        # as OpenRouter supports both formats
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        
+        # Add optional parameters - prefer max_output_tokens over max_tokens
+        if max_output_tokens:
+            payload["max_output_tokens"] = max_output_tokens
+        elif max_tokens:
+            payload["max_tokens"] = max_tokens
+        
+        # Add reasoning effort as a provider-specific parameter
+        # This maps to the extended thinking capability
+        if reasoning_effort:
+            payload["reasoning_effort"] = reasoning_effort
+        
+        # Ask for several choices in one request (create_n)
+        if n is not None:
+            payload["n"] = n
+        
+        # Add any additional kwargs
+        payload.update(extra)
+        
+        return payload
+    
+    def _build_headers(self) -> Dict[str, str]:
+        """Build request headers."""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/reasoning-bank-mcp",
+            "X-Title": "ReasoningBank MCP Server"
+        }
+    
+    def _parse_choices(self, response: Any, model: str) -> List[ResponsesAPIResult]:
+        """
+        Parse an HTTP response into one ResponsesAPIResult per choice.
+        
+        Works with both requests and httpx responses, which share the
+        status_code / text / json() interface. Usage is reported for the
+        whole request, so token counts are split evenly across choices.
+        
+        Raises:
+            LLMGenerationError: If the response is an error or malformed
+        """
+        # Check for HTTP errors
+        if response.status_code != 200:
+            error_detail = response.text
+            try:
+                error_json = response.json()
+                error_detail = error_json.get("error", {}).get("message", error_detail)
+            except:
+                pass
+            
+            raise LLMGenerationError(
+                f"API request failed: {error_detail}",
+                model=model,
+                status_code=response.status_code,
+                context={"response": error_detail}
+            )
+        
+        # Parse response
+        response_data = response.json()
+        
+        # Extract content and token usage
+        choices = response_data.get("choices")
+        if not choices:
+            raise LLMGenerationError(
+                "API response missing choices",
+                model=model,
+                context={"response": response_data}
+            )
+        
+        # Extract token usage
+        usage = response_data.get("usage", {})
+        total_tokens = usage.get("total_tokens", 0)
+        input_tokens = usage.get("prompt_tokens", 0)
+        
+        # For models with extended thinking, reasoning tokens may be tracked separately
+        # Otherwise, we estimate based on the response structure
+        reasoning_tokens = usage.get("reasoning_tokens", 0)
+        output_tokens = usage.get("completion_tokens", 0)
+        
+        # If reasoning_tokens not provided, estimate from total
+        if reasoning_tokens == 0 and total_tokens > 0:
+            # Reasoning tokens = total - input - output (rough estimate)
+            reasoning_tokens = max(0, total_tokens - input_tokens - output_tokens)
+        
+        # Prompt cache usage: OpenAI-style prompt_tokens_details, or the
+        # Anthropic-style fields some providers pass through
+        prompt_details = usage.get("prompt_tokens_details") or {}
+        cached_input_tokens = (
+            prompt_details.get("cached_tokens")
+            or usage.get("cache_read_input_tokens")
+            or 0
+        )
+        cache_write_tokens = (
+            prompt_details.get("cache_write_tokens")
+            or usage.get("cache_creation_input_tokens")
+            or 0
+        )
+        
+        count = len(choices)
+        return [
+            ResponsesAPIResult(
+                content=choice.get("message", {}).get("content", ""),
+                reasoning_tokens=reasoning_tokens // count,
+                output_tokens=output_tokens // count,
+                input_tokens=input_tokens // count,
+                total_tokens=total_tokens // count,
+                model=model,
+                finish_reason=choice.get("finish_reason", "unknown"),
+                cached_input_tokens=cached_input_tokens // count,
+                cache_write_tokens=cache_write_tokens // count
+            )
+            for choice in choices
+        ]
+    
     def validate_api_key(self) -> bool:
         """
         Validate that the API key is working by making a minimal test request.
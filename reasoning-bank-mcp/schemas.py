@@ -270,6 +270,10 @@ class ReasoningBankConfig(BaseModel):
         default="google/gemini-2.5-pro",
         description="LLM model identifier"
     )
+    evaluator_model: Optional[str] = Field(
+        None,
+        description="Cheaper/faster model for solution evaluation (defaults to model)"
+    )
     reasoning_effort: ReasoningEffort = Field(
         default=ReasoningEffort.MEDIUM,
         description="Reasoning effort level for reasoning models"
@@ -399,6 +403,11 @@ class ReasoningBankConfig(BaseModel):
         description="Cache entry TTL in seconds",
         ge=60
     )
+    enable_semantic_cache: bool = Field(
+        default=False,
+        description="Reuse solutions of semantically similar solved tasks (off by default: "
+                    "near-duplicate coding tasks can differ in ways embeddings miss)"
+    )
     
     @model_validator(mode='after')
     def validate_retry_config(self):
@@ -13,7 +13,7 @@ Supported backends:
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import os
 import json
 from datetime import datetime
@@ -60,6 +60,50 @@ class StorageBackendInterface(ABC):
     consistent behavior across different backends (ChromaDB, Supabase, etc.)
     """
     
+    # (text, embedding) of the last generate_embedding call
+    _last_embedding: Optional[Tuple[str, List[float]]] = None
+    
+    def generate_embedding(self, text: str) -> List[float]:
+        """
+        Generate embedding for text, reusing the previous one for repeat text
+        
+        Callers often embed the same text twice in a row (e.g. memory
+        retrieval for a task followed by the agent's semantic cache lookup);
+        the one-entry memo saves the second encoder pass. Backends implement
+        _generate_embedding.
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Embedding vector as list of floats
+        
+        Raises:
+            EmbeddingError: If embedding generation fails
+        """
+        last = self._last_embedding
+        if last is not None and last[0] == text:
+            return last[1]
+        embedding = self._generate_embedding(text)
+        self._last_embedding = (text, embedding)
+        return embedding
+    
+    @abstractmethod
+    def _generate_embedding(self, text: str) -> List[float]:
+        """
+        Encode text with the backend's embedding model
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Embedding vector as list of floats
+        
+        Raises:
+            EmbeddingError: If embedding generation fails
+        """
+        pass
+    
     @abstractmethod
     def add_trace(
         self,
@@ -98,7 +142,8 @@ class StorageBackendInterface(ABC):
         n_results: int = 5,
         include_errors: bool = True,
         domain_filter: Optional[str] = None,
-        workspace_id: Optional[str] = None
+        workspace_id: Optional[str] = None,
+        errors_only: bool = False
     ) -> List[MemoryItemSchema]:
         """
         Query semantically similar memories
@@ -109,6 +154,7 @@ class StorageBackendInterface(ABC):
             include_errors: Include memories with error context
             domain_filter: Filter by domain category
             workspace_id: Filter by workspace
+            errors_only: Only return memories with error context
         
         Returns:
             List of memory items with similarity scores
@@ -321,6 +367,8 @@ class ChromaDBAdapter(StorageBackendInterface):
             metadatas = []
             valid_items = []
             
+            stored_at = datetime.now()
+            
             for memory_item in memory_items:
                 # Validate memory item structure
                 if not isinstance(memory_item, dict):
@@ -343,7 +391,8 @@ class ChromaDBAdapter(StorageBackendInterface):
                     "trace_id": trace_id,
                     "task": task[:500],  # Truncate for metadata
                     "outcome": outcome,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": stored_at.isoformat(),
+                    "timestamp_epoch": stored_at.timestamp(),  # Numeric for $gt/$lt filters
                     "memory_data": json.dumps(memory_item),  # Store full item
                 }
                 
@@ -400,7 +449,8 @@ class ChromaDBAdapter(StorageBackendInterface):
         n_results: int = 5,
         include_errors: bool = True,
         domain_filter: Optional[str] = None,
-        workspace_id: Optional[str] = None
+        workspace_id: Optional[str] = None,
+        errors_only: bool = False
     ) -> List[MemoryItemSchema]:
         """
         Query semantically similar memories using vector search
@@ -410,24 +460,32 @@ class ChromaDBAdapter(StorageBackendInterface):
         """
         try:
             # Generate query embedding
-            query_embedding = self._generate_embedding(query_text)
+            query_embedding = self.generate_embedding(query_text)
             
-            # Build where filter
-            where_filter = {}
+            # Build where filter; ChromaDB accepts a single condition per
+            # filter, so several are combined with $and
+            conditions = []
             if workspace_id:
-                where_filter["workspace_id"] = workspace_id
+                conditions.append({"workspace_id": workspace_id})
             
             if domain_filter:
-                where_filter["domain_category"] = domain_filter
+                conditions.append({"domain_category": domain_filter})
+            
+            if errors_only:
+                conditions.append({"has_error_context": True})
+            elif not include_errors:
+                conditions.append({"has_error_context": {"$ne": True}})
             
-            if not include_errors:
-                where_filter["has_error_context"] = {"$ne": True}
+            if len(conditions) > 1:
+                where_filter = {"$and": conditions}
+            else:
+                where_filter = conditions[0] if conditions else None
             
             # Query ChromaDB with optimized indexing
             results = self.collection.query(
                 query_embeddings=[query_embedding],
                 n_results=n_results,
-                where=where_filter if where_filter else None,
+                where=where_filter,
                 include=["metadatas", "documents", "distances"]
             )
             
@@ -243,13 +243,17 @@ COMMENT ON FUNCTION search_similar_memories IS 'Semantic similarity search for m
 
 
 -- Updated function for semantic similarity search with workspace support
+-- errors_only restricts the search to memories with error context (served
+-- by idx_memories_error)
 DROP FUNCTION IF EXISTS search_similar_memories(vector, INTEGER, TEXT);
+DROP FUNCTION IF EXISTS search_similar_memories(vector, INTEGER, TEXT, TEXT);
 
 CREATE OR REPLACE FUNCTION search_similar_memories(
     query_embedding vector(384),
     match_count INTEGER DEFAULT 5,
     domain_filter TEXT DEFAULT NULL,
-    workspace_filter TEXT DEFAULT NULL
+    workspace_filter TEXT DEFAULT NULL,
+    errors_only BOOLEAN DEFAULT FALSE
 )
 RETURNS TABLE (
     id UUID,
@@ -291,6 +295,7 @@ BEGIN
     WHERE
         (domain_filter IS NULL OR m.domain_category = domain_filter)
         AND (workspace_filter IS NULL OR m.workspace_id = workspace_filter)
+        AND (NOT errors_only OR m.error_context IS NOT NULL)
         AND m.content_embedding IS NOT NULL
     ORDER BY m.content_embedding <=> query_embedding
     LIMIT match_count;
@@ -9,6 +9,7 @@ This adapter implements the StorageBackendInterface for compatibility with Reaso
 
 import os
 import json
+import inspect
 import logging
 from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
@@ -21,6 +22,14 @@ except ImportError:
     SUPABASE_AVAILABLE = False
     logging.warning("Supabase not available. Install with: pip install supabase")
 
+# Only newer supabase releases accept a shared client via
+# ClientOptions(httpx_client=...); older ones keep their own pools
+try:
+    from supabase import ClientOptions
+    SUPABASE_HTTPX_CLIENT_OPTION = "httpx_client" in inspect.signature(ClientOptions).parameters
+except ImportError:
+    SUPABASE_HTTPX_CLIENT_OPTION = False
+
 try:
     from sentence_transformers import SentenceTransformer
     SENTENCE_TRANSFORMERS_AVAILABLE = True
@@ -28,6 +37,14 @@ except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
     logging.warning("sentence-transformers not available. Install with: pip install sentence-transformers")
 
+# orjson is an optional fast path for the JSON columns (trajectories can
+# carry every generated solution, so they are the largest payloads here)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from storage_adapter import StorageBackendInterface
 from schemas import MemoryItemSchema
 from exceptions import (
@@ -40,6 +57,51 @@ from exceptions import (
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(obj: Any) -> str:
+    """Serialize a value for a JSON text column, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _json_loads(data: str) -> Any:
+    """Deserialize a JSON text column, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _memory_text(memory_item: Dict) -> str:
+    """Text embedded for a memory item"""
+    return f"{memory_item.get('title', '')}\n{memory_item.get('description', '')}\n{memory_item.get('content', '')}"
+
+
+def _memory_row(
+    trace_id: str,
+    memory_item: Dict,
+    content_embedding: List[float],
+    workspace_id: Optional[str]
+) -> Dict[str, Any]:
+    """Build the memory_items row for a memory item"""
+    return {
+        "id": memory_item.get("id"),
+        "trace_id": trace_id,
+        "title": memory_item.get("title", ""),
+        "description": memory_item.get("description", ""),
+        "content": memory_item.get("content", ""),
+        "content_embedding": content_embedding,
+        "error_context": _json_dumps(memory_item.get("error_context")) if memory_item.get("error_context") else None,
+        "pattern_tags": memory_item.get("pattern_tags", []),
+        "difficulty_level": memory_item.get("difficulty_level"),
+        "domain_category": memory_item.get("domain_category"),
+        "parent_memory_id": memory_item.get("parent_memory_id"),
+        "evolution_stage": memory_item.get("evolution_stage", 0),
+        "workspace_id": workspace_id
+    }
+
+
 class SupabaseAdapter(StorageBackendInterface):
     """
     Supabase-based storage backend for ReasoningBank
@@ -57,7 +119,8 @@ class SupabaseAdapter(StorageBackendInterface):
         supabase_key: Optional[str] = None,
         embedding_model: str = "all-MiniLM-L6-v2",
         traces_table: str = "reasoning_traces",
-        memories_table: str = "memory_items"
+        memories_table: str = "memory_items",
+        http_client: Optional[Any] = None
     ):
         """
         Initialize Supabase storage backend
@@ -68,6 +131,10 @@ class SupabaseAdapter(StorageBackendInterface):
             embedding_model: Sentence transformer model for embeddings
             traces_table: Name of traces table
             memories_table: Name of memories table
+            http_client: Optional httpx.Client shared by the Supabase
+                sub-clients, e.g. a connection pool sized for concurrent
+                uploads. The caller owns it and must close it. Ignored,
+                with a warning, if the installed supabase cannot use it.
         
         Raises:
             ImportError: If Supabase or sentence-transformers not installed
@@ -95,9 +162,22 @@ class SupabaseAdapter(StorageBackendInterface):
                 "environment variables or pass them as parameters."
             )
         
+        if http_client is not None and not SUPABASE_HTTPX_CLIENT_OPTION:
+            logger.warning(
+                "Installed supabase does not support a shared httpx client; "
+                "using its default connection pool"
+            )
+            http_client = None
+        
         # Initialize Supabase client
         try:
-            self.client: Client = create_client(self.supabase_url, self.supabase_key)
+            if http_client is not None:
+                options = ClientOptions(httpx_client=http_client)
+                self.client: Client = create_client(
+                    self.supabase_url, self.supabase_key, options=options
+                )
+            else:
+                self.client: Client = create_client(self.supabase_url, self.supabase_key)
             logger.info("Supabase client initialized")
         except Exception as e:
             raise ConnectionError(f"Failed to connect to Supabase: {str(e)}")
@@ -135,7 +215,7 @@ class SupabaseAdapter(StorageBackendInterface):
             logger.warning(f"Schema verification failed: {str(e)}")
             logger.warning("Run the SQL schema file (supabase_schema.sql) to create required tables")
     
-    def generate_embedding(self, text: str) -> List[float]:
+    def _generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding vector for text
         
@@ -146,8 +226,7 @@ class SupabaseAdapter(StorageBackendInterface):
             Embedding vector as list of floats
         """
         try:
-            embedding = self.embedder.encode(text, convert_to_numpy=True)
-            return embedding.tolist()
+            return self.embedder.encode(text, convert_to_numpy=True).tolist()
         except Exception as e:
             raise EmbeddingError(f"Failed to generate embedding: {str(e)}")
     
@@ -188,9 +267,9 @@ class SupabaseAdapter(StorageBackendInterface):
                 "id": trace_id,
                 "task": task,
                 "task_embedding": task_embedding,
-                "trajectory": json.dumps(trajectory),
+                "trajectory": _json_dumps(trajectory),
                 "outcome": outcome,
-                "metadata": json.dumps(metadata or {}),
+                "metadata": _json_dumps(metadata or {}),
                 "timestamp": datetime.now().isoformat(),
                 "num_memories": len(memory_items),
                 "workspace_id": workspace_id
@@ -226,25 +305,10 @@ class SupabaseAdapter(StorageBackendInterface):
         """
         try:
             # Generate embedding for memory content
-            combined_text = f"{memory_item.get('title', '')}\n{memory_item.get('description', '')}\n{memory_item.get('content', '')}"
-            content_embedding = self.generate_embedding(combined_text)
+            content_embedding = self.generate_embedding(_memory_text(memory_item))
             
             # Prepare memory data
-            memory_data = {
-                "id": memory_item.get("id"),
-                "trace_id": trace_id,
-                "title": memory_item.get("title", ""),
-                "description": memory_item.get("description", ""),
-                "content": memory_item.get("content", ""),
-                "content_embedding": content_embedding,
-                "error_context": json.dumps(memory_item.get("error_context")) if memory_item.get("error_context") else None,
-                "pattern_tags": memory_item.get("pattern_tags", []),
-                "difficulty_level": memory_item.get("difficulty_level"),
-                "domain_category": memory_item.get("domain_category"),
-                "parent_memory_id": memory_item.get("parent_memory_id"),
-                "evolution_stage": memory_item.get("evolution_stage", 0),
-                "workspace_id": workspace_id
-            }
+            memory_data = _memory_row(trace_id, memory_item, content_embedding, workspace_id)
             
             result = self.client.table(self.memories_table).insert(memory_data).execute()
             return memory_item.get("id")
@@ -255,6 +319,79 @@ class SupabaseAdapter(StorageBackendInterface):
                 context={"trace_id": trace_id, "error": str(e)}
             )
     
+    def add_traces_batch(
+        self,
+        traces: List[Dict[str, Any]],
+        workspace_id: Optional[str] = None
+    ) -> List[str]:
+        """
+        Store several traces and their memory items in bulk
+        
+        All embeddings are computed in one encoder call, then the traces
+        and the memory items are each written with a single upsert keyed
+        by id. The two writes are not one transaction, so a failure can
+        leave the traces without their memories; upserting makes storing
+        the same traces again complete them instead of failing on
+        duplicate keys.
+        
+        Args:
+            traces: Trace dicts with id, task, trajectory, outcome,
+                memory_items and optional metadata / parent_trace_id
+            workspace_id: Workspace identifier for isolation
+        
+        Returns:
+            Stored trace IDs, in input order
+        
+        Raises:
+            MemoryStorageError: If storage fails
+        """
+        if not traces:
+            return []
+        
+        trace_ids = [trace["id"] for trace in traces]
+        try:
+            texts = [trace["task"] for trace in traces]
+            for trace in traces:
+                texts.extend(_memory_text(item) for item in trace["memory_items"])
+            embeddings = self.embedder.encode(texts, convert_to_numpy=True).tolist()
+            
+            timestamp = datetime.now().isoformat()
+            trace_rows = []
+            memory_rows = []
+            offset = len(traces)
+            for trace, task_embedding in zip(traces, embeddings):
+                memory_items = trace["memory_items"]
+                trace_rows.append({
+                    "id": trace["id"],
+                    "task": trace["task"],
+                    "task_embedding": task_embedding,
+                    "trajectory": _json_dumps(trace["trajectory"]),
+                    "outcome": trace["outcome"],
+                    "metadata": _json_dumps(trace.get("metadata") or {}),
+                    "parent_trace_id": trace.get("parent_trace_id"),
+                    "timestamp": timestamp,
+                    "num_memories": len(memory_items),
+                    "workspace_id": workspace_id
+                })
+                for memory_item in memory_items:
+                    memory_rows.append(
+                        _memory_row(trace["id"], memory_item, embeddings[offset], workspace_id)
+                    )
+                    offset += 1
+            
+            self.client.table(self.traces_table).upsert(trace_rows, on_conflict="id").execute()
+            if memory_rows:
+                self.client.table(self.memories_table).upsert(memory_rows, on_conflict="id").execute()
+            
+            logger.info(f"Stored {len(trace_rows)} traces with {len(memory_rows)} memory items")
+            return trace_ids
+            
+        except Exception as e:
+            raise MemoryStorageError(
+                f"Failed to store batch of {len(traces)} traces",
+                context={"error": str(e), "trace_ids": trace_ids}
+            )
+    
     def query_similar_traces(
         self,
         query_text: str,
@@ -310,7 +447,8 @@ class SupabaseAdapter(StorageBackendInterface):
         n_results: int = 5,
         include_errors: bool = True,
         domain_filter: Optional[str] = None,
-        workspace_id: Optional[str] = None
+        workspace_id: Optional[str] = None,
+        errors_only: bool = False
     ) -> List[MemoryItemSchema]:
         """
         Query similar memory items using semantic similarity
@@ -321,6 +459,7 @@ class SupabaseAdapter(StorageBackendInterface):
             include_errors: Include memories with error context
             domain_filter: Filter by domain category
             workspace_id: Optional workspace ID for filtering
+            errors_only: Only return memories with error context
             
         Returns:
             List of MemoryItemSchema objects with similarity scores
@@ -341,6 +480,10 @@ class SupabaseAdapter(StorageBackendInterface):
             if domain_filter:
                 params["domain_filter"] = domain_filter
             
+            # Only sent when set so schemas predating the parameter still work
+            if errors_only:
+                params["errors_only"] = True
+            
             # Call stored procedure for semantic search
             result = self.client.rpc(
                 "search_similar_memories",
@@ -360,6 +503,8 @@ class SupabaseAdapter(StorageBackendInterface):
                 # Filter out error memories if requested
                 if not include_errors and error_context:
                     continue
+                if errors_only and not error_context:
+                    continue
                 
                 # Create MemoryItemSchema
                 memory_data = {
@@ -414,8 +559,8 @@ class SupabaseAdapter(StorageBackendInterface):
                 return None
             
             trace = result.data[0]
-            trace["trajectory"] = json.loads(trace["trajectory"])
-            trace["metadata"] = json.loads(trace["metadata"])
+            trace["trajectory"] = _json_loads(trace["trajectory"])
+            trace["metadata"] = _json_loads(trace["metadata"])
             
             # Fetch associated memory items
             memories_result = self.client.table(self.memories_table).select("*").eq("trace_id", trace_id).execute()
@@ -9,9 +9,10 @@ This script tests core functionality:
 - Statistics tracking
 """
 
+import asyncio
 import time
 from unittest.mock import Mock, MagicMock
-from cached_llm_client import CachedLLMClient, CacheStatistics
+from cached_llm_client import CachedLLMClient, CacheStatistics, BatchingLLMClient
 from responses_alpha_client import ResponsesAPIResult
 
 
@@ -61,6 +62,37 @@ def test_cache_key_generation():
     print("✓ Cache key generation works correctly")
 
 
+def test_cache_key_memo():
+    """Test that memoized cache keys follow changes to the messages list."""
+    print("\nTesting cache key memoization...")
+    
+    mock_client = Mock()
+    mock_client.default_model = "test-model"
+    
+    cached_client = CachedLLMClient(mock_client)
+    
+    messages = [{"role": "user", "content": "test"}]
+    params = dict(
+        model="test-model",
+        temperature=0.0,
+        max_tokens=None,
+        max_output_tokens=None,
+        reasoning_effort="medium"
+    )
+    
+    key1 = cached_client._get_cache_key(messages=messages, **params)
+    assert key1 == cached_client._generate_cache_key(messages=messages, **params)
+    assert cached_client._get_cache_key(messages=messages, **params) == key1
+    
+    # Mutating the same list object must not reuse the stale key
+    messages.append({"role": "user", "content": "follow-up"})
+    key2 = cached_client._get_cache_key(messages=messages, **params)
+    assert key2 != key1, "Mutated messages should produce a new cache key"
+    assert key2 == cached_client._generate_cache_key(messages=messages, **params)
+    
+    print("✓ Cache key memoization works correctly")
+
+
 def test_cache_hit_miss():
     """Test cache hit and miss logic."""
     print("\nTesting cache hit/miss logic...")
@@ -266,6 +298,38 @@ def test_lru_eviction():
     print("✓ LRU eviction works correctly")
 
 
+def test_sharded_cache_size():
+    """Test that a sharded cache never grows past max_cache_size."""
+    print("\nTesting sharded cache size bound...")
+    
+    mock_client = Mock()
+    mock_client.default_model = "test-model"
+    mock_client.create = Mock(return_value=ResponsesAPIResult(
+        content="test response",
+        reasoning_tokens=100,
+        output_tokens=50,
+        input_tokens=20,
+        total_tokens=170,
+        model="test-model",
+        finish_reason="stop"
+    ))
+    
+    cached_client = CachedLLMClient(mock_client, max_cache_size=100)
+    assert len(cached_client._shards) > 1, "Default-sized cache should be sharded"
+    
+    for i in range(300):
+        cached_client.create(
+            model="test-model",
+            messages=[{"role": "user", "content": f"test{i}"}],
+            temperature=0.0
+        )
+    
+    size = cached_client.get_cache_size()
+    assert 0 < size <= 100, f"Cache size should be <= 100, got {size}"
+    
+    print(f"✓ Sharded cache stays bounded ({size} entries)")
+
+
 def test_statistics():
     """Test statistics tracking."""
     print("\nTesting statistics tracking...")
@@ -310,6 +374,185 @@ def test_statistics():
     print(f"✓ Statistics tracking works correctly: {stats}")
 
 
+def test_create_batch():
+    """Test that create_batch preserves order and dedupes identical requests."""
+    print("\nTesting batched requests...")
+    
+    mock_client = Mock()
+    mock_client.default_model = "test-model"
+    mock_client.create = Mock(side_effect=lambda **kwargs: ResponsesAPIResult(
+        content=kwargs["messages"][0]["content"],
+        reasoning_tokens=0,
+        output_tokens=1,
+        input_tokens=1,
+        total_tokens=2,
+        model="test-model",
+        finish_reason="stop"
+    ))
+    
+    cached_client = CachedLLMClient(mock_client)
+    
+    requests = [
+        {"messages": [{"role": "user", "content": "a"}], "temperature": 0.0},
+        {"messages": [{"role": "user", "content": "a"}], "temperature": 0.0},
+        {"messages": [{"role": "user", "content": "b"}], "temperature": 0.7},
+        {"messages": [{"role": "user", "content": "c"}], "temperature": 0.0},
+    ]
+    
+    results = cached_client.create_batch(requests)
+    
+    assert [r.content for r in results] == ["a", "a", "b", "c"], "Results should keep request order"
+    assert mock_client.create.call_count == 3, "Duplicate cacheable request should share one call"
+    
+    stats = cached_client.get_statistics()
+    assert stats.cache_hits == 1
+    assert stats.cache_misses == 2
+    assert stats.cache_bypassed == 1
+    
+    print("✓ Batched requests work correctly")
+
+
+def test_acreate():
+    """Test that acreate shares the cache with create and falls back to a thread."""
+    print("\nTesting async requests...")
+    
+    mock_client = Mock()
+    mock_client.default_model = "test-model"
+    mock_client.create = Mock(return_value=ResponsesAPIResult(
+        content="sync",
+        reasoning_tokens=0,
+        output_tokens=1,
+        input_tokens=1,
+        total_tokens=2,
+        model="test-model",
+        finish_reason="stop"
+    ))
+    
+    # Mock has no coroutine acreate, so calls run create() in a worker thread
+    cached_client = CachedLLMClient(mock_client)
+    messages = [{"role": "user", "content": "Hello"}]
+    
+    result = asyncio.run(cached_client.acreate(messages=messages, temperature=0.0))
+    assert result.content == "sync"
+    assert mock_client.create.call_count == 1
+    
+    # Sync and async calls share the same cache
+    cached_client.create(messages=messages, temperature=0.0)
+    assert mock_client.create.call_count == 1, "acreate result should be cached"
+    
+    class AsyncClient:
+        default_model = "test-model"
+        
+        def __init__(self):
+            self.calls = 0
+        
+        def create(self, **kwargs):
+            raise AssertionError("create() should not be called")
+        
+        async def acreate(self, **kwargs):
+            self.calls += 1
+            return ResponsesAPIResult(
+                content="async",
+                reasoning_tokens=0,
+                output_tokens=1,
+                input_tokens=1,
+                total_tokens=2,
+                model="test-model",
+                finish_reason="stop"
+            )
+    
+    async_client = AsyncClient()
+    cached_client = CachedLLMClient(async_client)
+    
+    async def run():
+        return await asyncio.gather(*[
+            cached_client.acreate(messages=messages, temperature=0.7)
+            for _ in range(3)
+        ])
+    
+    results = asyncio.run(run())
+    assert [r.content for r in results] == ["async"] * 3
+    assert async_client.calls == 3
+    assert cached_client.get_statistics().cache_bypassed == 3
+    
+    print("✓ Async requests work correctly")
+
+
+def test_batching_client():
+    """Test that concurrent requests are coalesced into shared upstream calls."""
+    print("\nTesting request batching...")
+    
+    class AsyncClient:
+        default_model = "test-model"
+        
+        def __init__(self):
+            self.calls = []
+        
+        def create(self, **kwargs):
+            raise AssertionError("create() should not be called")
+        
+        async def acreate(self, **kwargs):
+            self.calls.append(("acreate", kwargs["messages"][0]["content"]))
+            return self._result(kwargs["messages"][0]["content"])
+        
+        async def acreate_n(self, n, **kwargs):
+            self.calls.append(("acreate_n", n))
+            return [self._result(f"sample{i}") for i in range(n)]
+        
+        @staticmethod
+        def _result(content):
+            return ResponsesAPIResult(
+                content=content,
+                reasoning_tokens=0,
+                output_tokens=1,
+                input_tokens=1,
+                total_tokens=2,
+                model="test-model",
+                finish_reason="stop"
+            )
+    
+    upstream = AsyncClient()
+    batching_client = BatchingLLMClient(
+        CachedLLMClient(upstream, enable_cache=False), max_batch_delay=0.05
+    )
+    
+    def request(content, temperature):
+        return {"messages": [{"role": "user", "content": content}], "temperature": temperature}
+    
+    async def run():
+        return await asyncio.gather(
+            batching_client.acreate(**request("a", 0.0)),
+            batching_client.acreate(**request("a", 0.0)),
+            batching_client.acreate(**request("b", 0.7)),
+            batching_client.acreate(**request("b", 0.7)),
+            batching_client.acreate(**request("c", 0.7)),
+        )
+    
+    try:
+        results = asyncio.run(run())
+        
+        assert [r.content for r in results[:2]] == ["a", "a"]
+        assert sorted(r.content for r in results[2:4]) == ["sample0", "sample1"]
+        assert results[4].content == "c"
+        assert sorted(upstream.calls, key=str) == [
+            ("acreate", "a"), ("acreate", "c"), ("acreate_n", 2)
+        ], f"Unexpected upstream calls: {upstream.calls}"
+        
+        # Blocking callers share the same queue
+        assert batching_client.create(**request("d", 0.0)).content == "d"
+        
+        stats = batching_client.get_batching_statistics()
+        assert stats["requests"] == 6
+        assert stats["upstream_calls"] == 4
+        
+        # Everything else is delegated to the wrapped client
+        assert batching_client.get_cache_size() == 0
+    finally:
+        batching_client.close()
+    
+    print("✓ Request batching works correctly")
+
+
 def run_all_tests():
     """Run all tests."""
     print("=" * 60)
@@ -318,11 +561,16 @@ def run_all_tests():
     
     try:
         test_cache_key_generation()
+        test_cache_key_memo()
         test_cache_hit_miss()
         test_non_deterministic_bypass()
         test_ttl_expiration()
         test_lru_eviction()
+        test_sharded_cache_size()
         test_statistics()
+        test_create_batch()
+        test_acreate()
+        test_batching_client()
         
         print("\n" + "=" * 60)
         print("✓ All tests passed!")
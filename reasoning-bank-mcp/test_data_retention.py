@@ -7,8 +7,10 @@ This test verifies:
 - Backup and restore operations
 """
 
+import io
 import os
 import sys
+import tarfile
 import tempfile
 import uuid
 from datetime import datetime, timedelta
@@ -18,6 +20,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from storage_adapter import create_storage_backend
 from workspace_manager import WorkspaceManager
+import backup_restore
 from backup_restore import BackupManager
 
 
@@ -267,6 +270,122 @@ def test_backup_restore():
             print("⚠️  Restore may not have worked as expected\n")
 
 
+def test_backup_all_workspaces():
+    """Test per-workspace backups with a manifest"""
+    print("=== Testing Backup of All Workspaces ===\n")
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Create storage adapter
+        storage = create_storage_backend(
+            backend_type="chromadb",
+            persist_directory=os.path.join(tmpdir, "chroma_data")
+        )
+        
+        backup_dir = os.path.join(tmpdir, "backups")
+        backup_manager = BackupManager(storage, backup_directory=backup_dir)
+        
+        # Add test data to two workspaces
+        print("1. Adding test data...")
+        workspaces = ["workspace_a", "workspace_b"]
+        for workspace_id in workspaces:
+            storage.add_trace(
+                trace_id=str(uuid.uuid4()),
+                task=f"Task for {workspace_id}",
+                trajectory=[],
+                outcome="success",
+                memory_items=[{
+                    "id": str(uuid.uuid4()),
+                    "title": f"Memory for {workspace_id}",
+                    "description": "Per-workspace backup",
+                    "content": "This should be backed up"
+                }],
+                workspace_id=workspace_id
+            )
+        print("✅ Added test data\n")
+        
+        # Back up sequentially (process pool startup dominates tiny datasets)
+        print("2. Backing up all workspaces...")
+        output_dir = os.path.join(backup_dir, "all")
+        manifest = backup_manager.backup_all_workspaces(
+            output_directory=output_dir,
+            parallel=False
+        )
+        
+        assert sorted(manifest["workspaces"]) == workspaces
+        assert not manifest["errors"]
+        assert os.path.exists(os.path.join(output_dir, "manifest.json"))
+        
+        for workspace_id in workspaces:
+            result = manifest["workspaces"][workspace_id]
+            assert result["memory_count"] == 1
+            assert backup_manager.validate_backup(result["backup_path"])["valid"]
+        
+        print(f"✅ Backed up {len(manifest['workspaces'])} workspaces\n")
+
+
+def test_restore_rejects_invalid_item():
+    """Test that a restore validates every item before writing any batch"""
+    print("=== Testing Restore of a Corrupt Backup ===\n")
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = create_storage_backend(
+            backend_type="chromadb",
+            persist_directory=os.path.join(tmpdir, "chroma_data")
+        )
+        backup_dir = os.path.join(tmpdir, "backups")
+        backup_manager = BackupManager(storage, backup_directory=backup_dir)
+        
+        # One more memory than validate_backup() samples
+        count = backup_restore.VALIDATION_SAMPLE_SIZE + 1
+        storage.add_trace(
+            trace_id=str(uuid.uuid4()),
+            task="Corrupt backup task",
+            trajectory=[],
+            outcome="success",
+            memory_items=[{
+                "id": str(uuid.uuid4()),
+                "title": f"Memory {i}",
+                "description": "Restored in batches",
+                "content": "This should not be partially restored"
+            } for i in range(count)],
+            workspace_id="corrupt_source"
+        )
+        backup_path = os.path.join(backup_dir, "good.tar.gz")
+        backup_manager.backup_chromadb(output_path=backup_path, workspace_id="corrupt_source")
+        
+        # Replace the last memory with an item lacking id and metadata
+        with tarfile.open(backup_path, "r:gz") as tar:
+            members = {m.name: tar.extractfile(m).read() for m in tar}
+        lines = members["memories.ndjson"].splitlines()
+        lines[-1] = b'{"document": "no id or metadata"}'
+        members["memories.ndjson"] = b"\n".join(lines) + b"\n"
+        corrupt_path = os.path.join(backup_dir, "corrupt.tar.gz")
+        with tarfile.open(corrupt_path, "w:gz") as tar:
+            for name, content in members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+        
+        # Small batches so a late failure would leave earlier batches written
+        original_batch_size = backup_restore.RESTORE_BATCH_SIZE
+        backup_restore.RESTORE_BATCH_SIZE = 4
+        try:
+            backup_manager.restore_chromadb(
+                backup_path=corrupt_path,
+                target_workspace_id="corrupt_target"
+            )
+            raise AssertionError("Restore of a corrupt backup should fail")
+        except backup_restore.MemoryStorageError as e:
+            assert f"Memory item {count - 1} missing 'id' field" in e.context["error"], e.context
+        finally:
+            backup_restore.RESTORE_BATCH_SIZE = original_batch_size
+        
+        stats = storage.get_statistics(workspace_id="corrupt_target")
+        assert stats["total_memories"] == 0, "Nothing should be restored"
+        
+        print("✅ Corrupt backup rejected before any batch was written\n")
+
+
 def main():
     """Run all tests"""
     print("=" * 60)
@@ -278,6 +397,8 @@ def main():
         test_trace_cleanup()
         test_workspace_deletion()
         test_backup_restore()
+        test_backup_all_workspaces()
+        test_restore_rejects_invalid_item()
         
         print("=" * 60)
         print("All tests completed!")
@@ -8,6 +8,7 @@ This script validates:
 - Loop detection mechanism
 - Token estimation and truncation
 - Trajectory tracking
+- Semantic cache reuse
 """
 
 import os
@@ -18,7 +19,10 @@ if not os.getenv("OPENROUTER_API_KEY"):
     print("⚠️  OPENROUTER_API_KEY not set, using placeholder")
     os.environ["OPENROUTER_API_KEY"] = "test-key"
 
-from iterative_agent import IterativeReasoningAgent, SolutionResult, IterationResult
+from iterative_agent import (
+    IterativeReasoningAgent, SolutionResult, IterationResult,
+    TrajectoryEntry, serialize_trajectory, TIKTOKEN_AVAILABLE
+)
 from reasoning_bank_core import ReasoningBank, MemoryItem
 from storage_adapter import ChromaDBAdapter
 from cached_llm_client import CachedLLMClient
@@ -89,9 +93,13 @@ def test_token_estimation():
         print(f"   Short text ({len(short_text)} chars): ~{short_tokens} tokens")
         print(f"   Long text ({len(long_text)} chars): ~{long_tokens} tokens")
         
-        # Verify estimation is reasonable (4 chars/token heuristic)
-        assert short_tokens == len(short_text) // 4
-        assert long_tokens == len(long_text) // 4
+        # Verify estimation is reasonable (4 chars/token heuristic without tiktoken)
+        if TIKTOKEN_AVAILABLE:
+            assert 0 < short_tokens <= len(short_text)
+            assert 0 < long_tokens <= len(long_text)
+        else:
+            assert short_tokens == len(short_text) // 4
+            assert long_tokens == len(long_text) // 4
         
         return True
         
@@ -205,9 +213,8 @@ def test_prompt_building():
         
         # Test generation prompt
         task = "Write a function to calculate fibonacci numbers"
-        memories = []
         
-        gen_prompt = agent._build_generation_prompt(task, memories)
+        gen_prompt = agent._build_generation_prompt(task)
         
         print("\n✅ Generation prompt built:")
         print(f"   Length: {len(gen_prompt)} chars")
@@ -222,7 +229,7 @@ def test_prompt_building():
         feedback = "Missing recursive case"
         
         ref_prompt = agent._build_refinement_prompt(
-            task, previous_solution, feedback, memories
+            task, previous_solution, feedback
         )
         
         print("\n✅ Refinement prompt built:")
@@ -236,6 +243,27 @@ def test_prompt_building():
         print("   ✓ Contains previous solution")
         print("   ✓ Contains feedback")
         
+        # Test static system prefix
+        prefix = agent._build_static_prefix([])
+        assert prefix == agent._build_static_prefix([]), "Prefix must be stable"
+        assert task not in prefix
+        messages = agent._build_initial_messages(task, [])
+        assert messages[0]["content"] == [{
+            "type": "text",
+            "text": prefix,
+            "cache_control": {"type": "ephemeral"}
+        }], "System prefix should carry a cache_control breakpoint"
+        assert messages[1]["content"] == gen_prompt
+        assert gen_prompt.index("# Instructions") < gen_prompt.index(task)
+        assert ref_prompt.index(task) < ref_prompt.index(previous_solution)
+        
+        agent.prompt_cache_control = False
+        messages = agent._build_initial_messages(task, [])
+        assert messages[0] == {"role": "system", "content": prefix}
+        print("\n✅ Static system prefix built")
+        print("   ✓ Task kept out of the cacheable prefix")
+        print("   ✓ Static instructions ahead of dynamic content")
+        
         return True
         
     except Exception as e:
@@ -313,8 +341,8 @@ def test_state_reset():
         agent = IterativeReasoningAgent(llm_client=llm_client, reasoning_bank=bank)
         
         # Add some state
-        agent._trajectory_hashes.add("hash1")
-        agent._trajectory_hashes.add("hash2")
+        agent._remember_trajectory_hash(1)
+        agent._remember_trajectory_hash(2)
         agent._total_tokens_used = 1000
         
         print(f"\n   Before reset:")
@@ -329,8 +357,18 @@ def test_state_reset():
         print(f"   Total tokens: {agent._total_tokens_used}")
         
         assert len(agent._trajectory_hashes) == 0
+        assert len(agent._trajectory_order) == 0
         assert agent._total_tokens_used == 0
         
+        # Loop detection remembers only the newest hashes
+        limit = agent._trajectory_order.maxlen
+        for h in range(limit + 5):
+            agent._remember_trajectory_hash(h)
+        assert len(agent._trajectory_hashes) == limit
+        assert 0 not in agent._trajectory_hashes
+        assert limit + 4 in agent._trajectory_hashes
+        print(f"   Hash history bounded at {limit}")
+        
         return True
         
     except Exception as e:
@@ -340,6 +378,177 @@ def test_state_reset():
         return False
 
 
+def test_trajectory_serialization():
+    """Test 8: Trajectory entries serialize to step dicts"""
+    print("\n" + "="*70)
+    print("TEST 8: Trajectory Serialization")
+    print("="*70)
+    
+    try:
+        trajectory = [
+            TrajectoryEntry(
+                iteration=1,
+                action="think",
+                thought="Generated solution attempt 1",
+                output="def f(): pass",
+                output_hash=0xabc
+            ),
+            TrajectoryEntry(
+                iteration=0,
+                action="matts_start",
+                output="Starting MaTTS with k=3, mode=parallel",
+                extra={"k": 3, "mode": "parallel"}
+            ),
+            TrajectoryEntry(
+                iteration=0,
+                action="matts_candidate",
+                output="x" * 300,
+                output_limit=200
+            ),
+            {"iteration": 2, "action": "refine", "output": "legacy dict step"}
+        ]
+        
+        steps = serialize_trajectory(trajectory)
+        
+        assert steps[0] == {
+            "iteration": 1,
+            "action": "think",
+            "thought": "Generated solution attempt 1",
+            "output": "def f(): pass",
+            "output_hash": "0000000000000abc"
+        }, f"Unexpected think step: {steps[0]}"
+        assert steps[1]["k"] == 3 and steps[1]["mode"] == "parallel"
+        assert "score" not in steps[1], "Unset fields should be omitted"
+        assert steps[2]["output"] == "x" * 200 + "...", "Long output should be truncated"
+        assert len(trajectory[2].output) == 300, "Entry should keep the full output"
+        assert steps[3] is trajectory[3], "Plain dict steps should pass through"
+        assert not hasattr(trajectory[0], "__dict__"), "Entries should use __slots__"
+        
+        print("\n✅ Trajectory serialization working:")
+        print("   ✓ Unset optional fields omitted")
+        print("   ✓ Output hash rendered as hex")
+        print("   ✓ Extra fields merged into the step")
+        print("   ✓ Candidate output truncated on serialization")
+        
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Trajectory serialization test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_evaluation_memoization():
+    """Test 9: Identical solutions are evaluated once per run"""
+    print("\n" + "="*70)
+    print("TEST 9: Evaluation Memoization")
+    print("="*70)
+    
+    try:
+        from unittest.mock import Mock
+        
+        response = Mock(content="Score: 0.7\nFeedback: Looks good", total_tokens=9)
+        llm_client = Mock()
+        llm_client.create = Mock(return_value=response)
+        agent = IterativeReasoningAgent(llm_client=llm_client, reasoning_bank=Mock())
+        
+        first = agent._evaluate_step("Implement binary search", "def f(): pass", 1)
+        second = agent._evaluate_step("Implement binary search", "def f(): pass", 2)
+        
+        assert first == (0.7, "Looks good", 9)
+        assert second == (0.7, "Looks good", 0), "Cache hit should cost no tokens"
+        assert llm_client.create.call_count == 1
+        
+        agent._evaluate_step("Implement merge sort", "def f(): pass", 1)
+        assert llm_client.create.call_count == 2, "Cache should be keyed by task too"
+        
+        agent.reset_state()
+        agent._evaluate_step("Implement binary search", "def f(): pass", 1)
+        assert llm_client.create.call_count == 3, "reset_state should clear the cache"
+        
+        print("\n✅ Evaluation memoization working:")
+        print("   ✓ Repeated solution reuses score and feedback")
+        print("   ✓ Different task is evaluated separately")
+        print("   ✓ Cache cleared on reset")
+        
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Evaluation memoization test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_semantic_cache():
+    """Test 10: Solved tasks are reused for similar tasks with the same memories"""
+    print("\n" + "="*70)
+    print("TEST 10: Semantic Cache")
+    print("="*70)
+    
+    try:
+        from unittest.mock import Mock
+        
+        embeddings = {
+            "Implement binary search in Python": [1.0, 0.0, 0.0],
+            "Implement a binary search in Python": [0.99, 0.1, 0.0],
+            "Write a CSV parser with quoting": [0.0, 1.0, 0.0],
+        }
+        memory_a = MemoryItem(id="mem-a", title="Bounds", description="d", content="c")
+        memory_b = MemoryItem(id="mem-b", title="Midpoint", description="d", content="c")
+        
+        bank = Mock()
+        bank.storage.generate_embedding = Mock(side_effect=lambda text: embeddings[text])
+        bank.workspace_manager.get_workspace_id = Mock(return_value="ws-1")
+        bank.retrieve_memories = Mock(return_value=[memory_a])
+        response = Mock(content="def solve(): pass\nScore: 0.95\nFeedback: Great", total_tokens=10)
+        llm_client = Mock()
+        llm_client.create = Mock(return_value=response)
+        
+        disabled = IterativeReasoningAgent(llm_client=llm_client, reasoning_bank=bank)
+        assert disabled.semantic_cache is None, "Semantic cache should be off by default"
+        
+        agent = IterativeReasoningAgent(
+            llm_client=llm_client, reasoning_bank=bank, enable_semantic_cache=True
+        )
+        first = agent.solve_task("Implement binary search in Python")
+        calls = llm_client.create.call_count
+        assert first.score >= agent.success_threshold and calls > 0
+        
+        # Hit: similar task, same workspace and retrieved memories
+        hit = agent.solve_task("Implement a binary search in Python")
+        assert llm_client.create.call_count == calls, "Cache hit should skip the LLM"
+        assert hit.trajectory[0].action == "semantic_cache_hit"
+        assert hit.solution == first.solution and hit.total_tokens == 0
+        
+        # Miss: dissimilar task
+        miss = agent.solve_task("Write a CSV parser with quoting")
+        assert llm_client.create.call_count > calls, "Dissimilar task should be solved"
+        assert miss.trajectory[0].action != "semantic_cache_hit"
+        
+        # Scope: similar task, but different memories were retrieved
+        calls = llm_client.create.call_count
+        bank.retrieve_memories.return_value = [memory_a, memory_b]
+        scoped = agent.solve_task("Implement a binary search in Python")
+        assert llm_client.create.call_count > calls, "Different memories should miss"
+        assert scoped.trajectory[0].action != "semantic_cache_hit"
+        
+        print("\n✅ Semantic cache working:")
+        print("   ✓ Disabled by default")
+        print("   ✓ Similar task reuses the solved result")
+        print("   ✓ Dissimilar task is solved")
+        print("   ✓ Scoped to the retrieved memories")
+        
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Semantic cache test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def main():
     """Run all tests"""
     print("\n" + "="*70)
@@ -356,6 +565,9 @@ def main():
     results.append(("Prompt Building", test_prompt_building()))
     results.append(("Evaluation Parsing", test_evaluation_parsing()))
     results.append(("State Reset", test_state_reset()))
+    results.append(("Trajectory Serialization", test_trajectory_serialization()))
+    results.append(("Evaluation Memoization", test_evaluation_memoization()))
+    results.append(("Semantic Cache", test_semantic_cache()))
     
     # Print summary
     print("\n" + "="*70)
@@ -171,6 +171,14 @@ def test_pattern_tag_filtering():
     assert len(results) == 2
     assert all("algorithms" in (m.pattern_tags or []) for m in results)
     
+    # Matching is case-insensitive and the cached tag set follows reassignment
+    results = retriever.retrieve_by_tags(query="test query", tags=["VALIDATION"], n_results=5)
+    assert [m.id for m in results] == ["mem2"]
+    mock_memories[1].pattern_tags = ["Sorting"]
+    assert mock_memories[1].tags_lc == frozenset({"sorting"})
+    results = retriever.retrieve_by_tags(query="test query", tags=["validation"], n_results=5)
+    assert results == []
+    
     print("✓ Pattern tag filtering works correctly")
 
 
@@ -217,6 +225,9 @@ def test_error_pattern_retrieval():
     assert len(results) == 1
     assert results[0].error_context is not None
     
+    # The error filter is pushed down to the ReasoningBank query
+    assert mock_bank.retrieve_memories.call_args[1]["errors_only"] is True
+    
     print("✓ Error pattern retrieval works correctly")
 
 
@@ -329,6 +340,48 @@ def test_relevance_ranking():
     print("✓ Relevance ranking works correctly")
 
 
+def test_domain_fanout():
+    """Test concurrent per-domain retrieval when no domain filter is given."""
+    print("\nTesting domain fan-out...")
+    
+    def retrieve_memories(query, n_results, include_errors, domain_filter, errors_only):
+        scores = {"algorithms": [0.9, 0.5], "api_usage": [0.8, 0.7], "testing": [0.4]}
+        return [
+            MemoryItem(
+                id=f"{domain_filter}-{i}",
+                title=domain_filter,
+                description="Test",
+                content="Test",
+                composite_score=score,
+                domain_category=domain_filter
+            )
+            for i, score in enumerate(scores[domain_filter])
+        ][:n_results]
+    
+    mock_bank = Mock()
+    mock_bank.retrieve_memories = Mock(side_effect=retrieve_memories)
+    
+    config = KnowledgeRetrieverConfig(
+        min_relevance_score=0.0,
+        fanout_domains=["algorithms", "api_usage", "testing"]
+    )
+    retriever = KnowledgeRetriever(mock_bank, config)
+    
+    results = retriever.retrieve(query="test query", n_results=3)
+    
+    # One query per domain, merged by composite score
+    assert mock_bank.retrieve_memories.call_count == 3
+    assert [m.id for m in results] == ["algorithms-0", "api_usage-0", "api_usage-1"]
+    
+    # An explicit domain filter bypasses the fan-out
+    retriever.retrieve(query="test query", domain_filter="testing")
+    assert mock_bank.retrieve_memories.call_count == 4
+    
+    retriever.close()
+    
+    print("✓ Domain fan-out works correctly")
+
+
 def run_all_tests():
     """Run all tests."""
     print("=" * 60)
@@ -344,6 +397,7 @@ def run_all_tests():
         test_format_for_prompt()
         test_statistics()
         test_relevance_ranking()
+        test_domain_fanout()
         
         print("\n" + "=" * 60)
         print("✓ All tests passed!")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Basic verification test for the ChromaDB to Supabase migration
+
+This script tests core functionality with a mocked SupabaseAdapter:
+- Batched uploads of a streamed traces export
+- Per-trace retry of a failed batch, keeping parent_trace_id
+- Parents uploaded before their children despite concurrent batches
+- Statistics for invalid and failed traces
+- Dry run validation without uploads
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import migrate_to_supabase
+from migrate_to_supabase import MigrationManager
+
+
+def _trace(trace_id, parent_trace_id=None, memories=1):
+    return {
+        "id": trace_id,
+        "task": f"Task {trace_id}",
+        "trajectory": [{"iteration": 1, "action": "think"}],
+        "outcome": "success",
+        "parent_trace_id": parent_trace_id,
+        "memory_items": [
+            {"id": f"{trace_id}-m{i}", "title": "T", "content": "C"}
+            for i in range(memories)
+        ]
+    }
+
+
+def _write_traces(traces):
+    f = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+    with f:
+        json.dump(traces, f)
+    return f.name
+
+
+def _run(traces, batch_size, dry_run=False, storage=None, concurrency=1):
+    """Run a migration of traces against a mocked SupabaseAdapter"""
+    traces_file = _write_traces(traces)
+    storage = storage or Mock()
+    storage.get_statistics.return_value = {"total_traces": 0, "total_memories": 0}
+    try:
+        with patch.object(migrate_to_supabase, "SupabaseAdapter", return_value=storage) as adapter:
+            manager = MigrationManager(
+                traces_file=traces_file,
+                supabase_url="https://example.supabase.co",
+                supabase_key="key",
+                dry_run=dry_run,
+                batch_size=batch_size,
+                concurrency=concurrency
+            )
+            stats = manager.run_migration()
+            manager.close()
+    finally:
+        os.unlink(traces_file)
+    return stats, storage, adapter
+
+
+def test_batched_migration():
+    """Test that valid traces are uploaded in batches"""
+    print("Testing batched migration...")
+    
+    traces = [_trace(f"t{i}") for i in range(5)] + [{"id": "invalid"}]
+    stats, storage, adapter = _run(traces, batch_size=2)
+    
+    assert "logger" not in adapter.call_args.kwargs
+    uploaded = [
+        [payload["id"] for payload in call.args[0]]
+        for call in storage.add_traces_batch.call_args_list
+    ]
+    assert uploaded == [["t0", "t1"], ["t2", "t3"], ["t4"]], uploaded
+    assert stats["total_traces"] == 6
+    assert stats["successful"] == 5
+    assert stats["failed"] == 1, "Invalid trace should count as failed"
+    
+    print("✓ Batched migration works correctly")
+
+
+def test_batch_retry():
+    """Test that a failed batch is retried one trace at a time"""
+    print("\nTesting per-trace retry...")
+    
+    def add_traces_batch(payloads):
+        if len(payloads) > 1 or payloads[0]["id"] == "bad":
+            raise RuntimeError("insert failed")
+        return [payloads[0]["id"]]
+    
+    storage = Mock()
+    storage.add_traces_batch.side_effect = add_traces_batch
+    # The parent is not in the export, so all three share one batch
+    traces = [
+        _trace("a", parent_trace_id="stored"),
+        _trace("b", parent_trace_id="stored"),
+        _trace("bad", parent_trace_id="stored"),
+    ]
+    stats, storage, _ = _run(traces, batch_size=3, storage=storage)
+    
+    retried = [call.args[0] for call in storage.add_traces_batch.call_args_list[1:]]
+    assert [payloads[0]["id"] for payloads in retried] == ["a", "b", "bad"]
+    assert retried[1][0]["parent_trace_id"] == "stored", "Retry should keep the parent link"
+    assert retried[1][0]["memory_items"][0]["id"] == "b-m0"
+    assert stats["successful"] == 2
+    assert stats["failed"] == 1
+    
+    print("✓ Per-trace retry works correctly")
+
+
+def test_parent_ordering():
+    """Test that children are uploaded only after their parents are stored"""
+    print("\nTesting parent ordering...")
+    
+    stored = set()
+    lock = threading.Lock()
+    
+    def add_traces_batch(payloads):
+        time.sleep(0.01)
+        with lock:
+            for payload in payloads:
+                parent = payload["parent_trace_id"]
+                if parent and parent.startswith("t") and parent not in stored:
+                    raise RuntimeError(f"foreign key violation: {parent}")
+            stored.update(payload["id"] for payload in payloads)
+        return [payload["id"] for payload in payloads]
+    
+    storage = Mock()
+    storage.add_traces_batch.side_effect = add_traces_batch
+    # Children precede their parents in the export; t9 and t8 form a cycle
+    traces = [
+        _trace("t3", parent_trace_id="t2"),
+        _trace("t2", parent_trace_id="t1"),
+        _trace("t1", parent_trace_id="t0"),
+        _trace("x0", parent_trace_id="stored"),
+    ] + [_trace(f"t{i}") for i in (0, 4, 5, 6, 7)]
+    stats, storage, _ = _run(traces, batch_size=2, storage=storage, concurrency=4)
+    
+    assert stats["successful"] == 9, stats
+    assert stats["failed"] == 0
+    assert stored == {trace["id"] for trace in traces}
+    
+    cyclic = [_trace("t9", parent_trace_id="t8"), _trace("t8", parent_trace_id="t9")]
+    stats, _, _ = _run(cyclic, batch_size=2, storage=storage, concurrency=4)
+    assert stats["total_traces"] == 2, "Cyclic links should still be attempted"
+    
+    print("✓ Parent ordering works correctly")
+
+
+def test_dry_run():
+    """Test that a dry run validates without connecting or uploading"""
+    print("\nTesting dry run...")
+    
+    traces = [_trace("t0"), {"id": "invalid"}]
+    stats, storage, adapter = _run(traces, batch_size=2, dry_run=True)
+    
+    assert not adapter.called, "Dry run should not connect to Supabase"
+    assert not storage.add_traces_batch.called
+    assert stats["successful"] == 1
+    assert stats["failed"] == 1
+    
+    print("✓ Dry run works correctly")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Supabase migration verification tests")
+    print("=" * 60)
+    
+    try:
+        test_batched_migration()
+        test_batch_retry()
+        test_parent_ordering()
+        test_dry_run()
+        
+        print("\n" + "=" * 60)
+        print("✓ All tests passed!")
+        print("=" * 60)
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    except Exception as e:
+        print(f"\n✗ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    exit(0 if success else 1)
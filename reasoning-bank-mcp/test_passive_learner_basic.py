@@ -0,0 +1,167 @@
+"""
+Basic verification test for PassiveLearner batched extraction.
+
+This script tests core functionality:
+- Quality heuristics
+- Batched knowledge extraction (one LLM call per batch)
+- Mapping batch results back to exchanges
+- Storage of each valuable exchange
+"""
+
+import json
+from unittest.mock import Mock
+from passive_learner import PassiveLearner, PassiveLearnerConfig
+
+
+LONG_ANSWER = (
+    "You should use a context manager because it closes the file even when "
+    "an exception is raised, which avoids leaking file handles in long-running "
+    "services."
+)
+
+
+def _item(title):
+    return {"title": title, "description": "d", "content": "c", "pattern_tags": ["t"]}
+
+
+def test_is_valuable():
+    """Test the quality heuristics."""
+    print("Testing quality heuristics...")
+    
+    learner = PassiveLearner(Mock(), Mock())
+    
+    assert not learner.is_valuable("What is Python?", "A programming language.")
+    assert learner.is_valuable("Q", "x" * 100 + "\n```python\nprint(1)\n```")
+    assert learner.is_valuable("Q", LONG_ANSWER)
+    assert learner.is_valuable("Q", "y" * 100 + " 1. build it 2. ship it")
+    assert not learner.is_valuable("Q", "plain words only " * 10)
+    
+    print("✓ Quality heuristics work correctly")
+
+
+def test_batch_extraction():
+    """Test that several exchanges share one extraction call."""
+    print("\nTesting batched extraction...")
+    
+    mock_client = Mock()
+    mock_client.create.return_value = Mock(content=json.dumps([
+        [_item("first")],
+        [_item("second"), {"title": "missing fields"}],
+    ]))
+    
+    learner = PassiveLearner(Mock(), mock_client)
+    extracted = learner.extract_knowledge_batch([
+        ("Q1", LONG_ANSWER, None),
+        ("Q2", LONG_ANSWER, "ctx"),
+    ])
+    
+    assert mock_client.create.call_count == 1
+    prompt = mock_client.create.call_args.kwargs["messages"][1]["content"]
+    assert "### Exchange 1" in prompt and "### Exchange 2" in prompt
+    assert "exactly 2 elements" in prompt
+    
+    assert [item["title"] for item in extracted[0]] == ["first"]
+    assert [item["title"] for item in extracted[1]] == ["second"]
+    assert extracted[1][0]["metadata"]["source_question"] == "Q2"
+    assert extracted[0][0]["metadata"]["source_type"] == "passive_learning"
+    
+    # Misaligned responses fall back to one extraction per exchange
+    for batch_response in ([[_item("only")]], {"items": []}):
+        mock_client.create.reset_mock()
+        mock_client.create.side_effect = [
+            Mock(content=json.dumps(batch_response)),
+            Mock(content=json.dumps([_item("one")])),
+            Mock(content=json.dumps([_item("two"), _item("three")])),
+        ]
+        extracted = learner.extract_knowledge_batch([
+            ("Q1", LONG_ANSWER, None),
+            ("Q2", LONG_ANSWER, None),
+        ])
+        assert mock_client.create.call_count == 3
+        assert [[item["title"] for item in items] for items in extracted] == [
+            ["one"], ["two", "three"]
+        ]
+        assert extracted[1][0]["metadata"]["source_question"] == "Q2"
+    mock_client.create.side_effect = None
+    
+    print("✓ Batched extraction works correctly")
+
+
+def test_process_exchanges():
+    """Test batch processing, storage and result ordering."""
+    print("\nTesting process_exchanges...")
+    
+    mock_bank = Mock()
+    mock_bank.store_trace.side_effect = ["trace-a", "trace-c"]
+    mock_client = Mock()
+    mock_client.create.return_value = Mock(content=json.dumps([
+        [_item("a")],
+        [_item("c")],
+    ]))
+    
+    learner = PassiveLearner(
+        mock_bank, mock_client, PassiveLearnerConfig(batch_size=4)
+    )
+    results = learner.process_exchanges([
+        ("Qa", LONG_ANSWER, None),
+        ("Qb", "too short", None),
+        ("Qc", LONG_ANSWER, None),
+    ])
+    
+    assert mock_client.create.call_count == 1
+    assert [r["is_valuable"] for r in results] == [True, False, True]
+    assert [r["trace_id"] for r in results] == ["trace-a", None, "trace-c"]
+    assert results[2]["knowledge_items"][0]["title"] == "c"
+    
+    stats = learner.get_statistics()
+    assert stats["exchanges_evaluated"] == 3
+    assert stats["exchanges_stored"] == 2
+    assert stats["knowledge_items_extracted"] == 2
+    
+    # A batch size of one keeps the single-exchange prompt
+    mock_client.create.reset_mock()
+    mock_client.create.return_value = Mock(content=json.dumps([_item("solo")]))
+    learner = PassiveLearner(
+        Mock(), mock_client, PassiveLearnerConfig(batch_size=1, auto_store_enabled=False)
+    )
+    results = learner.process_exchanges([
+        ("Q1", LONG_ANSWER, None),
+        ("Q2", LONG_ANSWER, None),
+    ])
+    assert mock_client.create.call_count == 2
+    assert all(not r["stored"] for r in results)
+    assert results[1]["knowledge_items"][0]["title"] == "solo"
+    
+    print("✓ process_exchanges works correctly")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running PassiveLearner verification tests")
+    print("=" * 60)
+    
+    try:
+        test_is_valuable()
+        test_batch_extraction()
+        test_process_exchanges()
+        
+        print("\n" + "=" * 60)
+        print("✓ All tests passed!")
+        print("=" * 60)
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    except Exception as e:
+        print(f"\n✗ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    exit(0 if success else 1)
@@ -4,6 +4,7 @@ Test performance optimizations
 This test verifies that the performance optimization features work correctly:
 - Batch embedding generation
 - Memory caching
+- Semantic caching
 - Prompt compression
 - Connection pooling
 """
@@ -17,6 +18,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from performance_optimizer import (
     BatchEmbeddingGenerator,
     MemoryCache,
+    SemanticCache,
     PromptCompressor,
     APIConnectionPool,
     PerformanceMonitor
@@ -61,6 +63,37 @@ def test_memory_cache():
     print("  ✅ MemoryCache working correctly\n")
 
 
+def test_semantic_cache():
+    """Test semantic cache functionality"""
+    print("Testing SemanticCache...")
+    
+    cache = SemanticCache(threshold=0.9, max_size=2)
+    
+    # Nearby vectors hit, orthogonal ones miss
+    cache.put([1.0, 0.0, 0.0], "first")
+    hit = cache.search([0.99, 0.05, 0.0])
+    assert hit is not None and hit[0] == "first", "Similar query should hit"
+    assert cache.search([0.0, 1.0, 0.0]) is None, "Dissimilar query should miss"
+    print("  ✅ Similarity lookup working")
+    
+    # Entries only match their own scope
+    cache.put([0.0, 1.0, 0.0], "scoped", scope="ws-a")
+    assert cache.search([0.0, 1.0, 0.0], scope="ws-a")[0] == "scoped"
+    assert cache.search([0.0, 1.0, 0.0], scope="ws-b") is None
+    print("  ✅ Scope isolation working")
+    
+    # FIFO eviction once full
+    cache.put([0.0, 0.0, 1.0], "third")
+    assert cache.search([1.0, 0.0, 0.0]) is None, "Oldest entry should be evicted"
+    assert cache.search([0.0, 0.0, 1.0])[0] == "third"
+    print("  ✅ Eviction working")
+    
+    stats = cache.get_statistics()
+    assert stats["cache_size"] == 2
+    print(f"  ✅ Statistics: {stats}")
+    print("  ✅ SemanticCache working correctly\n")
+
+
 def test_prompt_compressor():
     """Test prompt compression"""
     print("Testing PromptCompressor...")
@@ -128,6 +161,47 @@ def test_batch_embedding_generator():
     print("  ✅ BatchEmbeddingGenerator interface verified\n")
 
 
+def test_embedding_memo():
+    """Test the one-entry embedding memo shared by all storage backends"""
+    print("Testing embedding memo...")
+    
+    from unittest.mock import Mock
+    from storage_adapter import StorageBackendInterface
+    from supabase_storage import SupabaseAdapter
+    
+    # A backend that only implements the abstract methods gets the memo
+    calls = []
+    methods = {name: (lambda self, *args, **kwargs: None)
+               for name in StorageBackendInterface.__abstractmethods__}
+    methods["_generate_embedding"] = lambda self, text: calls.append(text) or [float(len(text))]
+    MinimalBackend = type("MinimalBackend", (StorageBackendInterface,), methods)
+    
+    backend = MinimalBackend()
+    assert backend.generate_embedding("task") == [4.0]
+    assert backend.generate_embedding("task") == [4.0]
+    assert backend.generate_embedding("other") == [5.0]
+    assert calls == ["task", "other"], "Repeat text should reuse the embedding"
+    assert MinimalBackend()._last_embedding is None, "Memo should be per instance"
+    
+    print("  ✅ Repeat text reuses the previous embedding")
+    
+    # SupabaseAdapter only supplies the encoder; the memo comes from the base
+    # (remaining abstract methods are stubbed, no Supabase client is needed)
+    assert "generate_embedding" not in SupabaseAdapter.__dict__
+    stubs = {name: (lambda self, *args, **kwargs: None)
+             for name in SupabaseAdapter.__abstractmethods__}
+    StubbedAdapter = type("StubbedAdapter", (SupabaseAdapter,), stubs)
+    adapter = StubbedAdapter.__new__(StubbedAdapter)
+    adapter.embedder = Mock()
+    adapter.embedder.encode.return_value = Mock(tolist=Mock(return_value=[0.5]))
+    assert adapter.generate_embedding("task") == [0.5]
+    assert adapter.generate_embedding("task") == [0.5]
+    assert adapter.embedder.encode.call_count == 1
+    
+    print("  ✅ SupabaseAdapter uses the shared memo")
+    print("  ✅ Embedding memo working correctly\n")
+
+
 def test_connection_pool():
     """Test API connection pool"""
     print("Testing APIConnectionPool...")
@@ -161,9 +235,11 @@ def main():
     
     try:
         test_memory_cache()
+        test_semantic_cache()
         test_prompt_compressor()
         test_performance_monitor()
         test_batch_embedding_generator()
+        test_embedding_memo()
         test_connection_pool()
         
         print("=" * 60)
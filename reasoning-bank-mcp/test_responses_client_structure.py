@@ -126,6 +126,71 @@ except Exception as e:
     print(f"✗ Reasoning effort test failed: {e}")
     sys.exit(1)
 
+# Test multi-choice parsing (create_n) and payload
+try:
+    from unittest.mock import Mock
+    client = ResponsesAPIClient(api_key="test")
+    
+    payload = client._build_payload("m", [{"role": "user", "content": "hi"}], 0.7, None, 100, "low", {}, n=3)
+    assert payload["n"] == 3
+    assert "n" not in client._build_payload("m", [{"role": "user", "content": "hi"}], 0.7, None, 100, "low", {})
+    
+    response = Mock(status_code=200)
+    response.json.return_value = {
+        "choices": [
+            {"message": {"content": f"answer {i}"}, "finish_reason": "stop"}
+            for i in range(3)
+        ],
+        "usage": {"total_tokens": 90, "prompt_tokens": 30, "completion_tokens": 60}
+    }
+    results = client._parse_choices(response, "m")
+    assert [r.content for r in results] == ["answer 0", "answer 1", "answer 2"]
+    assert all(r.total_tokens == 30 for r in results)
+    assert all(r.cached_input_tokens == 0 for r in results)
+    print("✓ Multi-choice parsing verified")
+    
+    response.json.return_value = {
+        "choices": [{"message": {"content": "cached"}, "finish_reason": "stop"}],
+        "usage": {
+            "total_tokens": 1100,
+            "prompt_tokens": 1000,
+            "completion_tokens": 100,
+            "prompt_tokens_details": {"cached_tokens": 800}
+        }
+    }
+    assert client._parse_choices(response, "m")[0].cached_input_tokens == 800
+    print("✓ Prompt cache usage parsed")
+except Exception as e:
+    print(f"✗ Multi-choice parsing test failed: {e}")
+    sys.exit(1)
+
+# Test async client reuse per event loop
+try:
+    import asyncio
+    from responses_alpha_client import HTTPX_AVAILABLE
+    
+    if HTTPX_AVAILABLE:
+        client = ResponsesAPIClient(api_key="test")
+        
+        async def get_clients():
+            first = await client._get_async_client()
+            second = await client._get_async_client()
+            return first, second
+        
+        first, second = asyncio.run(get_clients())
+        assert first is second, "Requests on one loop should share a client"
+        assert first.is_closed, "Client should be closed when its loop shuts down"
+        assert not client._async_clients
+        
+        third, _ = asyncio.run(get_clients())
+        assert third is not first, "A new loop should get a new client"
+        print("✓ Async client reused per event loop and closed with it")
+except Exception as e:
+    print(f"✗ Async client reuse test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
 print("\n" + "="*50)
 print("All structure tests passed! ✓")
 print("="*50)
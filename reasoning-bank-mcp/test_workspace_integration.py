@@ -209,10 +209,75 @@ def test_workspace_manager_api():
         print("=== All API tests passed! ===")
 
 
+def test_workspace_combined_filters():
+    """Test workspace filtering combined with domain and error filters"""
+    print("\n=== Testing Combined Workspace Filters ===\n")
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = create_storage_backend(
+            backend_type="chromadb",
+            persist_directory=os.path.join(tmpdir, "test_storage"),
+            collection_name="test_workspace_filters"
+        )
+        workspace_id = "workspace_filters"
+        
+        def store(title, domain, error_context=None, workspace=workspace_id):
+            memory = {
+                "id": str(uuid.uuid4()),
+                "title": title,
+                "description": f"{title} description",
+                "content": f"{title} content",
+                "pattern_tags": ["filters"],
+                "domain_category": domain
+            }
+            if error_context:
+                memory["error_context"] = error_context
+            storage.add_trace(
+                trace_id=str(uuid.uuid4()),
+                task=f"Task for {title}",
+                trajectory=[{"iteration": 1, "action": "test", "output": "test"}],
+                outcome="failure" if error_context else "success",
+                memory_items=[memory],
+                workspace_id=workspace
+            )
+        
+        error = {"error_type": "IndexError", "failure_pattern": "off by one"}
+        store("Algorithm Error", "algorithms", error_context=error)
+        store("Algorithm Success", "algorithms")
+        store("Testing Success", "testing")
+        store("Other Workspace Error", "algorithms", error_context=error, workspace="other")
+        
+        def titles(**kwargs):
+            memories = storage.query_similar_memories(
+                query_text="algorithm", n_results=10, workspace_id=workspace_id, **kwargs
+            )
+            return sorted(m.title for m in memories)
+        
+        print("1. Workspace + errors_only...")
+        assert titles(errors_only=True) == ["Algorithm Error"]
+        print("✅ Only this workspace's error memories returned\n")
+        
+        print("2. Workspace + domain...")
+        assert titles(domain_filter="algorithms") == ["Algorithm Error", "Algorithm Success"]
+        print("✅ Domain filter applied within workspace\n")
+        
+        print("3. Workspace + domain + errors_only...")
+        assert titles(domain_filter="testing", errors_only=True) == []
+        assert titles(domain_filter="algorithms", errors_only=True) == ["Algorithm Error"]
+        print("✅ All three conditions combined\n")
+        
+        print("4. Workspace + include_errors=False...")
+        assert titles(include_errors=False) == ["Algorithm Success", "Testing Success"]
+        print("✅ Error memories excluded within workspace\n")
+        
+        print("=== All combined filter tests passed! ===")
+
+
 if __name__ == "__main__":
     try:
         test_workspace_isolation()
         test_workspace_manager_api()
+        test_workspace_combined_filters()
         print("\n" + "="*60)
         print("✅ ALL TESTS PASSED - Workspace Manager is production ready!")
         print("="*60)